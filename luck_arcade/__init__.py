@@ -1,4 +1,21 @@
-"""Luck Arcade package."""
+"""Luck Arcade package.
+
+Submodules load on first attribute access (``luck_arcade.cli``,
+``luck_arcade.streamlit_app``), so importing the package or the CLI never
+pulls in Streamlit, pandas or NumPy.
+"""
+
+import importlib
 
 __all__ = ["cli", "streamlit_app"]
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,376 @@
+"""
+Microbenchmarks for the per-attempt hot paths, with a regression gate.
+
+Each benchmark times one operation (an RNG draw, a stats update, a
+stylesheet build, a scripted CLI session) and reports the best-of-N cost
+per call. Results are appended as one JSON line to a history file; each
+benchmark is compared with its most recent recorded result and the
+process exits non-zero when one got slower than ``--threshold``.
+
+Every run also checks cold start with ``python -X importtime``: importing
+``luck_arcade.cli`` must stay under ``--startup-budget`` milliseconds, and the
+CLI and offline tools must not import the modules in ``STARTUP_CHECKS``.
+
+    python -m luck_arcade.bench --history bench_history.jsonl
+    python -m luck_arcade.bench -k stats --threshold 0.15
+    python -m luck_arcade.bench -k startup
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from luck_arcade import engine
+from luck_arcade.stats import Event, PlayerStats
+
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+DEFAULT_THRESHOLD = 0.25
+MIN_SAMPLE_SECONDS = 0.05
+STARTUP_BUDGET_MS = 50.0
+# Entry module -> modules it must not import (UI and heavy numeric stacks).
+STARTUP_CHECKS = {
+    "luck_arcade.cli": ("streamlit", "pandas", "numpy"),
+    "luck_arcade.simulate": ("streamlit", "pandas"),
+    "luck_arcade.eventlog": ("streamlit", "pandas"),
+}
+
+
+def benchmark(name: str):
+    """Register ``factory``; it does any setup and returns the op to time."""
+
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+@benchmark("engine.flip_coin")
+def _flip_coin():
+    return lambda: engine.flip_coin("Heads")
+
+
+@benchmark("engine.roll_dice")
+def _roll_dice():
+    return lambda: engine.roll_dice(3)
+
+
+@benchmark("engine.blitz_24")
+def _blitz():
+    return lambda: engine.blitz(3, 24)
+
+
+@benchmark("rng.randint_500")
+def _randint_500():
+    from luck_arcade.rng import BufferedRandom
+
+    randint = BufferedRandom(seed=1).randint
+    return lambda: randint(1, 500)
+
+
+@benchmark("rng.secure_randint_500")
+def _secure_randint_500():
+    from luck_arcade.rng import BufferedRandom
+
+    randint = BufferedRandom(secure=True).randint
+    return lambda: randint(1, 500)
+
+
+@benchmark("stats.record_win")
+def _record_win():
+    stats = PlayerStats()
+    event = Event("dice", wins=1)
+    return lambda: stats.record(event)
+
+
+@benchmark("stats.record_miss")
+def _record_miss():
+    stats = PlayerStats()
+    event = Event("coin")
+    return lambda: stats.record(event)
+
+
+@benchmark("stats.header_totals")
+def _header_totals():
+    stats = PlayerStats()
+    for i in range(1000):
+        stats.record(Event("coin", wins=i % 2))
+
+    def op():
+        return stats.total_attempts, stats.total_wins, stats.win_rate, stats.history.to_list()
+
+    return op
+
+
+@benchmark("metrics.played")
+def _metrics_played():
+    from luck_arcade import metrics
+
+    return lambda: metrics.played("coin", "bench", 1, 1)
+
+
+@benchmark("metrics.observe")
+def _metrics_observe():
+    from luck_arcade import metrics
+
+    timer = metrics.RERUN_SECONDS.labels("bench")
+    return lambda: timer.observe(0.004)
+
+
+@benchmark("theme.build_css")
+def _build_css():
+    from luck_arcade import theme
+
+    build = theme.build_css.__wrapped__  # time the build itself, not the memo hit
+    return lambda: build("Arcade Neon")
+
+
+@benchmark("rooms.round_1000_players")
+def _room_round():
+    from luck_arcade.rooms import Rooms
+
+    rooms = Rooms(round_seconds=None)
+    room = rooms.open("bench", "dice")
+    feeds = []
+    for i in range(1000):
+        room.join(f"p{i}")
+        room.bet(f"p{i}", i % 6 + 1)
+        feeds.append(rooms.hub.subscribe(room.topic))
+
+    def op():
+        # One shared roll settled for every seat, then every member catches up.
+        room.resolve()
+        for feed in feeds:
+            feed.poll()
+
+    return op
+
+
+@benchmark("rooms.fanout_100_waiters")
+def _room_fanout():
+    import threading
+
+    from luck_arcade.rooms import Rooms
+
+    rooms = Rooms(round_seconds=None)
+    room = rooms.open("bench-fanout", "coin")
+    room.join("p0")
+    room.bet("p0", "Heads")
+    woken = threading.Semaphore(0)
+
+    def member(feed):
+        # Members leave once rounds stop, so the threads don't outlive the run.
+        while feed.wait(timeout=5):
+            woken.release()
+
+    for _ in range(100):
+        threading.Thread(target=member, args=(rooms.hub.subscribe(room.topic),), daemon=True).start()
+
+    def op():
+        # Publish to the time the last blocked member has the result.
+        room.resolve()
+        for _ in range(100):
+            woken.acquire()
+
+    return op
+
+
+@benchmark("tournament.resolve_10k_entries")
+def _tournament_resolve():
+    from luck_arcade import tournament
+
+    entries = tournament.random_entries(10_000, seed=1)
+    np = tournament._np()
+    seeds = tournament.entry_seeds(1, 0, 10_000)
+    targets = np.asarray(entries["targets"], dtype=np.uint8)
+    rolls = np.asarray(entries["rolls"], dtype=np.uint8)
+
+    def op():
+        # The batched blitz and the bracket, without the SQLite write.
+        hits = tournament.resolve_hits(seeds, targets, rolls)
+        return tournament.bracket_order(tournament.scores(hits, rolls), tournament.DEFAULT_BRACKET)
+
+    return op
+
+
+@benchmark("cli.session_30_rounds")
+def _cli_session():
+    from luck_arcade import cli
+
+    rounds = "1\n1\nno\n" "2\n3\nno\n" "3\n1\n5\nno\n"
+    script = rounds * 10 + "4\n"
+
+    def op():
+        stdin, sys.stdin = sys.stdin, io.StringIO(script)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli.play()
+        finally:
+            sys.stdin = stdin
+
+    return op
+
+
+def measure(op: Callable[[], object], repeat: int = 5) -> float:
+    """Best-of-``repeat`` seconds per call of ``op``."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            break
+        number *= 2 if elapsed else 10
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def run(names: Sequence[str], repeat: int = 5) -> Dict[str, float]:
+    """Return nanoseconds per call for each named benchmark."""
+    return {name: measure(BENCHMARKS[name](), repeat) * 1e9 for name in names}
+
+
+def import_times(module: str) -> Dict[str, float]:
+    """Cumulative import time in ms of every module ``import module`` loads.
+
+    Runs in a fresh interpreter under ``-X importtime``; the interpreter's
+    own startup (``site`` and friends) isn't included.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in done.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        try:
+            times[name.strip()] = int(cumulative) / 1000
+        except ValueError:
+            continue  # the header line
+    return times
+
+
+def check_startup(budget_ms: float, repeat: int = 5) -> List[str]:
+    """Print cold-start import times and return the problems found."""
+    problems = []
+    print(f"\n{'startup import':<26}{'ms':>14}{'budget':>14}")
+    for module, banned in STARTUP_CHECKS.items():
+        runs = [import_times(module) for _ in range(repeat)]
+        best = min(run[module] for run in runs)
+        budget = budget_ms if module == "luck_arcade.cli" else None
+        flag = "  SLOWER" if budget is not None and best > budget else ""
+        print(f"{module:<26}{best:>14.1f}{(f'{budget:.0f}' if budget is not None else '—'):>14}{flag}")
+        if flag:
+            problems.append(f"{module} took {best:.1f}ms to import (budget {budget:.0f}ms)")
+        loaded = sorted(name for name in banned if name in runs[0])
+        if loaded:
+            problems.append(f"{module} imports {', '.join(loaded)}")
+    return problems
+
+
+def load_previous(path: str) -> Dict[str, float]:
+    """Latest recorded ns/op per benchmark, across partial (``-k``) runs too."""
+    latest: Dict[str, float] = {}
+    try:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    latest.update(json.loads(line)["results"])
+    except FileNotFoundError:
+        pass
+    return latest
+
+
+def compare(current: Dict[str, float], before: Dict[str, float], threshold: float) -> List[str]:
+    """Print a results table and return the names that regressed."""
+    regressions = []
+    print(f"{'benchmark':<26}{'ns/op':>14}{'previous':>14}{'change':>10}")
+    for name, value in current.items():
+        old = before.get(name)
+        if old:
+            change = value / old - 1
+            flag = "  SLOWER" if change > threshold else ""
+            print(f"{name:<26}{value:>14,.0f}{old:>14,.0f}{change:>+10.1%}{flag}")
+            if change > threshold:
+                regressions.append(name)
+        else:
+            print(f"{name:<26}{value:>14,.0f}{'—':>14}{'':>10}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="luck_arcade.bench", description="Benchmark the game hot paths.")
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per benchmark (default 5)")
+    parser.add_argument("--history", default="bench_history.jsonl", help="JSON-lines history to compare and append to")
+    parser.add_argument("--json", metavar="PATH", help="also write this run's results to PATH")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fail when a benchmark is this much slower than last run (default 0.25 = 25%%)",
+    )
+    parser.add_argument("--no-save", action="store_true", help="compare only; don't append to the history")
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=STARTUP_BUDGET_MS,
+        help="fail when importing luck_arcade.cli takes longer than this many ms (default 50)",
+    )
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.pattern in name]
+    # The startup check matches -k like a benchmark named "startup".
+    startup = args.pattern in "startup"
+    if not names and not startup:
+        parser.error(f"no benchmark matches {args.pattern!r}")
+
+    entry = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": run(names, args.repeat),
+    }
+    regressions = compare(entry["results"], load_previous(args.history), args.threshold) if names else []
+    problems = check_startup(args.startup_budget, args.repeat) if startup else []
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(entry, handle, indent=2)
+            handle.write("\n")
+    if names and not args.no_save and not regressions:
+        with open(args.history, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+    if regressions:
+        print(f"\nRegressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+    for problem in problems:
+        print(f"\nStartup: {problem}")
+    if regressions or problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,147 +5,199 @@ Games:
 - Flip a coin (easy)
 - Roll a dice to hit your chosen number (medium)
 - Guess a random number with difficulty levels (hard)
+
+Run without arguments to play. ``batch`` plays moves from a file or pipe
+and ``serve`` hosts many players over TCP (see ``luck_arcade.console``).
+``simulate`` plays large batches of rounds to check the odds, e.g.
+``python -m luck_arcade.cli simulate dice -n 1e8``.
+``replay`` rebuilds per-game totals from an event log directory,
+``verify`` re-derives every provably-fair draw in a ledger directory, and
+``bot`` plays the guessing game with the optimal strategy, in-process or
+against a running ``serve`` (``--connect``), and ``tournament`` resolves and
+ranks a Time Attack tournament of bot entries.
+
+``--metrics-port`` serves counters and timings on ``/metrics`` while the
+command runs, and ``--metrics-file`` writes them to a file every few seconds
+and on exit (see ``luck_arcade.metrics``).
 """
 
 from __future__ import annotations
 
-import random
-from typing import Iterable, Optional
+import argparse
+import atexit
+import os
+import sys
+import time
+from typing import Optional, Sequence
 
+from luck_arcade import engine
 
-MENU = """
-Luck Arcade (CLI)
-1. Flip a Coin (easy)
-2. Roll a Dice (medium)
-3. Pick a Random Number (hard)
-4. Exit
-"""
+
+def play() -> None:
+    from luck_arcade import console
+
+    console.play_stdio()
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    from luck_arcade import console
+
+    if args.file == "-":
+        console.play_batch(sys.stdin, sys.stdout)
+    else:
+        with open(args.file, encoding="utf-8") as source:
+            console.play_batch(source, sys.stdout)
+
+
+def run_server(args: argparse.Namespace) -> None:
+    from luck_arcade import console
+
+    console.serve(args.host, args.port)
 
 
-class QuitGame(Exception):
-    """Signal to exit the CLI loop."""
-
-
-def prompt_int(prompt: str, valid: Optional[Iterable[int]] = None) -> int:
-    """Ask for an integer, re-prompting on bad input."""
-    while True:
-        raw = input(prompt).strip().lower()
-        if raw in {"q", "quit", "exit"}:
-            raise QuitGame
-        try:
-            value = int(raw)
-        except ValueError:
-            print("Please enter a whole number.")
-            continue
-        if valid is not None and value not in valid:
-            valid_list = ", ".join(str(v) for v in valid)
-            print(f"Please choose one of: {valid_list}")
-            continue
-        return value
-
-
-def prompt_yes_no(prompt: str) -> bool:
-    """Return True if the user answered yes."""
-    while True:
-        raw = input(f"{prompt} (yes/no, q to quit): ").strip().lower()
-        if raw in {"q", "quit", "exit"}:
-            raise QuitGame
-        if raw in {"y", "yes"}:
-            return True
-        if raw in {"n", "no"}:
-            return False
-        print("Please type yes or no.")
-
-
-def flip_coin() -> None:
-    print("\nWelcome to the Coin Flip Challenge! Choose your side and see if luck is on your side!\n")
-    choice = prompt_int("Pick a side: 1 for Heads, 2 for Tails: ", valid={1, 2})
-    chosen_side = "Heads" if choice == 1 else "Tails"
-    print(f"You chose {chosen_side}. Flipping...")
-
-    attempts = 0
-    while True:
-        attempts += 1
-        flip = random.choice(["Heads", "Tails"])
-        print(f"\n--- The coin shows {flip}! ---\n")
-        if flip == chosen_side:
-            print(f"Congratulations! You guessed it in {attempts} attempt(s).")
-            return
-        if not prompt_yes_no("No luck this time. Flip again?"):
-            print(f"Stopping. The coin landed on {flip}.")
-            return
-
-
-def roll_dice() -> None:
-    print("\nRoll a Dice — pick your lucky number and keep rolling until you hit it!\n")
-    lucky_number = prompt_int("Enter your lucky number (1-6): ", valid=set(range(1, 7)))
-    attempts = 0
-
-    while True:
-        attempts += 1
-        roll = random.randint(1, 6)
-        print(f"\n>>> You rolled a {roll}! <<<\n")
-        if roll == lucky_number:
-            print(f"Jackpot! You hit {lucky_number} in {attempts} attempt(s).")
-            return
-        if not prompt_yes_no("Missed. Roll again?"):
-            print(f"Stopping. Target was {lucky_number}.")
-            return
-
-
-def pick_random_number() -> None:
-    print("\nWelcome to the Random Number Picker! Choose a difficulty and guess the secret number.\n")
-    levels = {
-        1: ("Easy", 10),
-        2: ("Medium", 50),
-        3: ("Hard", 100),
-        4: ("Nightmare", 500),
-    }
-    level = prompt_int("Select a level 1-4 (1=Easy, 4=Nightmare): ", valid=set(levels.keys()))
-    label, max_number = levels[level]
-    print(f"You picked {label}. Guess a number between 1 and {max_number}. Type q to quit.")
-
-    target = random.randint(1, max_number)
-    attempts = 0
-    while True:
-        try:
-            guess = prompt_int(f"Your guess (1-{max_number}): ")
-        except QuitGame:
-            print(f"Exiting round. The number was {target}.")
-            raise
-
-        attempts += 1
-        if guess == target:
-            print(f"\nYOU NAILED IT! {target} was the number in {attempts} attempt(s).\n")
-            return
-        hint = "Too low! Aim higher." if guess < target else "Too high! Aim lower."
-        print(hint)
-        if not prompt_yes_no("Guess again?"):
-            print(f"Better luck next time. The number was {target}.")
-            return
-
-
-def main() -> None:
-    print("This is a luck-based game. Try your luck! Type q at any prompt to quit.\n")
-    games = {"1": flip_coin, "2": roll_dice, "3": pick_random_number}
+def run_simulation(args: argparse.Namespace) -> None:
+    from luck_arcade import simulate
 
     try:
-        while True:
-            print(MENU)
-            selection = input("Choose an option (1-4 or q): ").strip().lower()
-            if selection in {"4", "q", "quit", "exit"}:
-                print("Thanks for playing. Goodbye!")
-                break
-            func = games.get(selection)
-            if func:
-                try:
-                    func()
-                except QuitGame:
-                    print("Exiting to main menu.")
-            else:
-                print("Please choose 1, 2, 3, or 4 to exit.")
-    except QuitGame:
-        print("\nThanks for playing. Goodbye!")
+        config = simulate.Config(args.game, level=args.level, strategy=args.strategy, rolls=args.rolls)
+    except ValueError as exc:
+        sys.exit(f"simulate: {exc}")
+    result = simulate.simulate(config, int(args.rounds), seed=args.seed, workers=args.workers)
+    print(simulate.format_report(result))
+
+
+def run_replay(args: argparse.Namespace) -> None:
+    from luck_arcade import eventlog
+
+    started = time.perf_counter()
+    result = eventlog.aggregate(args.directory)
+    print(eventlog.format_aggregate(result, time.perf_counter() - started))
+
+
+def run_verify(args: argparse.Namespace) -> None:
+    from luck_arcade import fair
+
+    audit = fair.verify(args.directory, workers=args.workers)
+    print(fair.format_audit(audit))
+    if not audit.ok:
+        sys.exit(1)
+
+
+def run_bots(args: argparse.Namespace) -> None:
+    from luck_arcade import solver
+
+    solver.precompute()
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        report = solver.stress(args.level, int(args.rounds), args.clients, host or "127.0.0.1", int(port))
+        print(solver.format_report(report, where=f"against {args.connect}"))
+    else:
+        print(solver.format_report(solver.run_bots(args.level, int(args.rounds))))
+
+
+def run_tournament(args: argparse.Namespace) -> None:
+    from luck_arcade import tournament
+
+    entries = tournament.random_entries(int(args.entries), args.seed)
+    store = tournament.Store(args.db)
+    runner = tournament.Tournaments(store, interval=None, chunk=args.chunk)
+    result = runner.play(runner.upcoming, entries, seed=args.seed)
+    print(tournament.format_report(result, args.top))
+
+
+def start_metrics(args: argparse.Namespace) -> None:
+    if not (args.metrics_port or args.metrics_file):
+        return
+    from luck_arcade import metrics
+
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    if args.metrics_file:
+        metrics.dump_every(args.metrics_file)
+        atexit.register(metrics.dump, args.metrics_file)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="luck_arcade.cli", description="Luck Arcade from the terminal.")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=os.environ.get("LUCK_ARCADE_METRICS_PORT"),
+        help="serve metrics on http://127.0.0.1:PORT/metrics while running",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        default=os.environ.get("LUCK_ARCADE_METRICS_FILE"),
+        help="write metrics to PATH every 15s and on exit",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    sim = commands.add_parser("simulate", help="Play a large batch of rounds and report the odds.")
+    sim.add_argument("game", help="coin, dice, guess, blitz or any plugin game")
+    sim.add_argument("-n", "--rounds", type=float, default=1e7, help="rounds to play (default 1e7)")
+    sim.add_argument("--seed", type=int, default=None, help="master seed for a reproducible run")
+    sim.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: all cores); results do not depend on this",
+    )
+    sim.add_argument("--level", type=int, default=3, choices=sorted(engine.LEVELS), help="guess difficulty (default 3=Hard)")
+    sim.add_argument(
+        "--strategy",
+        choices=["bisect", "random"],
+        default="bisect",
+        help="guess strategy: follow the hints by halving, or guess blindly",
+    )
+    sim.add_argument("--rolls", type=int, default=12, help="rolls per blitz (default 12)")
+    sim.set_defaults(handler=run_simulation)
+
+    batch = commands.add_parser("batch", help="Play scripted moves (e.g. 'coin 1 yes yes no') as fast as possible.")
+    batch.add_argument("file", nargs="?", default="-", help="file of moves (default: read stdin)")
+    batch.set_defaults(handler=run_batch)
+
+    server = commands.add_parser("serve", help="Serve the games to many players over TCP (telnet/nc).")
+    server.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    server.add_argument("--port", type=int, default=7777, help="port to listen on (default 7777)")
+    server.set_defaults(handler=run_server)
+
+    replay = commands.add_parser("replay", help="Rebuild stats from an event log directory.")
+    replay.add_argument("directory", help="directory holding events-*.bin segments")
+    replay.set_defaults(handler=run_replay)
+
+    verify = commands.add_parser("verify", help="Re-derive every provably-fair draw in a ledger directory.")
+    verify.add_argument("directory", help="directory holding seeds.csv and draws.csv")
+    verify.add_argument(
+        "-j", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)"
+    )
+    verify.set_defaults(handler=run_verify)
+
+    bot = commands.add_parser("bot", help="Let optimal bots play the guessing game, locally or against a server.")
+    bot.add_argument("--level", type=int, default=4, choices=sorted(engine.LEVELS), help="difficulty (default 4=Nightmare)")
+    bot.add_argument("-n", "--rounds", type=float, default=1e5, help="rounds to play (default 1e5)")
+    bot.add_argument("--connect", metavar="HOST:PORT", help="play against a 'serve' instance instead of in-process")
+    bot.add_argument("--clients", type=int, default=100, help="concurrent connections with --connect (default 100)")
+    bot.set_defaults(handler=run_bots)
+
+    tournament = commands.add_parser("tournament", help="Run a Time Attack tournament of bot entries and rank it.")
+    tournament.add_argument("-n", "--entries", type=float, default=1e5, help="entries (default 1e5)")
+    tournament.add_argument("--seed", type=int, default=None, help="tournament seed for a reproducible run")
+    tournament.add_argument("--top", type=int, default=10, help="bracket places to print (default 10)")
+    tournament.add_argument("--chunk", type=int, default=1 << 15, help="entries resolved per batch (default 32768)")
+    tournament.add_argument("--db", default=":memory:", help="SQLite file to store the results in (default: in memory)")
+    tournament.set_defaults(handler=run_tournament)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    start_metrics(args)
+    if args.command is None:
+        play()
+        return
+    args.handler(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,338 @@
+"""
+Stream-driven console sessions for the CLI games.
+
+A ``Console`` plays the same menu and games as the original ``input()``
+loop, but reads whitespace-separated moves from any line source and
+writes through a buffer. The games are coroutines, so one session logic
+serves three front ends:
+
+- ``play_stdio``: the interactive terminal game (``python -m luck_arcade.cli``).
+- ``play_batch``: moves from a file or pipe, one game per line (e.g.
+  ``coin 1 yes yes no``), played as fast as the engine allows with output
+  written in large chunks.
+- ``serve``: a line-based TCP server (``telnet``/``nc`` friendly) running
+  any number of sessions on one asyncio event loop.
+
+A game can end before its line runs out (a win on the first flip), so
+whatever is left of the line is dropped when a game ends instead of being
+read as menu choices.
+
+Blocking line sources never actually suspend, so ``run_sync`` drives those
+sessions without an event loop; only ``serve`` needs asyncio.
+
+The menu lists every game in ``luck_arcade.games`` that has a console
+handler, plus every ``until_win`` game, which ``Console.play_until_win``
+plays straight from its compiled table. Every attempt and every game
+played from the menu is counted in ``luck_arcade.metrics``.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import deque
+from typing import Awaitable, Callable, Dict, Iterable, Optional, TextIO, Tuple
+
+from luck_arcade import engine, games, metrics
+from luck_arcade.rng import BufferedRandom, from_env
+
+
+QUIT_WORDS = {"q", "quit", "exit"}
+BATCH_FLUSH_CHARS = 1 << 16
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+# asyncio's default listen backlog of 100 drops connection bursts beyond that.
+SERVER_BACKLOG = 1024
+
+
+class QuitGame(Exception):
+    """Signal to exit the CLI loop."""
+
+
+def menu() -> Tuple[str, Dict[str, str], str]:
+    """The menu text, answers to game keys, and the answer that exits."""
+    specs = games.playable("console")
+    exit_number = str(len(specs) + 1)
+    lines = ["", "Luck Arcade (CLI)"]
+    lines += [f"{number}. {spec.label}" for number, spec in enumerate(specs, start=1)]
+    lines += [f"{exit_number}. Exit", ""]
+    return "\n".join(lines), games.menu_keys(specs), exit_number
+
+
+class Console:
+    """One player's session over a line reader and a text writer.
+
+    ``read_line`` returns the next line, or ``""`` at end of input, which
+    quits like ``q`` does. Output is collected and handed to ``write`` when
+    the session has to wait for input (``flush_on_read``) or once
+    ``flush_chars`` have piled up, so a scripted session writes in a few
+    large chunks.
+    """
+
+    def __init__(
+        self,
+        read_line: Callable[[], Awaitable[str]],
+        write: Callable[[str], Awaitable[None]],
+        rng: Optional[BufferedRandom] = None,
+        flush_on_read: bool = True,
+        flush_chars: int = BATCH_FLUSH_CHARS,
+    ) -> None:
+        self._read_line = read_line
+        self._write = write
+        self.rng = rng
+        self.flush_on_read = flush_on_read
+        self.flush_chars = flush_chars
+        self._moves: deque = deque()
+        self._out: list = []
+        self._out_chars = 0
+
+    def say(self, text: str = "", end: str = "\n") -> None:
+        self._out.append(text)
+        self._out.append(end)
+        self._out_chars += len(text) + len(end)
+
+    def discard_line(self) -> None:
+        """Drop the moves left on the current line."""
+        self._moves.clear()
+
+    async def flush(self) -> None:
+        if self._out:
+            data = "".join(self._out)
+            self._out.clear()
+            self._out_chars = 0
+            await self._write(data)
+
+    async def ask(self, prompt: str) -> str:
+        """Show ``prompt`` and return the next move, lower-cased."""
+        self.say(prompt, end="")
+        while not self._moves:
+            if self.flush_on_read or self._out_chars >= self.flush_chars:
+                await self.flush()
+            line = await self._read_line()
+            if not line:
+                raise QuitGame
+            self._moves.extend(line.split())
+        return self._moves.popleft().lower()
+
+    async def prompt_int(self, prompt: str, valid: Optional[Iterable[int]] = None) -> int:
+        """Ask for an integer, re-prompting on bad input."""
+        while True:
+            raw = await self.ask(prompt)
+            if raw in QUIT_WORDS:
+                raise QuitGame
+            try:
+                value = int(raw)
+            except ValueError:
+                self.say("Please enter a whole number.")
+                continue
+            if valid is not None and value not in valid:
+                valid_list = ", ".join(str(v) for v in valid)
+                self.say(f"Please choose one of: {valid_list}")
+                continue
+            return value
+
+    async def prompt_yes_no(self, prompt: str) -> bool:
+        """Return True if the user answered yes."""
+        while True:
+            raw = await self.ask(f"{prompt} (yes/no, q to quit): ")
+            if raw in QUIT_WORDS:
+                raise QuitGame
+            if raw in {"y", "yes"}:
+                return True
+            if raw in {"n", "no"}:
+                return False
+            self.say("Please type yes or no.")
+
+    async def flip_coin(self) -> None:
+        self.say("\nWelcome to the Coin Flip Challenge! Choose your side and see if luck is on your side!\n")
+        choice = await self.prompt_int("Pick a side: 1 for Heads, 2 for Tails: ", valid={1, 2})
+        chosen_side = engine.COIN_SIDES[choice - 1]
+        self.say(f"You chose {chosen_side}. Flipping...")
+
+        attempts = 0
+        while True:
+            attempts += 1
+            flip = engine.flip_coin(chosen_side, self.rng)
+            metrics.played(games.COIN.key, "console", wins=int(flip.won))
+            self.say(f"\n--- The coin shows {flip.outcome}! ---\n")
+            if flip.won:
+                self.say(f"Congratulations! You guessed it in {attempts} attempt(s).")
+                return
+            if not await self.prompt_yes_no("No luck this time. Flip again?"):
+                self.say(f"Stopping. The coin landed on {flip.outcome}.")
+                return
+
+    async def roll_dice(self) -> None:
+        self.say("\nRoll a Dice — pick your lucky number and keep rolling until you hit it!\n")
+        lucky_number = await self.prompt_int("Enter your lucky number (1-6): ", valid=set(engine.DICE_FACES))
+        attempts = 0
+
+        while True:
+            attempts += 1
+            roll = engine.roll_dice(lucky_number, self.rng)
+            metrics.played(games.DICE.key, "console", wins=int(roll.won))
+            self.say(f"\n>>> You rolled a {roll.roll}! <<<\n")
+            if roll.won:
+                self.say(f"Jackpot! You hit {lucky_number} in {attempts} attempt(s).")
+                return
+            if not await self.prompt_yes_no("Missed. Roll again?"):
+                self.say(f"Stopping. Target was {lucky_number}.")
+                return
+
+    async def pick_random_number(self) -> None:
+        self.say("\nWelcome to the Random Number Picker! Choose a difficulty and guess the secret number.\n")
+        levels = engine.LEVELS
+        level = await self.prompt_int("Select a level 1-4 (1=Easy, 4=Nightmare): ", valid=set(levels.keys()))
+        label, max_number = levels[level]
+        self.say(f"You picked {label}. Guess a number between 1 and {max_number}. Type q to quit.")
+
+        target = engine.pick_target(max_number, self.rng)
+        attempts = 0
+        while True:
+            try:
+                guess = await self.prompt_int(f"Your guess (1-{max_number}): ")
+            except QuitGame:
+                self.say(f"Exiting round. The number was {target}.")
+                raise
+
+            attempts += 1
+            result = engine.check_guess(guess, target)
+            metrics.played(games.GUESS.key, "console", wins=int(result.won))
+            if result.won:
+                self.say(f"\nYOU NAILED IT! {target} was the number in {attempts} attempt(s).\n")
+                return
+            self.say("Too low! Aim higher." if result.hint == "low" else "Too high! Aim lower.")
+            if not await self.prompt_yes_no("Guess again?"):
+                self.say(f"Better luck next time. The number was {target}.")
+                return
+
+    async def play_until_win(self, spec: games.GameSpec) -> None:
+        """Any ``until_win`` game, driven by its compiled table."""
+        table = games.table(spec.key)
+        self.say(f"\nWelcome to {spec.title}! {spec.blurb}\n")
+        options = ", ".join(f"{number} for {pick}" for number, pick in enumerate(table.picks, start=1))
+        choice = await self.prompt_int(f"Pick one: {options}: ", valid=range(1, len(table.picks) + 1))
+        pick = table.picks[choice - 1]
+        self.say(f"You picked {pick}.")
+
+        attempts = 0
+        while True:
+            attempts += 1
+            outcome, won = table.play(choice - 1, self.rng)
+            metrics.played(spec.key, "console", wins=int(won))
+            self.say(f"\n--- {outcome}! ---\n")
+            if won:
+                self.say(f"You win! It took {attempts} attempt(s).")
+                return
+            if not await self.prompt_yes_no("No luck this time. Try again?"):
+                self.say(f"Stopping. The last draw was {outcome}.")
+                return
+
+    async def run(self) -> None:
+        """The menu loop; returns when the player quits or input ends."""
+        self.say("This is a luck-based game. Try your luck! Type q at any prompt to quit.\n")
+        text, choices, exit_number = menu()
+
+        metrics.CONSOLE_SESSIONS.inc()
+        try:
+            while True:
+                self.say(text)
+                selection = await self.ask(f"Choose an option (1-{exit_number} or q): ")
+                if selection == exit_number or selection in QUIT_WORDS:
+                    self.say("Thanks for playing. Goodbye!")
+                    break
+                key = choices.get(selection)
+                if key:
+                    spec = games.get(key)
+                    handler = games.handler(spec, "console")
+                    try:
+                        with metrics.CONSOLE_GAME_SECONDS.labels(key).time():
+                            await (handler(self) if handler else self.play_until_win(spec))
+                    except QuitGame:
+                        self.say("Exiting to main menu.")
+                    self.discard_line()
+                else:
+                    self.say(f"Please choose a game, or {exit_number} to exit.")
+        except QuitGame:
+            self.say("\nThanks for playing. Goodbye!")
+        finally:
+            metrics.CONSOLE_SESSIONS.dec()
+        await self.flush()
+
+
+def run_sync(coro):
+    """Run a coroutine whose awaits all complete immediately, without a loop."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("session waited on real I/O; run it under asyncio instead")
+
+
+def _stream_console(source: TextIO, sink: TextIO, flush_on_read: bool, rng=None) -> Console:
+    async def read_line() -> str:
+        return source.readline()
+
+    async def write(text: str) -> None:
+        sink.write(text)
+        if flush_on_read:
+            sink.flush()
+
+    return Console(read_line, write, rng=rng, flush_on_read=flush_on_read)
+
+
+def play_stdio() -> None:
+    """The interactive terminal game on ``sys.stdin``/``sys.stdout``."""
+    run_sync(_stream_console(sys.stdin, sys.stdout, flush_on_read=True).run())
+
+
+def play_batch(source: TextIO, sink: TextIO, rng=None) -> None:
+    """Play every move in ``source`` back to back, writing output in chunks."""
+    run_sync(_stream_console(source, sink, flush_on_read=False, rng=rng).run())
+    sink.flush()
+
+
+async def _handle_client(reader, writer) -> None:
+    peer = writer.get_extra_info("peername")
+
+    async def read_line() -> str:
+        try:
+            return (await reader.readline()).decode("utf-8", "replace")
+        except ConnectionError:
+            return ""
+
+    async def write(text: str) -> None:
+        writer.write(text.replace("\n", "\r\n").encode("utf-8"))
+        await writer.drain()
+
+    console = Console(read_line, write, rng=from_env(f"tcp:{peer}"))
+    try:
+        await console.run()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Start serving console sessions; returns the ``asyncio.Server``."""
+    import asyncio
+
+    return await asyncio.start_server(_handle_client, host, port, backlog=SERVER_BACKLOG)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Serve sessions until interrupted."""
+    import asyncio
+
+    async def main() -> None:
+        server = await start_server(host, port)
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Serving Luck Arcade on {addresses} (Ctrl+C to stop)", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,142 @@
+"""
+Shared daily challenge: precomputed targets and per-player completion bitmaps.
+
+``DailyTargets`` keeps every target from ``PAST_DAYS`` ago to ``window``
+days ahead in a small SQLite table and in a dict, so one instance per
+process answers ``target(day)`` from memory for every session. Targets are
+``engine.daily_target`` values, so they match what the app always showed.
+
+``Completions`` is one player's history as a bitmap with one bit per day
+since ``EPOCH`` (46 bytes a year). "Done today?" is a single bit test and a
+streak walks back a whole byte at a time through fully completed weeks.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from luck_arcade import engine
+
+
+EPOCH = datetime.date(2024, 1, 1)
+DEFAULT_WINDOW = 60
+PAST_DAYS = 7
+
+
+def day_key(day: datetime.date) -> int:
+    """``YYYYMMDD`` as an integer, the same number that seeds the target."""
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+class DailyTargets:
+    """Process-wide table of daily targets, precomputed for a window of days."""
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        window: int = DEFAULT_WINDOW,
+        today: Optional[datetime.date] = None,
+    ) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_targets (day INTEGER PRIMARY KEY, target INTEGER NOT NULL)"
+        )
+        self._targets: Dict[int, int] = dict(self._conn.execute("SELECT day, target FROM daily_targets"))
+        self.precompute(today or datetime.date.today())
+
+    def precompute(self, start: datetime.date) -> int:
+        """Make sure every day from ``PAST_DAYS`` before ``start`` to ``window`` after is stored."""
+        days = (start + datetime.timedelta(days=offset) for offset in range(-PAST_DAYS, self.window + 1))
+        missing = [(day_key(day), engine.daily_target(day)) for day in days if day_key(day) not in self._targets]
+        if missing:
+            with self._lock:
+                self._conn.executemany("INSERT OR REPLACE INTO daily_targets (day, target) VALUES (?, ?)", missing)
+                self._conn.commit()
+                self._targets.update(missing)
+        return len(missing)
+
+    def target(self, day: datetime.date) -> int:
+        target = self._targets.get(day_key(day))
+        if target is None:
+            # Outside the window (the server outlived it): extend from here.
+            self.precompute(day)
+            target = self._targets[day_key(day)]
+        return target
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class Completions:
+    """Days on which one player cracked the daily challenge, as a bitmap."""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, data: bytes = b"") -> None:
+        self._bits = bytearray(data)
+
+    @staticmethod
+    def _index(day: datetime.date) -> int:
+        index = day.toordinal() - EPOCH.toordinal()
+        if index < 0:
+            raise ValueError(f"days before {EPOCH} can't be recorded, got {day}")
+        return index
+
+    def _bit(self, index: int) -> bool:
+        byte = index >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] >> (index & 7) & 1)
+
+    def done(self, day: datetime.date) -> bool:
+        return self._bit(self._index(day))
+
+    def mark(self, day: datetime.date) -> None:
+        index = self._index(day)
+        byte = index >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        self._bits[byte] |= 1 << (index & 7)
+
+    def streak(self, day: datetime.date) -> int:
+        """Consecutive completed days ending at ``day``.
+
+        If ``day`` itself isn't done yet the streak ending yesterday is
+        still alive, so it is counted.
+        """
+        index = self._index(day)
+        if not self._bit(index):
+            index -= 1
+        count = 0
+        bits = self._bits
+        while index >= 0:
+            if index & 7 == 7 and index >> 3 < len(bits) and bits[index >> 3] == 0xFF:
+                count += 8
+                index -= 8
+            elif self._bit(index):
+                count += 1
+                index -= 1
+            else:
+                break
+        return count
+
+    def total(self) -> int:
+        return bin(int.from_bytes(self._bits, "little")).count("1")
+
+    def clear(self) -> None:
+        self._bits.clear()
+
+    def to_str(self) -> str:
+        return base64.b64encode(bytes(self._bits)).decode("ascii")
+
+    @classmethod
+    def from_str(cls, text: str) -> "Completions":
+        return cls(base64.b64decode(text)) if text else cls()
@@ -0,0 +1,139 @@
+"""
+UI-free game rules for Luck Arcade.
+
+Every function here is stateless: it takes the player's input (plus an
+optional random source) and returns a plain result object. The CLI and the
+Streamlit app only decide how to ask for input and how to show the result,
+so the rules can be benchmarked, batched or run in parallel on their own.
+
+``rng`` may be the ``random`` module, a ``random.Random`` or a
+``luck_arcade.rng.BufferedRandom``; when omitted, the calling thread's
+buffered stream is used.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import random
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from luck_arcade.rng import default_rng
+
+
+COIN_SIDES = ("Heads", "Tails")
+DICE_FACES = (1, 2, 3, 4, 5, 6)
+
+LEVELS = {
+    1: ("Easy", 10),
+    2: ("Medium", 50),
+    3: ("Hard", 100),
+    4: ("Nightmare", 500),
+}
+
+DAILY_MAX = 100
+
+
+@dataclass(frozen=True)
+class CoinFlip:
+    """One flip of the coin against the side the player picked."""
+
+    choice: str
+    outcome: str
+
+    @property
+    def won(self) -> bool:
+        return self.outcome == self.choice
+
+
+@dataclass(frozen=True)
+class DiceRoll:
+    """One roll of the dice against the player's lucky number."""
+
+    lucky_number: int
+    roll: int
+
+    @property
+    def won(self) -> bool:
+        return self.roll == self.lucky_number
+
+
+@dataclass(frozen=True)
+class Guess:
+    """One guess at a secret number."""
+
+    guess: int
+    target: int
+
+    @property
+    def won(self) -> bool:
+        return self.guess == self.target
+
+    @property
+    def hint(self) -> Optional[str]:
+        """``"low"`` or ``"high"`` for a miss, ``None`` for a hit."""
+        if self.guess < self.target:
+            return "low"
+        if self.guess > self.target:
+            return "high"
+        return None
+
+
+@dataclass(frozen=True)
+class Blitz:
+    """A Time Attack burst of rolls against one target."""
+
+    target: int
+    rolls: Tuple[int, ...]
+
+    @property
+    def hits(self) -> int:
+        return sum(1 for roll in self.rolls if roll == self.target)
+
+
+def level_label(level: int) -> str:
+    """Return the display label for a difficulty, e.g. ``Easy (1-10)``."""
+    label, max_number = LEVELS[level]
+    return f"{label} (1-{max_number})"
+
+
+def flip_coin(choice: str, rng=None) -> CoinFlip:
+    if choice not in COIN_SIDES:
+        raise ValueError(f"choice must be one of {COIN_SIDES}, got {choice!r}")
+    return CoinFlip(choice, (rng or default_rng()).choice(COIN_SIDES))
+
+
+def roll_dice(lucky_number: int, rng=None) -> DiceRoll:
+    if lucky_number not in DICE_FACES:
+        raise ValueError(f"lucky_number must be 1-6, got {lucky_number!r}")
+    return DiceRoll(lucky_number, (rng or default_rng()).randint(1, 6))
+
+
+def pick_target(max_number: int, rng=None) -> int:
+    """Pick the secret number for a guessing round."""
+    return (rng or default_rng()).randint(1, max_number)
+
+
+def check_guess(guess: int, target: int) -> Guess:
+    return Guess(guess, target)
+
+
+def daily_target(day: Optional[datetime.date] = None) -> int:
+    """Return the shared daily challenge number for ``day`` (default today)."""
+    day = day or datetime.date.today()
+    return _daily_target(day.year * 10000 + day.month * 100 + day.day)
+
+
+@functools.lru_cache(maxsize=64)
+def _daily_target(stamp: int) -> int:
+    return random.Random(stamp).randint(1, DAILY_MAX)
+
+
+def blitz(target: int, rolls: int, rng=None) -> Blitz:
+    if target not in DICE_FACES:
+        raise ValueError(f"target must be 1-6, got {target!r}")
+    if rolls < 1:
+        raise ValueError(f"rolls must be positive, got {rolls!r}")
+    randint = (rng or default_rng()).randint
+    return Blitz(target, tuple(randint(1, 6) for _ in range(rolls)))
@@ -0,0 +1,309 @@
+"""
+Append-only binary log of every attempt.
+
+Each flip, roll, guess and blitz roll is one fixed-width little-endian
+record (see ``RECORD``). Records are buffered in memory and appended to
+numbered segment files (``events-000001.bin``, ...) that roll over at
+``segment_bytes``, so a segment never holds a partial record.
+
+``aggregate`` memory-maps one segment at a time and walks it in slices, so
+rebuilding stats from 100M events needs neither a database nor the whole
+log in RAM. NumPy makes the scan vectorized; without it a ``struct``
+fallback gives the same answers more slowly.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import mmap
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+# timestamp, player, seed, game, (pad), input, outcome
+RECORD = struct.Struct("<dQQH2xii")
+
+GAME_IDS = {"coin": 1, "dice": 2, "guess": 3, "daily": 4, "blitz": 5}
+GAME_NAMES = {value: name for name, value in GAME_IDS.items()}
+
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".bin"
+DEFAULT_SEGMENT_BYTES = RECORD.size * (1 << 20)
+DEFAULT_BUFFER_BYTES = RECORD.size * 2048
+DEFAULT_FLUSH_INTERVAL = 1.0
+MAX_FLUSH_BACKOFF = 60.0
+SCAN_RECORDS = 1 << 20
+
+log = logging.getLogger(__name__)
+
+
+def player_key(player_id: str) -> int:
+    """Map a player id string to the 64-bit key stored in records."""
+    return int.from_bytes(hashlib.blake2b(player_id.encode(), digest_size=8).digest(), "little")
+
+
+def segment_paths(directory) -> List[Path]:
+    return sorted(Path(directory).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+
+class EventLog:
+    """Buffered writer for a directory of log segments.
+
+    ``append`` packs into an in-memory buffer under a short lock; the buffer
+    goes to disk when it fills, every ``flush_interval`` seconds, on
+    ``flush`` and at exit. Writes are plain
+    appends with no fsync, trading the last buffer on a crash for a click
+    path that never touches the disk.
+
+    Segments are opened unbuffered, so a failed write leaves the file
+    exactly at the last record that made it; the rest goes back in front of
+    the buffer and is retried with backoff. Only an explicit ``flush``
+    raises; the background, ``append`` and exit paths log and carry on.
+    """
+
+    def __init__(
+        self,
+        directory,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        if segment_bytes < RECORD.size:
+            raise ValueError(f"segment_bytes must hold at least one {RECORD.size}-byte record")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes - segment_bytes % RECORD.size
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval = flush_interval
+        self._buffer = bytearray()
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._file = None
+        self._segment_index = 0
+        self._segment_size = 0
+        self._closed = threading.Event()
+        self._open_latest()
+        if flush_interval:
+            threading.Thread(
+                target=self._flush_loop, args=(flush_interval,), name="luck-arcade-events-flush", daemon=True
+            ).start()
+        atexit.register(self.close)
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._closed.wait(max(interval, self._retry_delay)):
+            self._try_flush()
+
+    def _try_flush(self) -> bool:
+        try:
+            self.flush()
+        except OSError:
+            self._retry_delay = min(max(self._retry_delay * 2, self.flush_interval or 1.0), MAX_FLUSH_BACKOFF)
+            self._retry_at = time.monotonic() + self._retry_delay
+            log.exception(
+                "writing events to %s failed; %d bytes kept for a retry in %.1fs",
+                self.directory,
+                len(self._buffer),
+                self._retry_delay,
+            )
+            return False
+        self._retry_delay = self._retry_at = 0.0
+        return True
+
+    def _open_latest(self) -> None:
+        existing = segment_paths(self.directory)
+        if existing:
+            latest = existing[-1]
+            self._segment_index = int(latest.name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+            size = latest.stat().st_size
+            # Drop a torn trailing record left by a crash mid-write.
+            size -= size % RECORD.size
+            self._file = open(latest, "r+b", buffering=0)
+            self._file.truncate(size)
+            self._file.seek(size)
+            self._segment_size = size
+        else:
+            self._roll()
+
+    def _roll(self) -> None:
+        path = self.directory / f"{SEGMENT_PREFIX}{self._segment_index + 1:06d}{SEGMENT_SUFFIX}"
+        # Open first: if it fails, the full segment stays current and the next flush rolls again.
+        handle = open(path, "ab", buffering=0)
+        if self._file is not None:
+            self._file.close()
+        self._file = handle
+        self._segment_index += 1
+        self._segment_size = 0
+
+    def append(
+        self,
+        game: str,
+        player: int,
+        input_value: int,
+        outcome: int,
+        seed: int = 0,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        record = RECORD.pack(
+            time.time() if timestamp is None else timestamp,
+            player,
+            seed,
+            GAME_IDS[game],
+            input_value,
+            outcome,
+        )
+        with self._lock:
+            self._buffer += record
+            full = len(self._buffer) >= self.buffer_bytes
+        if full and time.monotonic() >= self._retry_at:
+            self._try_flush()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            if self._file is None:
+                return
+            with self._lock:
+                data, self._buffer = self._buffer, bytearray()
+            view = memoryview(data)
+            try:
+                while view:
+                    room = self.segment_bytes - self._segment_size
+                    if room == 0:
+                        self._roll()
+                        continue
+                    # Raw writes may be short but never leave unaccounted bytes behind.
+                    written = self._file.write(view[:room])
+                    self._segment_size += written
+                    view = view[written:]
+            except OSError:
+                with self._lock:
+                    # Unwritten records go back ahead of anything appended since.
+                    self._buffer[:0] = view
+                raise
+
+    def close(self) -> None:
+        self._closed.set()
+        self._try_flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+if np is not None:
+    RECORD_DTYPE = np.dtype(
+        {
+            "names": ["timestamp", "player", "seed", "game", "input", "outcome"],
+            "formats": ["<f8", "<u8", "<u8", "<u2", "<i4", "<i4"],
+            "offsets": [0, 8, 16, 24, 28, 32],
+            "itemsize": RECORD.size,
+        }
+    )
+
+
+def iter_records(directory, batch: int = SCAN_RECORDS) -> Iterator:
+    """Yield NumPy record arrays straight off memory-mapped segments."""
+    if np is None:
+        raise RuntimeError("iter_records needs NumPy. Install it with: pip install numpy")
+    for path in segment_paths(directory):
+        size = path.stat().st_size
+        count = size // RECORD.size
+        if not count:
+            continue
+        # np.memmap keeps the mapping alive for as long as a slice is referenced.
+        mapped = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+        for start in range(0, count, batch):
+            yield mapped[start : start + batch]
+        del mapped
+
+
+@dataclass
+class GameTotals:
+    events: int = 0
+    hits: int = 0
+
+
+@dataclass
+class Aggregate:
+    """Stats rebuilt from the log."""
+
+    events: int = 0
+    first: Optional[float] = None
+    last: Optional[float] = None
+    games: Dict[str, GameTotals] = field(default_factory=dict)
+    players: Set[int] = field(default_factory=set)
+
+    def _add(self, game: int, events: int, hits: int) -> None:
+        totals = self.games.setdefault(GAME_NAMES.get(game, f"game-{game}"), GameTotals())
+        totals.events += events
+        totals.hits += hits
+
+    def _span(self, first: float, last: float) -> None:
+        self.first = first if self.first is None else min(self.first, first)
+        self.last = last if self.last is None else max(self.last, last)
+
+
+def aggregate(directory) -> Aggregate:
+    """Stream through every segment and total events and hits per game.
+
+    A hit is a record whose outcome equals its input (the picked side, the
+    lucky number, the guess or the blitz target).
+    """
+    result = Aggregate()
+    if np is None:
+        return _aggregate_struct(directory, result)
+    for rows in iter_records(directory):
+        games = rows["game"].astype(np.int64)
+        hits = rows["input"] == rows["outcome"]
+        events_per_game = np.bincount(games)
+        hits_per_game = np.bincount(games, weights=hits, minlength=len(events_per_game))
+        for game in np.flatnonzero(events_per_game):
+            result._add(int(game), int(events_per_game[game]), int(hits_per_game[game]))
+        result.events += len(rows)
+        stamps = rows["timestamp"]
+        result._span(float(stamps.min()), float(stamps.max()))
+        result.players.update(np.unique(rows["player"]).tolist())
+    return result
+
+
+def _aggregate_struct(directory, result: Aggregate) -> Aggregate:
+    for path in segment_paths(directory):
+        size = path.stat().st_size - path.stat().st_size % RECORD.size
+        if not size:
+            continue
+        with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)[:size]
+            for stamp, player, _seed, game, input_value, outcome in RECORD.iter_unpack(view):
+                result._add(game, 1, int(input_value == outcome))
+                result.events += 1
+                result._span(stamp, stamp)
+                result.players.add(player)
+            view.release()
+    return result
+
+
+def format_aggregate(result: Aggregate, seconds: float) -> str:
+    lines = [f"Replayed {result.events:,} events from {len(result.players):,} player(s) in {seconds:.2f}s"]
+    if result.first is not None:
+        first = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(result.first))
+        last = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(result.last))
+        lines.append(f"Span: {first} → {last}")
+    lines.append("")
+    lines.append(f"{'game':<8}{'events':>16}{'hits':>16}{'hit rate':>10}")
+    for name in sorted(result.games, key=lambda n: GAME_IDS.get(n, 99)):
+        totals = result.games[name]
+        rate = totals.hits / totals.events if totals.events else 0.0
+        lines.append(f"{name:<8}{totals.events:>16,}{totals.hits:>16,}{rate:>10.2%}")
+    return "\n".join(lines)
@@ -0,0 +1,379 @@
+"""
+Provably-fair draws: commit to a server seed up front, reveal it after.
+
+Every draw is derived from three inputs: a secret server seed, a client
+seed the player can set, and a nonce that counts draws. Before any round
+the player is shown ``sha256(server_seed)``; when they rotate seeds the
+server seed itself is revealed, and anyone can recompute each outcome with
+``derive`` and check it against the commitment.
+
+The seed that takes over at a rotation is committed (and its hash shown)
+one rotation ahead. A client seed set at a rotation is therefore always
+paired with a server seed whose commitment the player saw before choosing
+it, so the server can't pick its seed to suit the client seed.
+
+A draw in ``[0, n)`` is taken from ``HMAC-SHA256(server_seed,
+"client_seed:nonce:cursor")``: the digest is read as eight 32-bit words,
+each reduced without bias the same way ``luck_arcade.rng`` does, and the
+cursor only advances in the (vanishingly rare) case that all eight words
+are rejected.
+
+The server keeps a ``Ledger`` directory with ``seeds.csv`` (commitment,
+server seed) and ``draws.csv`` (commitment, client seed, nonce, n, value).
+``verify`` re-derives every recorded draw across worker processes.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import hmac
+import re
+import secrets
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from luck_arcade.rng import WORD_BITS, WORD_MASK, RandomMethods
+
+
+SEED_BYTES = 32
+SEEDS_FILE = "seeds.csv"
+DRAWS_FILE = "draws.csv"
+CLIENT_SEED = re.compile(r"[A-Za-z0-9_.\-]{1,64}")
+DEFAULT_FLUSH_INTERVAL = 1.0
+# Bytes of draws.csv handed to a worker at a time (lines are ~100 bytes).
+VERIFY_CHUNK_BYTES = 8 << 20
+MAX_REPORTED = 20
+
+WORDS = struct.Struct("<8I")
+
+
+def new_server_seed() -> str:
+    return secrets.token_hex(SEED_BYTES)
+
+
+def new_client_seed() -> str:
+    return secrets.token_hex(8)
+
+
+def commitment(server_seed: str) -> str:
+    """Hash shown to the player before any draw from ``server_seed``."""
+    return hashlib.sha256(server_seed.encode()).hexdigest()
+
+
+def check_client_seed(client_seed: str) -> str:
+    if not CLIENT_SEED.fullmatch(client_seed):
+        raise ValueError("client seed must be 1-64 letters, digits, '_', '.' or '-'")
+    return client_seed
+
+
+def _derive(key: bytes, client_seed: bytes, nonce: bytes, n: int) -> int:
+    threshold = (1 << WORD_BITS) % n
+    cursor = 0
+    while True:
+        message = b"%s:%s:%d" % (client_seed, nonce, cursor)
+        for word in WORDS.unpack(hmac.digest(key, message, "sha256")):
+            product = word * n
+            if product & WORD_MASK >= threshold:
+                return product >> WORD_BITS
+        cursor += 1
+
+
+def derive(server_seed: str, client_seed: str, nonce: int, n: int) -> int:
+    """The draw in ``[0, n)`` for one nonce; what players use to verify."""
+    if not 0 < n <= 1 << WORD_BITS:
+        raise ValueError(f"n must be in 1..2**32, got {n!r}")
+    return _derive(server_seed.encode(), client_seed.encode(), str(nonce).encode(), n)
+
+
+class Ledger:
+    """Server-side record of committed seeds and every draw made from them.
+
+    Seeds are written and flushed as soon as they're committed; draws are
+    buffered and flushed every ``flush_interval`` seconds and at exit.
+    """
+
+    def __init__(self, directory, flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._seeds = open(self.directory / SEEDS_FILE, "a", encoding="ascii")
+        self._draws = open(self.directory / DRAWS_FILE, "a", encoding="ascii", buffering=1 << 16)
+        self._closed = threading.Event()
+        if flush_interval:
+            threading.Thread(
+                target=self._flush_loop, args=(flush_interval,), name="luck-arcade-fair-flush", daemon=True
+            ).start()
+        atexit.register(self.close)
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            self.flush()
+
+    def commit(self, server_seed: str, hashed: str) -> None:
+        with self._lock:
+            if self._seeds.closed:
+                return
+            self._seeds.write(f"{hashed},{server_seed}\n")
+            self._seeds.flush()
+
+    def draw(self, hashed: str, client_seed: str, nonce: int, n: int, value: int) -> None:
+        with self._lock:
+            if not self._draws.closed:
+                self._draws.write(f"{hashed},{client_seed},{nonce},{n},{value}\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._draws.closed:
+                self._draws.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            self._draws.close()
+            self._seeds.close()
+
+
+@dataclass(frozen=True)
+class Reveal:
+    """A retired server seed, published so the player can check their draws."""
+
+    server_seed: str
+    commitment: str
+    client_seed: str
+    draws: int
+
+    @property
+    def valid(self) -> bool:
+        return commitment(self.server_seed) == self.commitment
+
+
+class FairRandom(RandomMethods):
+    """Engine-compatible random source whose every draw can be verified.
+
+    Each ``randbelow`` uses the next nonce under the current commitment and
+    is recorded in ``ledger`` when one is given. ``next_commitment`` is the
+    hash of the seed the next rotation switches to; both seeds are in the
+    ledger from the moment they're committed. ``rotate`` reveals the
+    current server seed, promotes the pending one and commits a new
+    pending seed. Anything drawn under the revealed seed is known from
+    then on, so callers must settle or redraw open rounds when they rotate.
+    """
+
+    __slots__ = (
+        "ledger",
+        "client_seed",
+        "server_seed",
+        "commitment",
+        "next_seed",
+        "next_commitment",
+        "nonce",
+        "_key",
+    )
+
+    def __init__(self, client_seed: Optional[str] = None, ledger: Optional[Ledger] = None) -> None:
+        self.ledger = ledger
+        self.client_seed = check_client_seed(client_seed) if client_seed else new_client_seed()
+        self.next_seed, self.next_commitment = self._commit()
+        self._promote()
+
+    def _commit(self) -> Tuple[str, str]:
+        server_seed = new_server_seed()
+        hashed = commitment(server_seed)
+        if self.ledger is not None:
+            self.ledger.commit(server_seed, hashed)
+        return server_seed, hashed
+
+    def _promote(self) -> None:
+        """Draw from the pending seed from nonce 0 and commit the one after it."""
+        self.server_seed, self.commitment = self.next_seed, self.next_commitment
+        self._key = self.server_seed.encode()
+        self.nonce = 0
+        self.next_seed, self.next_commitment = self._commit()
+
+    @property
+    def seed(self) -> int:
+        """First 64 bits of the commitment, stored with logged events."""
+        return int(self.commitment[:16], 16)
+
+    def set_client_seed(self, client_seed: str) -> Reveal:
+        """Switch client seeds, which rotates the server seed too.
+
+        Each commitment covers one (server seed, client seed) pair from
+        nonce 0, so the draws made so far are revealed under the old pair
+        and ``client_seed`` starts on the pending seed, whose commitment
+        was published before the player chose it.
+        """
+        check_client_seed(client_seed)
+        reveal = self._reveal()
+        self.client_seed = client_seed
+        self._promote()
+        return reveal
+
+    def randbelow(self, n: int) -> int:
+        if not 0 < n <= 1 << WORD_BITS:
+            raise ValueError(f"n must be in 1..2**32, got {n!r}")
+        nonce = self.nonce
+        value = _derive(self._key, self.client_seed.encode(), str(nonce).encode(), n)
+        self.nonce = nonce + 1
+        if self.ledger is not None:
+            self.ledger.draw(self.commitment, self.client_seed, nonce, n, value)
+        return value
+
+    def rotate(self) -> Reveal:
+        reveal = self._reveal()
+        self._promote()
+        return reveal
+
+    def _reveal(self) -> Reveal:
+        return Reveal(self.server_seed, self.commitment, self.client_seed, self.nonce)
+
+
+@dataclass
+class Audit:
+    """Outcome of re-deriving a ledger's draws."""
+
+    draws: int = 0
+    verified: int = 0
+    unknown: int = 0
+    bad_commitments: List[str] = field(default_factory=list)
+    mismatches: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def failed(self) -> int:
+        return self.draws - self.verified - self.unknown
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.unknown and not self.bad_commitments
+
+
+def load_seeds(directory) -> Tuple[Dict[bytes, bytes], List[str]]:
+    """Committed seeds by commitment, plus commitments whose seed doesn't hash to them."""
+    seeds: Dict[bytes, bytes] = {}
+    bad = []
+    path = Path(directory) / SEEDS_FILE
+    if not path.exists():
+        return seeds, bad
+    with open(path, encoding="ascii") as handle:
+        for line in handle:
+            hashed, _, server_seed = line.strip().partition(",")
+            if not hashed:
+                continue
+            if commitment(server_seed) != hashed:
+                bad.append(hashed)
+                continue
+            seeds[hashed.encode()] = server_seed.encode()
+    return seeds, bad
+
+
+def _chunks(path: Path, chunk_bytes: int) -> List[Tuple[str, int, int]]:
+    """Split ``path`` into byte ranges that start and end on line breaks."""
+    size = path.stat().st_size
+    jobs = []
+    start = 0
+    with open(path, "rb") as handle:
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                handle.seek(end)
+                end += len(handle.readline())
+            jobs.append((str(path), start, end))
+            start = end
+    return jobs
+
+
+_SEEDS: Dict[bytes, bytes] = {}
+
+
+def _init_worker(seeds: Dict[bytes, bytes]) -> None:
+    global _SEEDS
+    _SEEDS = seeds
+
+
+def _verify_chunk(job) -> Tuple[int, int, int, List[str]]:
+    path, start, end = job
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    seeds = _SEEDS
+    draws = verified = unknown = 0
+    mismatches = []
+    for line in data.splitlines():
+        if not line:
+            continue
+        draws += 1
+        try:
+            hashed, client_seed, nonce, n, value = line.split(b",")
+            key = seeds.get(hashed)
+            if key is None:
+                unknown += 1
+                continue
+            if _derive(key, client_seed, nonce, int(n)) == int(value):
+                verified += 1
+                continue
+        except ValueError:
+            pass
+        if len(mismatches) < MAX_REPORTED:
+            mismatches.append(line.decode("ascii", "replace"))
+    return draws, verified, unknown, mismatches
+
+
+def verify(directory, workers: int = 1, chunk_bytes: int = VERIFY_CHUNK_BYTES) -> Audit:
+    """Re-derive every draw in the ledger at ``directory``.
+
+    Draws whose commitment has no seed on record count as ``unknown``;
+    draws that don't re-derive to the recorded value are ``failed`` and
+    the first few are kept in ``mismatches``.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers!r}")
+    started = time.perf_counter()
+    seeds, bad = load_seeds(directory)
+    path = Path(directory) / DRAWS_FILE
+    jobs = _chunks(path, chunk_bytes) if path.exists() else []
+    workers = max(1, min(workers, len(jobs)))
+    audit = Audit(bad_commitments=bad, workers=workers)
+
+    if workers == 1:
+        _init_worker(seeds)
+        parts = map(_verify_chunk, jobs)
+        for part in parts:
+            _add(audit, part)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(seeds,)) as pool:
+            for part in pool.map(_verify_chunk, jobs):
+                _add(audit, part)
+    audit.seconds = time.perf_counter() - started
+    return audit
+
+
+def _add(audit: Audit, part: Tuple[int, int, int, List[str]]) -> None:
+    draws, verified, unknown, mismatches = part
+    audit.draws += draws
+    audit.verified += verified
+    audit.unknown += unknown
+    audit.mismatches.extend(mismatches[: MAX_REPORTED - len(audit.mismatches)])
+
+
+def format_audit(audit: Audit) -> str:
+    rate = audit.draws / audit.seconds if audit.seconds else 0.0
+    lines = [
+        f"Checked {audit.draws:,} draws in {audit.seconds:.2f}s ({rate:,.0f}/s) on {audit.workers} worker(s)",
+        f"Verified: {audit.verified:,} · failed: {audit.failed:,} · no seed on record: {audit.unknown:,}",
+    ]
+    if audit.bad_commitments:
+        lines.append(f"Seeds that don't match their commitment: {len(audit.bad_commitments):,}")
+        lines.extend(f"  {hashed}" for hashed in audit.bad_commitments[:MAX_REPORTED])
+    if audit.mismatches:
+        lines.append("First failing draws (commitment,client seed,nonce,n,value):")
+        lines.extend(f"  {line}" for line in audit.mismatches)
+    lines.append("OK" if audit.ok else "FAILED")
+    return "\n".join(lines)
@@ -0,0 +1,240 @@
+"""
+Game registry: each game is declared once and compiled into lookup tables.
+
+A ``GameSpec`` says what a game is: its outcome space, what the player can
+pick, when a pick wins (equality unless ``wins`` says otherwise), and any
+difficulty ``levels``. It can also name front-end handlers as
+``"module:attribute"`` strings. They're imported only when the game is
+played, so declaring dozens of games costs nothing at startup.
+
+Kinds:
+
+- ``until_win``: pick an outcome, draw until the pick wins (coin, dice).
+  These need no handlers at all; the terminal menu and the app have
+  generic ones.
+- ``guess``: find a secret number in a level's range from high/low hints.
+- ``blitz``: a burst of draws against one pick, counting hits.
+
+``table(key, level)`` compiles a spec once into a ``Table``: the outcome
+tuple, a pick index, and each pick's exact win chance, plus a flat win
+matrix for custom predicates. A draw is then one ``randbelow`` and one
+index. The CLI menu, the app tabs, ``odds`` and ``simulate`` all read the
+registry and share these tables.
+
+Other packages add games through the ``luck_arcade.games`` entry point
+group. Each entry point names a ``GameSpec`` or a sequence of them and is
+loaded the first time the registry is read. Keep the module it points to
+down to the declaration; put the implementation behind the handler
+strings.
+"""
+
+from __future__ import annotations
+
+import importlib
+import warnings
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from luck_arcade import engine
+from luck_arcade.rng import default_rng
+
+
+KINDS = ("until_win", "guess", "blitz")
+ENTRY_POINT_GROUP = "luck_arcade.games"
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """Declaration of one game."""
+
+    key: str
+    title: str
+    kind: str = "until_win"
+    difficulty: str = ""
+    blurb: str = ""
+    outcomes: Tuple[Any, ...] = ()
+    # What the player may pick; defaults to the outcomes.
+    picks: Optional[Tuple[Any, ...]] = None
+    # wins(pick, outcome); defaults to pick == outcome.
+    wins: Optional[Callable[[Any, Any], bool]] = None
+    # level -> (label, size); a level's outcomes are 1..size.
+    levels: Optional[Mapping[int, Tuple[str, int]]] = None
+    default_level: Optional[int] = None
+    # "module:attribute" handlers: console(console) coroutine, streamlit() tab.
+    console: Optional[str] = None
+    streamlit: Optional[str] = None
+    aliases: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, got {self.kind!r}")
+        if not self.outcomes and not self.levels:
+            raise ValueError(f"game {self.key!r} needs outcomes or levels")
+
+    @property
+    def label(self) -> str:
+        return f"{self.title} ({self.difficulty})" if self.difficulty else self.title
+
+
+class Table:
+    """A spec compiled for one level: outcomes, picks and win chances."""
+
+    __slots__ = ("spec", "level", "outcomes", "picks", "chances", "p", "_index", "_matrix")
+
+    def __init__(self, spec: GameSpec, level: Optional[int] = None) -> None:
+        self.spec = spec
+        self.level = level
+        if spec.levels:
+            if level not in spec.levels:
+                raise ValueError(f"level must be one of {sorted(spec.levels)}, got {level!r}")
+            self.outcomes: Tuple[Any, ...] = tuple(range(1, spec.levels[level][1] + 1))
+        else:
+            self.outcomes = tuple(spec.outcomes)
+        self.picks: Tuple[Any, ...] = tuple(spec.picks) if spec.picks is not None else self.outcomes
+        self._index = {pick: i for i, pick in enumerate(self.picks)}
+        n = len(self.outcomes)
+        if spec.wins is None and self.picks == self.outcomes:
+            # Identity: pick i wins on outcome i; no matrix needed however big n is.
+            self._matrix = None
+            self.chances = (Fraction(1, n),) * len(self.picks)
+        else:
+            won = spec.wins or (lambda pick, outcome: pick == outcome)
+            self._matrix = bytes(bool(won(pick, outcome)) for pick in self.picks for outcome in self.outcomes)
+            self.chances = tuple(
+                Fraction(sum(self._matrix[i * n : (i + 1) * n]), n) for i in range(len(self.picks))
+            )
+        # Chance per attempt with the best pick (the same for every pick in fair games).
+        self.p = max(self.chances)
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def index(self, pick) -> int:
+        try:
+            return self._index[pick]
+        except KeyError:
+            raise ValueError(f"{self.spec.key}: pick must be one of {self.picks}, got {pick!r}") from None
+
+    def won(self, pick_index: int, outcome_index: int) -> bool:
+        if self._matrix is None:
+            return pick_index == outcome_index
+        return bool(self._matrix[pick_index * len(self.outcomes) + outcome_index])
+
+    def play(self, pick_index: int, rng=None) -> Tuple[Any, bool]:
+        """Draw one outcome for ``pick_index``; returns ``(outcome, won)``."""
+        outcome = (rng or default_rng()).randbelow(len(self.outcomes))
+        return self.outcomes[outcome], self.won(pick_index, outcome)
+
+
+COIN = GameSpec(
+    key="coin",
+    title="Flip a Coin",
+    difficulty="easy",
+    outcomes=engine.COIN_SIDES,
+    console="luck_arcade.console:Console.flip_coin",
+)
+DICE = GameSpec(
+    key="dice",
+    title="Roll a Dice",
+    difficulty="medium",
+    outcomes=engine.DICE_FACES,
+    console="luck_arcade.console:Console.roll_dice",
+)
+GUESS = GameSpec(
+    key="guess",
+    title="Pick a Random Number",
+    kind="guess",
+    difficulty="hard",
+    levels=engine.LEVELS,
+    default_level=3,
+    console="luck_arcade.console:Console.pick_random_number",
+)
+BLITZ = GameSpec(
+    key="blitz",
+    title="Time Attack",
+    kind="blitz",
+    outcomes=engine.DICE_FACES,
+)
+BUILTIN = (COIN, DICE, GUESS, BLITZ)
+
+
+def _discover() -> List[GameSpec]:
+    from importlib.metadata import entry_points
+
+    found = []
+    for entry in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            loaded = entry.load()
+        except Exception as exc:  # a broken plugin mustn't take the arcade down
+            warnings.warn(f"skipping game plugin {entry.name!r}: {exc}")
+            continue
+        found.extend(loaded if isinstance(loaded, (list, tuple)) else [loaded])
+    return found
+
+
+@lru_cache(maxsize=None)
+def registry() -> Dict[str, GameSpec]:
+    """Every game by key: the built-ins, then plugins in discovery order."""
+    games: Dict[str, GameSpec] = {}
+    for spec in BUILTIN + tuple(_discover()):
+        if not isinstance(spec, GameSpec):
+            warnings.warn(f"skipping game plugin entry that isn't a GameSpec: {spec!r}")
+        elif spec.key in games:
+            warnings.warn(f"skipping game plugin {spec.key!r}: that key is taken")
+        else:
+            games[spec.key] = spec
+    return games
+
+
+def get(key: str) -> GameSpec:
+    try:
+        return registry()[key]
+    except KeyError:
+        raise ValueError(f"unknown game {key!r}; known games: {', '.join(registry())}") from None
+
+
+def of_kind(*kinds: str) -> List[GameSpec]:
+    return [spec for spec in registry().values() if spec.kind in kinds]
+
+
+@lru_cache(maxsize=None)
+def table(key: str, level: Optional[int] = None) -> Table:
+    """The compiled table for ``key`` (at ``level``, or the game's default)."""
+    spec = get(key)
+    if spec.levels and level is None:
+        level = spec.default_level
+    return Table(spec, level if spec.levels else None)
+
+
+@lru_cache(maxsize=None)
+def load(target: str) -> Callable:
+    """Import ``"module:attribute.path"`` and return the attribute."""
+    module_name, _, path = target.partition(":")
+    value: Any = importlib.import_module(module_name)
+    for name in path.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def handler(spec: GameSpec, front: str) -> Optional[Callable]:
+    """``spec``'s handler for ``front`` (``"console"`` or ``"streamlit"``), if it names one."""
+    target = getattr(spec, front)
+    return load(target) if target else None
+
+
+def playable(front: str) -> List[GameSpec]:
+    """Games ``front`` can offer: those with a handler, and every ``until_win`` game."""
+    return [spec for spec in registry().values() if getattr(spec, front) or spec.kind == "until_win"]
+
+
+def menu_keys(specs: Sequence[GameSpec]) -> Dict[str, str]:
+    """Menu answers to game keys: ``"1"``, ``"2"``, ... plus keys and aliases."""
+    choices = {}
+    for number, spec in enumerate(specs, start=1):
+        choices[str(number)] = spec.key
+        choices[spec.key] = spec.key
+        for alias in spec.aliases:
+            choices[alias] = spec.key
+    return choices
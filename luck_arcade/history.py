@@ -0,0 +1,209 @@
+"""
+Long-term attempt history at several resolutions, downsampled for charts.
+
+``Trend`` records running totals (attempts, wins) with a timestamp in three
+tiers: the last ``RAW_CAPACITY`` events one by one, one point per active
+minute for the last ``MINUTE_WINDOW`` seconds, and one point per active
+day forever. Totals are cumulative, so a rollup point is just the last
+event in its bucket and every append is O(1); the stored size depends on
+how many minutes and days a player was active, not on how many attempts
+they made.
+
+``series`` stitches the tiers together (days, then minutes, then raw
+events, each covering the time before the next tier starts) and reduces
+the result to a fixed point budget with Largest-Triangle-Three-Buckets, so
+a chart of a million attempts costs the same as a chart of a hundred.
+"""
+
+from __future__ import annotations
+
+import base64
+import time
+from array import array
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+
+RAW_CAPACITY = 500
+MINUTE_WINDOW = 24 * 60 * 60
+DAY_SECONDS = 24 * 60 * 60
+DEFAULT_POINTS = 120
+
+
+class Point(NamedTuple):
+    time: float
+    attempts: int
+    wins: int
+
+
+class Tier:
+    """Columns of (time, attempts, wins), with the last bucket updated in place."""
+
+    __slots__ = ("width", "times", "attempts", "wins")
+
+    def __init__(self, width: Optional[float]) -> None:
+        # Seconds per bucket; None keeps every point.
+        self.width = width
+        self.times = array("d")
+        self.attempts = array("q")
+        self.wins = array("q")
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def add(self, when: float, attempts: int, wins: int) -> None:
+        if self.width and self.times and when // self.width == self.times[-1] // self.width:
+            self.times[-1] = when
+            self.attempts[-1] = attempts
+            self.wins[-1] = wins
+            return
+        self.times.append(when)
+        self.attempts.append(attempts)
+        self.wins.append(wins)
+
+    def drop_before(self, cutoff: float) -> None:
+        count = 0
+        for when in self.times:
+            if when >= cutoff:
+                break
+            count += 1
+        if count:
+            del self.times[:count]
+            del self.attempts[:count]
+            del self.wins[:count]
+
+    def drop_first(self, count: int) -> None:
+        del self.times[:count]
+        del self.attempts[:count]
+        del self.wins[:count]
+
+    def points(self, before: Optional[float] = None) -> List[Point]:
+        return [
+            Point(when, attempts, wins)
+            for when, attempts, wins in zip(self.times, self.attempts, self.wins)
+            if before is None or when < before
+        ]
+
+    def encode(self) -> str:
+        return base64.b64encode(self.times.tobytes() + self.attempts.tobytes() + self.wins.tobytes()).decode("ascii")
+
+    def decode(self, text: str) -> None:
+        data = base64.b64decode(text)
+        size = len(data) // (self.times.itemsize + self.attempts.itemsize + self.wins.itemsize)
+        split = size * self.times.itemsize
+        self.times = array("d", data[:split])
+        self.attempts = array("q", data[split : split + size * 8])
+        self.wins = array("q", data[split + size * 8 :])
+
+
+class Trend:
+    """One player's running totals at per-attempt, per-minute and per-day resolution."""
+
+    __slots__ = ("attempts", "wins", "raw", "minutes", "days", "version", "_cache")
+
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.wins = 0
+        self.raw = Tier(None)
+        self.minutes = Tier(60)
+        self.days = Tier(DAY_SECONDS)
+        # Bumped on every record; lets callers ask for what changed.
+        self.version = 0
+        self._cache: Optional[Tuple[int, int, List[Point]]] = None
+
+    def __len__(self) -> int:
+        return self.version
+
+    def record(self, attempts: int, wins: int, when: Optional[float] = None) -> None:
+        when = time.time() if when is None else when
+        self.attempts += attempts
+        self.wins += wins
+        self.version += 1
+        for tier in (self.raw, self.minutes, self.days):
+            tier.add(when, self.attempts, self.wins)
+        if len(self.raw) > 2 * RAW_CAPACITY:
+            self.raw.drop_first(len(self.raw) - RAW_CAPACITY)
+        if self.minutes.times and self.minutes.times[0] < when - 2 * MINUTE_WINDOW:
+            self.minutes.drop_before(when - MINUTE_WINDOW)
+
+    def latest(self, count: int) -> List[Point]:
+        """The last ``count`` recorded events (at most ``RAW_CAPACITY``)."""
+        count = min(count, len(self.raw))
+        if count <= 0:
+            return []
+        return self.raw.points()[-count:]
+
+    def series(self, points: int = DEFAULT_POINTS) -> List[Point]:
+        """The whole history as at most ``points`` points."""
+        if self._cache is not None and self._cache[:2] == (self.version, points):
+            return self._cache[2]
+        raw = self.raw.points()
+        start = raw[0].time if raw else None
+        minutes = self.minutes.points(before=start)
+        if minutes:
+            start = minutes[0].time
+        merged = self.days.points(before=start) + minutes + raw
+        chosen = [merged[i] for i in lttb([p.time for p in merged], [p.attempts for p in merged], points)]
+        self._cache = (self.version, points, chosen)
+        return chosen
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def to_dict(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "wins": self.wins,
+            "version": self.version,
+            "raw": self.raw.encode(),
+            "minutes": self.minutes.encode(),
+            "days": self.days.encode(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "Trend":
+        trend = cls()
+        if data:
+            trend.attempts = data.get("attempts", 0)
+            trend.wins = data.get("wins", 0)
+            trend.version = data.get("version", 0)
+            for name in ("raw", "minutes", "days"):
+                getattr(trend, name).decode(data.get(name, ""))
+        return trend
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], points: int) -> List[int]:
+    """Indices of ``points`` samples that keep the shape of ``(xs, ys)``.
+
+    Largest-Triangle-Three-Buckets: keep the first and last point, split the
+    rest into ``points - 2`` buckets and from each keep the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average.
+    """
+    n = len(xs)
+    if points >= n:
+        return list(range(n))
+    if points < 3:
+        raise ValueError(f"points must be at least 3, got {points!r}")
+    chosen = [0]
+    every = (n - 2) / (points - 2)
+    a = 0
+    for bucket in range(points - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        span = next_end - end
+        if span > 0:
+            avg_x = sum(xs[end:next_end]) / span
+            avg_y = sum(ys[end:next_end]) / span
+        else:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        chosen.append(best)
+        a = best
+    chosen.append(n - 1)
+    return chosen
@@ -0,0 +1,243 @@
+"""
+Server-wide leaderboards kept up to date as results come in.
+
+Each board holds at most ``k`` players, one entry per player with their
+best score, in a list kept sorted with ``bisect``. Submitting a result is
+O(log K) to find its place plus an O(K) list shift, and only results that
+beat a player's own best can change anything, so the board stays exact
+without ever scanning every player.
+
+Pages read ``snapshot(board)``: an immutable ranked copy that is rebuilt
+at most once per ``ttl`` seconds, and only if the board changed. Rendering a
+board is O(K) no matter how many players there are.
+
+Boards:
+
+- ``streak_best``: longest win streak (higher is better).
+- ``blitz_best_hits``: most hits in one Time Attack blitz (higher is better).
+- ``daily:YYYY-MM-DD``: fewest attempts to crack that day's challenge.
+- ``guess:<level>``: fewest attempts to guess a number at that level.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from luck_arcade import engine
+
+
+DEFAULT_K = 50
+DEFAULT_TTL = 5.0
+DAILY_DAYS_KEPT = 7
+STORE_KEY = "__leaderboard__"
+
+HIGHER_IS_BETTER = {"streak_best": True, "blitz_best_hits": True, "daily": False, "guess": False}
+
+log = logging.getLogger(__name__)
+
+
+def board_kind(board: str) -> str:
+    return board.partition(":")[0]
+
+
+def known_board(board: str) -> bool:
+    """Whether ``board`` names a board this version can rank and title."""
+    kind, _, arg = board.partition(":")
+    if kind not in HIGHER_IS_BETTER:
+        return False
+    return arg.isdigit() if kind == "guess" else True
+
+
+def board_title(board: str) -> str:
+    kind, _, arg = board.partition(":")
+    if kind == "streak_best":
+        return "Best win streak"
+    if kind == "blitz_best_hits":
+        return "Most blitz hits"
+    if kind == "daily":
+        return f"Daily challenge {arg} · fewest attempts"
+    if kind == "guess":
+        return f"{engine.level_label(int(arg))} · fewest guesses"
+    raise KeyError(board)
+
+
+def daily_board(day) -> str:
+    return f"daily:{day.isoformat()}"
+
+
+def guess_board(level: int) -> str:
+    return f"guess:{level}"
+
+
+class Row(NamedTuple):
+    rank: int
+    name: str
+    score: int
+
+
+class Snapshot(NamedTuple):
+    board: str
+    title: str
+    rows: Tuple[Row, ...]
+    taken: float
+
+
+class TopK:
+    """Best score per player for the ``k`` best players, kept sorted."""
+
+    __slots__ = ("k", "higher", "_keys", "_players", "_best", "_names", "_seq")
+
+    def __init__(self, k: int = DEFAULT_K, higher: bool = True) -> None:
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k!r}")
+        self.k = k
+        self.higher = higher
+        # Sort keys (score for "lower is better", -score otherwise, then arrival order).
+        self._keys: List[Tuple[int, int]] = []
+        self._players: List[str] = []
+        self._best: Dict[str, Tuple[int, int]] = {}
+        self._names: Dict[str, str] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def submit(self, player: str, name: str, score: int) -> bool:
+        """Offer ``score`` for ``player``; return True if the board changed."""
+        self._seq += 1
+        key = (-score if self.higher else score, self._seq)
+        current = self._best.get(player)
+        if current is not None:
+            if key[0] >= current[0]:
+                if self._names[player] == name:
+                    return False
+                self._names[player] = name
+                return True
+            index = bisect.bisect_left(self._keys, current)
+            del self._keys[index]
+            del self._players[index]
+        elif len(self._keys) >= self.k and key >= self._keys[-1]:
+            return False
+        index = bisect.bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._players.insert(index, player)
+        self._best[player] = key
+        self._names[player] = name
+        if len(self._keys) > self.k:
+            self._keys.pop()
+            dropped = self._players.pop()
+            del self._best[dropped]
+            del self._names[dropped]
+        return True
+
+    def rows(self) -> Tuple[Row, ...]:
+        sign = -1 if self.higher else 1
+        return tuple(
+            Row(rank, self._names[player], sign * key[0])
+            for rank, (key, player) in enumerate(zip(self._keys, self._players), start=1)
+        )
+
+    def rank_of(self, player: str) -> Optional[int]:
+        key = self._best.get(player)
+        return None if key is None else bisect.bisect_left(self._keys, key) + 1
+
+    def to_list(self) -> list:
+        sign = -1 if self.higher else 1
+        return [[player, self._names[player], sign * key[0]] for key, player in zip(self._keys, self._players)]
+
+
+class Leaderboard:
+    """All boards, safe to share between sessions (one lock)."""
+
+    def __init__(self, k: int = DEFAULT_K, ttl: float = DEFAULT_TTL) -> None:
+        self.k = k
+        self.ttl = ttl
+        self._boards: Dict[str, TopK] = {}
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+        self.changed = False
+
+    def _board(self, board: str) -> TopK:
+        top = self._boards.get(board)
+        if top is None:
+            top = self._boards[board] = TopK(self.k, HIGHER_IS_BETTER[board_kind(board)])
+            if board_kind(board) == "daily":
+                self._prune_daily()
+        return top
+
+    def _prune_daily(self) -> None:
+        days = sorted(name for name in self._boards if board_kind(name) == "daily")
+        for name in days[:-DAILY_DAYS_KEPT]:
+            del self._boards[name]
+            self._snapshots.pop(name, None)
+            self._dirty.discard(name)
+
+    def submit(self, board: str, player: str, name: str, score: int) -> bool:
+        with self._lock:
+            changed = self._board(board).submit(player, name, score)
+            if changed:
+                self._dirty.add(board)
+                self.changed = True
+            return changed
+
+    def snapshot(self, board: str, now: Optional[float] = None) -> Snapshot:
+        """Ranked rows for ``board``, at most ``ttl`` seconds stale."""
+        now = time.monotonic() if now is None else now
+        cached = self._snapshots.get(board)
+        if cached is not None and (board not in self._dirty or now - cached.taken < self.ttl):
+            return cached
+        with self._lock:
+            top = self._boards.get(board)
+            rows = top.rows() if top is not None else ()
+            self._dirty.discard(board)
+            snap = self._snapshots[board] = Snapshot(board, board_title(board), rows, now)
+        return snap
+
+    def rank_of(self, board: str, player: str) -> Optional[int]:
+        with self._lock:
+            top = self._boards.get(board)
+            return None if top is None else top.rank_of(player)
+
+    def boards(self) -> List[str]:
+        with self._lock:
+            return list(self._boards)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            self.changed = False
+            return {board: top.to_list() for board, top in self._boards.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict, k: int = DEFAULT_K, ttl: float = DEFAULT_TTL) -> "Leaderboard":
+        """Boards from ``to_dict`` output; unknown boards and malformed rows are skipped."""
+        leaderboard = cls(k, ttl)
+        if not isinstance(data, dict):
+            log.warning("ignoring saved leaderboards: expected a dict, got %s", type(data).__name__)
+            return leaderboard
+        for board, entries in data.items():
+            if not known_board(board) or not isinstance(entries, list):
+                log.warning("ignoring unknown saved leaderboard %r", board)
+                continue
+            top = leaderboard._board(board)
+            for entry in entries:
+                try:
+                    player, name, score = entry
+                    top.submit(str(player), str(name), int(score))
+                except (TypeError, ValueError):
+                    log.warning("ignoring malformed entry on leaderboard %r: %r", board, entry)
+        return leaderboard
+
+    @classmethod
+    def load(cls, backend, k: int = DEFAULT_K, ttl: float = DEFAULT_TTL) -> "Leaderboard":
+        """Restore the boards saved in a ``store.StatsBackend``."""
+        return cls.from_dict(backend.load(STORE_KEY) or {}, k, ttl)
+
+    def save(self, backend) -> None:
+        """Queue the boards for the backend's next write (only if they changed)."""
+        if self.changed:
+            backend.save(STORE_KEY, self.to_dict())
@@ -0,0 +1,179 @@
+"""
+Headless load test for the Streamlit app.
+
+Drives ``--sessions`` simulated players through Streamlit's ``AppTest``
+harness, each clicking through flips, rolls, guesses and blitzes. ``AppTest``
+isn't thread-safe, so ``--concurrency`` worker processes each play their
+share of the sessions one after another. Reports script-run latency
+percentiles, reruns per second and resident memory per session. Everything
+runs offline: stats, daily targets and tournaments stay in memory, and
+events, fair-mode ledgers and spilled sessions go to a throwaway directory.
+
+    python -m luck_arcade.loadtest --sessions 50 --clicks 40 --concurrency 8
+
+``AppTest`` reruns the whole script for every click, so the latencies are
+an upper bound on what a fragment rerun costs in a live server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+
+APP_PATH = Path(__file__).resolve().parent / "streamlit_app.py"
+ACTIONS = ("coin_flip", "dice_roll", "submit_guess", "blitz_start")
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (Linux)."""
+    with open("/proc/self/statm") as handle:
+        pages = int(handle.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = min(max(1, math.ceil(fraction * len(ordered))), len(ordered))
+    return ordered[rank - 1]
+
+
+@dataclass
+class Report:
+    sessions: int
+    clicks_per_session: int
+    concurrency: int
+    reruns: int
+    errors: int
+    seconds: float
+    reruns_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    bytes_per_session: float
+
+    def format(self) -> str:
+        return "\n".join(
+            [
+                f"{self.sessions} session(s) x {self.clicks_per_session} click(s), concurrency {self.concurrency}",
+                f"Reruns: {self.reruns:,} in {self.seconds:.2f}s ({self.reruns_per_second:.1f}/s), errors: {self.errors}",
+                f"Script run latency: p50 {self.p50_ms:.1f} ms · p95 {self.p95_ms:.1f} ms · "
+                f"p99 {self.p99_ms:.1f} ms · max {self.max_ms:.1f} ms",
+                f"Memory per session: {self.bytes_per_session / 1024:.1f} KiB (RSS delta)",
+            ]
+        )
+
+
+class Session:
+    """One simulated player."""
+
+    def __init__(self, index: int, timeout: float) -> None:
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        self.app.query_params["player"] = f"loadtest-{index}"
+        self.index = index
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def _timed_run(self) -> None:
+        started = time.perf_counter()
+        self.app.run()
+        self.latencies.append(time.perf_counter() - started)
+        if self.app.exception:
+            self.errors += 1
+
+    def play(self, clicks: int) -> None:
+        self._timed_run()
+        for step in range(clicks):
+            key = ACTIONS[(self.index + step) % len(ACTIONS)]
+            self.app.button(key=key).click()
+            self._timed_run()
+
+
+def play_share(indexes: Sequence[int], clicks: int, timeout: float) -> Tuple[List[float], int, int, float]:
+    """Worker: play the sessions in ``indexes``; returns latencies, errors, RSS growth and seconds."""
+    # Warm imports and process-wide caches so they don't count against sessions.
+    Session(-1 - indexes[0], timeout).play(len(ACTIONS))
+    baseline = rss_bytes()
+    players = [Session(i, timeout) for i in indexes]
+    started = time.perf_counter()
+    for player in players:
+        player.play(clicks)
+    seconds = time.perf_counter() - started
+    grown = max(0, rss_bytes() - baseline)
+    latencies = [sample for player in players for sample in player.latencies]
+    return latencies, sum(player.errors for player in players), grown, seconds
+
+
+def scratch_environment() -> None:
+    """Point every store the app writes at memory or a throwaway directory."""
+    scratch = tempfile.mkdtemp(prefix="luck-arcade-loadtest-")
+    os.environ.setdefault("LUCK_ARCADE_STATS", "memory://")
+    os.environ.setdefault("LUCK_ARCADE_DAILY", ":memory:")
+    os.environ.setdefault("LUCK_ARCADE_TOURNAMENTS", ":memory:")
+    os.environ.setdefault("LUCK_ARCADE_EVENTS", os.path.join(scratch, "events"))
+    os.environ.setdefault("LUCK_ARCADE_FAIR", os.path.join(scratch, "fair"))
+    os.environ.setdefault("LUCK_ARCADE_SESSIONS", os.path.join(scratch, "sessions"))
+
+
+def run(sessions: int, clicks: int, concurrency: int, timeout: float = 30.0) -> Report:
+    scratch_environment()
+    workers = max(1, min(concurrency, sessions))
+    shares = [range(worker, sessions, workers) for worker in range(workers)]
+    # Spawned workers start clean and inherit the environment set above.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = list(pool.map(play_share, shares, [clicks] * workers, [timeout] * workers))
+    # Workers play side by side, so the slowest one spans the run.
+    seconds = max(result[3] for result in results)
+    grown = sum(result[2] for result in results)
+
+    latencies = [sample for result in results for sample in result[0]]
+    return Report(
+        sessions=sessions,
+        clicks_per_session=clicks,
+        concurrency=concurrency,
+        reruns=len(latencies),
+        errors=sum(result[1] for result in results),
+        seconds=seconds,
+        reruns_per_second=len(latencies) / seconds if seconds else 0.0,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        max_ms=max(latencies, default=0.0) * 1000,
+        bytes_per_session=grown / sessions if sessions else 0.0,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="luck_arcade.loadtest", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sessions", type=int, default=20, help="simulated players (default 20)")
+    parser.add_argument("--clicks", type=int, default=20, help="clicks per player (default 20)")
+    parser.add_argument("--concurrency", type=int, default=4, help="worker processes playing at once (default 4)")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.sessions, args.clicks, args.concurrency)
+    print(report.format())
+    if args.json:
+        Path(args.json).write_text(json.dumps(asdict(report), indent=2) + "\n", encoding="utf-8")
+    if report.errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
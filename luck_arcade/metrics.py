@@ -0,0 +1,368 @@
+"""
+Counters and latency histograms for the app and the console, Prometheus style.
+
+Metrics are declared once at import time. Recording one is a flag check
+and a list increment in the calling thread's own shard, with no lock and
+no shared write. ``render`` adds the shards up when something scrapes. A
+thread's shard is folded into a retired total when the thread exits, so
+Streamlit's short-lived script threads don't pile up.
+
+    ATTEMPTS.labels("coin", "app").inc()
+    with RERUN_SECONDS.labels("coin_game").time():
+        ...
+
+Collection can be switched off and on at runtime (``enable``); when it is
+off, recording returns after one global check. ``LUCK_ARCADE_METRICS=off``
+starts with it off. The text can be served on ``/metrics`` (``serve``,
+``LUCK_ARCADE_METRICS_PORT``) or written to a file every few seconds
+(``dump_every``, ``LUCK_ARCADE_METRICS_FILE``). ``start_from_env`` starts
+whichever the environment asks for.
+
+Pure standard library and cheap to import: the CLI loads it on every run.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_DUMP_SECONDS = 15.0
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+log = logging.getLogger(__name__)
+
+_enabled = os.environ.get("LUCK_ARCADE_METRICS", "on") != "off"
+_lock = threading.RLock()
+# Slot count so far; every shard is a list of floats this long.
+_slots = 0
+_shards: List[List[float]] = []
+_retired: List[float] = []
+_local = threading.local()
+_metrics: List["Metric"] = []
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _allocate(count: int) -> int:
+    global _slots
+    with _lock:
+        first = _slots
+        _slots += count
+        return first
+
+
+class _ShardOwner:
+    """Lives only in a thread's ``threading.local``; its death retires the shard."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire(values: List[float]) -> None:
+    with _lock:
+        _retired.extend([0.0] * (len(values) - len(_retired)))
+        for slot, value in enumerate(values):
+            _retired[slot] += value
+        _shards[:] = [shard for shard in _shards if shard is not values]
+
+
+def _shard() -> List[float]:
+    """This thread's shard, created or grown to cover every slot."""
+    values = getattr(_local, "values", None)
+    if values is None:
+        values = _local.values = []
+        _local.owner = _ShardOwner()
+        weakref.finalize(_local.owner, _retire, values)
+        with _lock:
+            _shards.append(values)
+    if len(values) < _slots:
+        values.extend([0.0] * (_slots - len(values)))
+    return values
+
+
+def _totals() -> List[float]:
+    with _lock:
+        shards = [list(values) for values in _shards] + [list(_retired)]
+        totals = [0.0] * _slots
+    for values in shards:
+        for slot, value in enumerate(values):
+            totals[slot] += value
+    return totals
+
+
+class Metric:
+    """A named metric whose children (one per label combination) own slots."""
+
+    kind = ""
+    width = 1
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children: Dict[Tuple[str, ...], "Child"] = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+        if not self.label_names:
+            self.labels()
+
+    def labels(self, *values) -> "Child":
+        child = self._children.get(values)
+        if child is None:
+            key = tuple(str(value) for value in values)
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}, got {values!r}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self.child_class(self, _allocate(self.width))
+        return child
+
+    def samples(self, totals: List[float]) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        rows = []
+        for key, child in sorted(self._children.items()):
+            labels = tuple(zip(self.label_names, key))
+            rows.extend(child.samples(labels, totals))
+        return rows
+
+
+class Child:
+    __slots__ = ("metric", "slot")
+
+    def __init__(self, metric: Metric, slot: int) -> None:
+        self.metric = metric
+        self.slot = slot
+
+    def inc(self, amount: float = 1.0) -> None:
+        if not _enabled:
+            return
+        try:
+            _local.values[self.slot] += amount
+        except (AttributeError, IndexError):
+            _shard()[self.slot] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def samples(self, labels, totals):
+        return [(self.metric.name, labels, totals[self.slot])]
+
+
+class Counter(Metric):
+    kind = "counter"
+    child_class = Child
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+
+class GaugeChild(Child):
+    """Per-thread ``inc``/``dec`` that add up, or a function read at scrape time."""
+
+    __slots__ = ("function",)
+
+    def __init__(self, metric: Metric, slot: int) -> None:
+        super().__init__(metric, slot)
+        self.function: Optional[Callable[[], float]] = None
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.function = function
+
+    def samples(self, labels, totals):
+        value = self.function() if self.function is not None else totals[self.slot]
+        return [(self.metric.name, labels, value)]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+    child_class = GaugeChild
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._children[()].inc(-amount)
+
+
+class _Timer:
+    __slots__ = ("child", "started")
+
+    def __init__(self, child: "HistogramChild") -> None:
+        self.child = child
+
+    def __enter__(self) -> "_Timer":
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.child.observe(perf_counter() - self.started)
+
+
+class HistogramChild(Child):
+    """Slots: one count per bucket (the last is +Inf), then the sum."""
+
+    __slots__ = ("buckets", "total")
+
+    def __init__(self, metric: Metric, slot: int) -> None:
+        super().__init__(metric, slot)
+        self.buckets = metric.buckets
+        self.total = slot + metric.width - 1
+
+    def observe(self, value: float) -> None:
+        if not _enabled:
+            return
+        bucket = self.slot + bisect_left(self.buckets, value)
+        try:
+            values = _local.values
+            values[bucket] += 1
+            values[self.total] += value
+        except (AttributeError, IndexError):
+            values = _shard()
+            values[bucket] += 1
+            values[self.total] += value
+
+    def time(self) -> _Timer:
+        """Context manager observing the seconds its block takes."""
+        return _Timer(self)
+
+    def samples(self, labels, totals):
+        name, buckets = self.metric.name, self.metric.buckets
+        rows, running = [], 0.0
+        for i, bound in enumerate(buckets + (float("inf"),)):
+            running += totals[self.slot + i]
+            rows.append((f"{name}_bucket", labels + (("le", _number(bound)),), running))
+        rows.append((f"{name}_sum", labels, totals[self.slot + len(buckets) + 1]))
+        rows.append((f"{name}_count", labels, running))
+        return rows
+
+
+class Histogram(Metric):
+    kind = "histogram"
+    child_class = HistogramChild
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.width = len(self.buckets) + 2
+        super().__init__(name, help, labels)
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    totals = _totals()
+    lines = []
+    for metric in list(_metrics):
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples(totals):
+            label_text = ",".join(f'{key}="{_escape(text)}"' for key, text in labels)
+            lines.append(f"{name}{{{label_text}}} {_number(value)}" if labels else f"{name} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def dump(path: str) -> None:
+    """Write ``render()`` to ``path`` atomically."""
+    scratch = f"{path}.tmp"
+    with open(scratch, "w", encoding="utf-8") as handle:
+        handle.write(render())
+    os.replace(scratch, path)
+
+
+def dump_every(path: str, seconds: float = DEFAULT_DUMP_SECONDS) -> threading.Event:
+    """Dump to ``path`` every ``seconds`` from a daemon thread; set the event to stop."""
+    stopped = threading.Event()
+
+    def loop() -> None:
+        while not stopped.wait(seconds):
+            try:
+                dump(path)
+            except Exception:
+                # A full disk or a vanished directory must not end the exports.
+                log.exception("writing metrics to %s failed; trying again in %.0fs", path, seconds)
+
+    threading.Thread(target=loop, name="luck-arcade-metrics-dump", daemon=True).start()
+    return stopped
+
+
+def serve(port: int, host: str = "127.0.0.1"):
+    """Serve ``GET /metrics`` from a daemon thread; returns the HTTP server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="luck-arcade-metrics", daemon=True).start()
+    return server
+
+
+def start_from_env() -> Optional[str]:
+    """Start the exporter the environment configures; returns where, if anywhere."""
+    port = os.environ.get("LUCK_ARCADE_METRICS_PORT")
+    if port:
+        serve(int(port))
+        return f"http://127.0.0.1:{port}/metrics"
+    path = os.environ.get("LUCK_ARCADE_METRICS_FILE")
+    if path:
+        dump_every(path)
+        return path
+    return None
+
+
+ATTEMPTS = Counter("luck_arcade_attempts_total", "Flips, rolls, guesses and blitz rolls played.", ("game", "front"))
+WINS = Counter("luck_arcade_wins_total", "Attempts that won.", ("game", "front"))
+RERUN_SECONDS = Histogram("luck_arcade_rerun_seconds", "Script or fragment run time in the app.", ("tab",))
+ANIMATION_SECONDS = Counter("luck_arcade_animation_seconds_total", "Reveal animation time sent to browsers.")
+SESSIONS = Gauge("luck_arcade_sessions", "App sessions held by this process.", ("state",))
+SESSIONS_STARTED = Counter("luck_arcade_sessions_started_total", "App sessions started.")
+CONSOLE_SESSIONS = Gauge("luck_arcade_console_sessions", "Terminal, batch and TCP sessions running.")
+CONSOLE_GAME_SECONDS = Histogram(
+    "luck_arcade_console_game_seconds",
+    "Time from choosing a game in the console menu to returning to it.",
+    ("game",),
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 300.0),
+)
+
+
+def played(game: str, front: str, attempts: int = 1, wins: int = 0) -> None:
+    """Count ``attempts`` (and ``wins``) of ``game`` played on ``front``."""
+    if not _enabled:
+        return
+    ATTEMPTS.labels(game, front).inc(attempts)
+    if wins:
+        WINS.labels(game, front).inc(wins)
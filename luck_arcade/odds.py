@@ -0,0 +1,229 @@
+"""
+Exact odds for every game configuration, computed rather than simulated.
+
+Every result is an exact ``Fraction`` and is memoized by configuration, so
+the UI can show odds on every rerun for free and the simulator can check
+its histograms against ground truth.
+
+- coin / dice / any ``until_win`` game in ``luck_arcade.games`` / guessing
+  at random: attempts to win are geometric, with the chance per attempt
+  read from the game's compiled table.
+- guess by halving: the attempt count for each secret number is its depth
+  in the midpoint search tree, counted per depth with a memoized recursion
+  over range sizes.
+- blitz: hits out of ``rolls`` dice are binomial.
+- streaks: the chance of reaching a streak, the distribution of the longest
+  run of wins in ``attempts`` attempts (a linear recurrence per length), and
+  the length of a streak as the simulator counts them.
+
+Pure Python: no NumPy, so the CLI and the app can import it cheaply.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+from typing import Tuple, Union
+
+from luck_arcade import games
+
+
+STRATEGIES = ("bisect", "random")
+# Longest-streak distributions are O(attempts**2) fraction operations.
+MAX_STREAK_ATTEMPTS = 1000
+
+Distribution = Union["Geometric", "Finite"]
+
+
+@dataclass(frozen=True)
+class Geometric:
+    """Attempts until the first win, each attempt winning with probability ``p``."""
+
+    p: Fraction
+
+    @property
+    def mean(self) -> Fraction:
+        return 1 / self.p
+
+    @property
+    def variance(self) -> Fraction:
+        return (1 - self.p) / self.p**2
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def pmf(self, k: int) -> Fraction:
+        return self.p * (1 - self.p) ** (k - 1) if k >= 1 else Fraction(0)
+
+    def cdf(self, k: int) -> Fraction:
+        """Chance of winning within ``k`` attempts."""
+        return 1 - (1 - self.p) ** k if k >= 1 else Fraction(0)
+
+    def quantile(self, q) -> int:
+        """Fewest attempts that win with probability at least ``q``."""
+        q = Fraction(q)
+        if self.p == 1 or q <= 0:
+            return 1
+        if q >= 1:
+            raise ValueError("a geometric distribution never reaches certainty")
+        k = max(1, math.ceil(math.log1p(-float(q)) / math.log1p(-float(self.p))))
+        while k > 1 and self.cdf(k - 1) >= q:
+            k -= 1
+        while self.cdf(k) < q:
+            k += 1
+        return k
+
+
+@dataclass(frozen=True)
+class Finite:
+    """A distribution over ``0..len(probs) - 1``."""
+
+    probs: Tuple[Fraction, ...]
+
+    @property
+    def mean(self) -> Fraction:
+        return sum((k * p for k, p in enumerate(self.probs)), Fraction(0))
+
+    @property
+    def variance(self) -> Fraction:
+        mean = self.mean
+        return sum(((k - mean) ** 2 * p for k, p in enumerate(self.probs)), Fraction(0))
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def max(self) -> int:
+        return len(self.probs) - 1
+
+    def pmf(self, k: int) -> Fraction:
+        return self.probs[k] if 0 <= k < len(self.probs) else Fraction(0)
+
+    def cdf(self, k: int) -> Fraction:
+        return sum(self.probs[: max(0, k + 1)], Fraction(0))
+
+    def quantile(self, q) -> int:
+        q = Fraction(q)
+        running = Fraction(0)
+        for k, p in enumerate(self.probs):
+            running += p
+            if running >= q:
+                return k
+        return self.max
+
+
+@lru_cache(maxsize=None)
+def win_chance(game: str, max_number: int = 0) -> Fraction:
+    """Chance that one flip, roll, blitz roll or blind guess wins (picking well)."""
+    if games.get(game).kind == "guess":
+        if max_number < 1:
+            raise ValueError(f"max_number must be positive, got {max_number!r}")
+        return Fraction(1, max_number)
+    return games.table(game).p
+
+
+@lru_cache(maxsize=None)
+def _bisect_depths(size: int) -> Tuple[int, ...]:
+    """How many of ``size`` candidates a halving player finds on each try."""
+    if size <= 0:
+        return ()
+    left, right = _bisect_depths((size - 1) // 2), _bisect_depths(size // 2)
+    deeper = [0] * max(len(left), len(right))
+    for depths in (left, right):
+        for i, count in enumerate(depths):
+            deeper[i] += count
+    return (1, *deeper)
+
+
+@lru_cache(maxsize=None)
+def guess_attempts(max_number: int, strategy: str = "bisect") -> Distribution:
+    """Guesses needed to find a uniform secret in ``1..max_number``.
+
+    ``bisect`` always guesses the middle of the range the hints leave;
+    ``random`` guesses blindly each time, ignoring hints and past guesses.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+    if strategy == "random":
+        return Geometric(win_chance("guess", max_number))
+    return Finite((Fraction(0),) + tuple(Fraction(count, max_number) for count in _bisect_depths(max_number)))
+
+
+@lru_cache(maxsize=None)
+def attempts(game: str, level: int = 3, strategy: str = "bisect") -> Distribution:
+    """Attempts to win one round of an ``until_win`` game, or ``guess`` at ``level``."""
+    spec = games.get(game)
+    if spec.kind == "until_win":
+        return Geometric(win_chance(game))
+    if spec.kind == "guess":
+        return guess_attempts(len(games.table(game, level)), strategy)
+    raise ValueError(f"{game!r} isn't played until a win")
+
+
+@lru_cache(maxsize=None)
+def blitz_hits(rolls: int, target: int = 3) -> Finite:
+    """Hits on ``target`` out of ``rolls`` Time Attack dice."""
+    if rolls < 1:
+        raise ValueError(f"rolls must be positive, got {rolls!r}")
+    table = games.table("blitz")
+    p = table.chances[table.index(target)]
+    return Finite(tuple(comb(rolls, k) * p**k * (1 - p) ** (rolls - k) for k in range(rolls + 1)))
+
+
+@lru_cache(maxsize=None)
+def distribution(game: str, level: int = 3, strategy: str = "bisect", rolls: int = 12) -> Distribution:
+    """What the simulator histograms: attempts per round, or hits per blitz."""
+    if games.get(game).kind == "blitz":
+        return blitz_hits(rolls)
+    return attempts(game, level, strategy)
+
+
+def reach_streak(p, current: int, goal: int) -> Fraction:
+    """Chance that a streak of ``current`` reaches ``goal`` before a miss."""
+    return Fraction(p) ** max(0, goal - current)
+
+
+@lru_cache(maxsize=None)
+def _no_run(p: Fraction, length: int, attempts: int) -> Fraction:
+    """Chance of no ``length`` wins in a row within ``attempts`` attempts."""
+    if length <= 0:
+        return Fraction(0)
+    if attempts < length:
+        return Fraction(1)
+    # a[n] = a[n-1] - q p^L a[n-L-1]: the first run of L wins ends at n.
+    q, run = 1 - p, p**length
+    a = [Fraction(1)] * length + [1 - run]
+    for n in range(length + 1, attempts + 1):
+        a.append(a[n - 1] - q * run * a[n - length - 1])
+    return a[attempts]
+
+
+def streak_at_least(p, length: int, attempts: int) -> Fraction:
+    """Chance of at least ``length`` wins in a row within ``attempts`` attempts."""
+    return 1 - _no_run(Fraction(p), length, attempts)
+
+
+@lru_cache(maxsize=None)
+def longest_streak(p, attempts: int) -> Finite:
+    """Distribution of the longest run of wins in ``attempts`` attempts."""
+    if not 0 <= attempts <= MAX_STREAK_ATTEMPTS:
+        raise ValueError(f"attempts must be in 0..{MAX_STREAK_ATTEMPTS}, got {attempts!r}")
+    p = Fraction(p)
+    below = [_no_run(p, length, attempts) for length in range(attempts + 2)]
+    return Finite(tuple(below[k + 1] - below[k] for k in range(attempts + 1)))
+
+
+@lru_cache(maxsize=None)
+def streak_length(game: str, level: int = 3, strategy: str = "bisect") -> Geometric:
+    """Length of a win streak over rounds of a play-until-you-win game.
+
+    A round that needed more than one attempt resets the streak before its
+    win starts a new one, so each streak is one reset round followed by a
+    geometric number of first-try rounds.
+    """
+    return Geometric(1 - attempts(game, level, strategy).pmf(1))
@@ -0,0 +1,204 @@
+"""
+Buffered random source for the interactive games.
+
+``BufferedRandom`` reduces random words to a range a block at a time and
+hands the results out one by one, so a draw in the UI or CLI is a dict
+lookup and a ``next`` rather than a trip through ``random.randint``'s
+argument checks and bit twiddling. Each range (2 sides, 6 faces, 1-500...)
+keeps its own small block.
+
+Ranges are reduced without modulo bias using Lemire's multiply-and-reject
+method: a 32-bit word ``w`` maps to ``(w * n) >> 32`` and the few words
+whose low half falls under ``2**32 % n`` are dropped. That matters for
+ranges like 1-500 that don't divide ``2**32``. With NumPy the reduction is
+vectorized; without it the same method runs in Python, and seeded streams
+differ between the two. NumPy is only imported by the first stream that
+needs it, so importing the engine (and the CLI) stays cheap;
+``numpy_or_none`` is that lazy import, for other modules with the same
+optional NumPy path.
+
+It implements the subset of the ``random`` module API the engine uses
+(``randint``, ``randrange``, ``choice``, ``random``, ``getrandbits``), and the
+engine still accepts the ``random`` module itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+WORD_BITS = 32
+WORD_MASK = (1 << WORD_BITS) - 1
+DEFAULT_BLOCK = 256
+# Per-range blocks kept before the cache is dropped (choice over odd lengths).
+MAX_RANGES = 64
+SECURE_ENV = "secure"
+
+
+def derive_seed(master, *parts) -> int:
+    """Derive an independent 64-bit seed from ``master`` and labels."""
+    text = "\x1f".join(str(part) for part in (master,) + parts)
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+@lru_cache(maxsize=None)
+def numpy_or_none():
+    """The ``numpy`` module, imported on first use, or None if it's missing."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - exercised only without numpy
+        return None
+    return numpy
+
+
+def _word_array(data: bytes) -> array:
+    for code in ("I", "L"):
+        if array(code).itemsize == 4:
+            return array(code, data)
+    raise RuntimeError("no 4-byte unsigned array type on this platform")
+
+
+def _reduce(data: bytes, n: int) -> List[int]:
+    """Map 32-bit words in ``data`` to ``[0, n)`` without bias."""
+    threshold = (1 << WORD_BITS) % n
+    np = numpy_or_none()
+    if np is not None:
+        product = np.frombuffer(data, dtype="<u4").astype(np.uint64) * np.uint64(n)
+        if threshold:
+            product = product[(product & np.uint64(WORD_MASK)) >= threshold]
+        return (product >> np.uint64(WORD_BITS)).tolist()
+    values = []
+    for word in _word_array(data):
+        product = word * n
+        if product & WORD_MASK >= threshold:
+            values.append(product >> WORD_BITS)
+    return values
+
+
+class RandomMethods(ABC):
+    """``random``-style helpers built on a subclass's ``randbelow(n)``."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def randbelow(self, n: int) -> int:
+        """Uniform integer in ``[0, n)``."""
+
+    def randrange(self, start: int, stop: Optional[int] = None) -> int:
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError(f"empty range for randrange({start}, {stop})")
+        return start + self.randbelow(stop - start)
+
+    def randint(self, a: int, b: int) -> int:
+        return a + self.randbelow(b - a + 1)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        if not seq:
+            raise IndexError("cannot choose from an empty sequence")
+        return seq[self.randbelow(len(seq))]
+
+    def getrandbits(self, k: int) -> int:
+        value = 0
+        for _ in range(0, k, WORD_BITS):
+            value = (value << WORD_BITS) | self.randbelow(1 << WORD_BITS)
+        extra = -k % WORD_BITS
+        return value >> extra
+
+    def random(self) -> float:
+        """Float in ``[0, 1)`` with 53 random bits."""
+        return self.getrandbits(53) / 9007199254740992.0
+
+
+class BufferedRandom(RandomMethods):
+    """Random source that draws in blocks and hands values out in O(1).
+
+    ``seed=None`` picks a fresh 64-bit seed from the OS, which is kept in
+    ``self.seed`` so the stream can be replayed. ``secure=True`` reads words
+    from ``os.urandom`` instead; such a stream has no seed and can't be
+    replayed. Instances are not thread-safe; give each thread or session
+    its own.
+    """
+
+    __slots__ = ("seed", "secure", "block", "_bytes", "_blocks")
+
+    def __init__(self, seed: Optional[int] = None, secure: bool = False, block: int = DEFAULT_BLOCK) -> None:
+        if block < 1:
+            raise ValueError(f"block must be positive, got {block!r}")
+        self.secure = secure
+        self.block = block
+        if secure:
+            self.seed = None
+            self._bytes = os.urandom
+        else:
+            self.seed = int.from_bytes(os.urandom(8), "little") if seed is None else seed
+            np = numpy_or_none()
+            if np is not None:
+                self._bytes = np.random.Generator(np.random.PCG64(self.seed)).bytes
+            else:
+                self._bytes = random.Random(self.seed).randbytes
+        self._blocks: Dict[int, Iterator[int]] = {}
+
+    def randbelow(self, n: int) -> int:
+        """Uniform integer in ``[0, n)`` for ``1 <= n <= 2**32``."""
+        values = self._blocks.get(n)
+        if values is not None:
+            value = next(values, None)
+            if value is not None:
+                return value
+        return self._refill(n)
+
+    def _refill(self, n: int) -> int:
+        if not 0 < n <= 1 << WORD_BITS:
+            raise ValueError(f"n must be in 1..2**32, got {n!r}")
+        values: List[int] = []
+        while not values:
+            values = _reduce(self._bytes(4 * self.block), n)
+        if len(self._blocks) >= MAX_RANGES and n not in self._blocks:
+            self._blocks.clear()
+        block = self._blocks[n] = iter(values)
+        return next(block)
+
+
+def for_player(player_id: str, master_seed=None, secure: bool = False) -> BufferedRandom:
+    """Random stream for one player.
+
+    With a ``master_seed`` the stream is a pure function of it and the
+    player id, so a player's rounds can be replayed; otherwise each call
+    starts from fresh entropy. ``secure`` overrides both for audit runs.
+    """
+    if secure:
+        return BufferedRandom(secure=True)
+    if master_seed is None:
+        return BufferedRandom()
+    return BufferedRandom(derive_seed(master_seed, player_id))
+
+
+def from_env(player_id: str) -> BufferedRandom:
+    """Stream configured by ``LUCK_ARCADE_RNG=secure`` and ``LUCK_ARCADE_SEED``."""
+    return for_player(
+        player_id,
+        master_seed=os.environ.get("LUCK_ARCADE_SEED"),
+        secure=os.environ.get("LUCK_ARCADE_RNG") == SECURE_ENV,
+    )
+
+
+_local = threading.local()
+
+
+def default_rng() -> BufferedRandom:
+    """This thread's shared, unseeded stream."""
+    rng = getattr(_local, "rng", None)
+    if rng is None:
+        rng = _local.rng = BufferedRandom()
+    return rng
@@ -0,0 +1,305 @@
+"""
+Compact per-session game state, with idle sessions spilled to disk.
+
+Each app session keeps its game state in one slotted ``PlayerState``
+instead of a score of loose ``st.session_state`` keys: the player's ids,
+the round state saved with their stats, the stats themselves, the trend
+history and their random stream.
+
+The random stream's buffered blocks make up most of that memory. A session
+that hasn't run for ``idle_seconds`` gets its bulky fields pickled to one
+file in the spool directory, and what stays in memory is a stub of a few
+hundred bytes. The next script run for that session reads the file back
+(``touch``), so eviction is invisible to the player apart from one small
+read. Streams are pickled with their position, so seeded replays survive
+an eviction. A spilled session's file is deleted when it's read back or
+when Streamlit drops the session.
+
+``Sessions`` tracks every live state through weak references, so it
+never keeps a closed session alive. It runs the sweeper thread and reports
+the session count and bytes per session for the debug page.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gc
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import types
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from luck_arcade import daily, eventlog, rng
+from luck_arcade.history import Trend
+from luck_arcade.stats import PlayerStats
+
+
+DEFAULT_IDLE_SECONDS = 300.0
+DEFAULT_SWEEP_SECONDS = 30.0
+# Round state saved with the player's stats (and restored on reconnect).
+SAVED = ("random_target", "random_level", "daily_target", "daily_attempts", "daily_completed", "daily_key", "nickname")
+# What an idle session writes to disk; everything else stays in memory.
+SPILLED = SAVED + ("theme_choice", "animations", "stats", "trend", "completions", "stream", "plugin_rounds")
+
+
+class PlayerState:
+    """Everything one app session knows about its player."""
+
+    __slots__ = SPILLED + (
+        "player_id",
+        "player_key",
+        "fair",
+        "stats_dirty",
+        "trend_sent",
+        "room",
+        "room_feed",
+        "room_last",
+        "tournament",
+        "tournament_feed",
+        "tournament_last",
+        "last_seen",
+        "spilled",
+        "_cleanup",
+        "lock",
+        "__weakref__",
+    )
+
+    def __init__(self, player_id: str, theme_choice: str, animations: str) -> None:
+        self.player_id = player_id
+        self.player_key = eventlog.player_key(player_id)
+        self.random_target = None
+        self.random_level = None
+        self.daily_target = None
+        self.daily_attempts = 0
+        self.daily_completed = False
+        self.daily_key = None
+        self.nickname = f"Player {player_id[:6]}"
+        self.theme_choice = theme_choice
+        self.animations = animations
+        self.stats = PlayerStats()
+        self.trend = Trend()
+        self.completions = daily.Completions()
+        # The session's own stream; ``fair`` replaces it while provably-fair mode is on.
+        self.stream = rng.from_env(player_id)
+        self.fair = None
+        self.plugin_rounds: Dict[str, int] = {}
+        self.stats_dirty = False
+        self.trend_sent = -1
+        self.room = None
+        self.room_feed = None
+        self.room_last = None
+        self.tournament = None
+        self.tournament_feed = None
+        self.tournament_last = None
+        self.last_seen = time.monotonic()
+        self.spilled: Optional[str] = None
+        self._cleanup = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, player_id: str, saved: dict, theme_choice: str, animations: str) -> "PlayerState":
+        """A session for ``player_id`` picking up from what the stats backend saved."""
+        state = cls(player_id, theme_choice, animations)
+        state.stats = PlayerStats.from_dict(saved)
+        state.trend = Trend.from_dict(saved.get("trend"))
+        state.completions = daily.Completions.from_str(saved.get("daily_bitmap", ""))
+        if saved.get("daily_completed") and saved.get("daily_key"):
+            # Stats saved before the bitmap only knew about the last day played.
+            state.completions.mark(datetime.date.fromisoformat(saved["daily_key"]))
+        for key in SAVED:
+            if saved.get(key) is not None:
+                setattr(state, key, saved[key])
+        return state
+
+    @property
+    def rng(self):
+        """Whichever stream draws outcomes right now."""
+        return self.fair or self.stream
+
+    def snapshot(self) -> dict:
+        """What the stats backend stores for this player."""
+        snapshot = self.stats.to_dict()
+        snapshot.update((key, getattr(self, key)) for key in SAVED)
+        snapshot["daily_bitmap"] = self.completions.to_str()
+        snapshot["trend"] = self.trend.to_dict()
+        return snapshot
+
+    def touch(self) -> "PlayerState":
+        """Mark the session active, reading it back from disk if it was spilled."""
+        with self.lock:
+            self.last_seen = time.monotonic()
+            if self.spilled is not None:
+                self._restore()
+        return self
+
+    def idle_for(self, now: Optional[float] = None) -> float:
+        return (time.monotonic() if now is None else now) - self.last_seen
+
+    def spill(self, path: str, idle_seconds: float = 0.0) -> bool:
+        """Write the bulky fields to ``path`` and drop them, if idle long enough."""
+        with self.lock:
+            if self.spilled is not None or self.idle_for() < idle_seconds:
+                return False
+            data = pickle.dumps({name: getattr(self, name) for name in SPILLED}, pickle.HIGHEST_PROTOCOL)
+            with open(path, "wb") as handle:
+                handle.write(data)
+            for name in SPILLED:
+                setattr(self, name, None)
+            self.spilled = path
+            # Deletes the file if Streamlit drops the session before it's read back.
+            self._cleanup = weakref.finalize(self, _unlink, path)
+            return True
+
+    def _restore(self) -> None:
+        path, self.spilled = self.spilled, None
+        with open(path, "rb") as handle:
+            spilled = pickle.load(handle)
+        for name, value in spilled.items():
+            setattr(self, name, value)
+        self._cleanup()
+        self._cleanup = None
+
+    def nbytes(self) -> int:
+        """Memory held by this session's state.
+
+        The room and tournament feeds and the fair stream are left out:
+        they point into the hub's backlogs and the shared fair ledger.
+        """
+        return deep_size(self, shared=(self.room_feed, self.tournament_feed, self.tournament_last, self.fair))
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def deep_size(obj, shared=()) -> int:
+    """Bytes in ``obj`` and everything it references that isn't shared code.
+
+    Modules, classes and functions are skipped, and a bound method counts
+    only its instance. Objects in ``shared`` aren't counted or followed.
+    """
+    seen = {id(item) for item in shared if item is not None}
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, (type, types.ModuleType)):
+            continue
+        seen.add(id(item))
+        if isinstance(item, (types.MethodType, types.BuiltinMethodType)):
+            stack.append(item.__self__)
+            continue
+        if callable(item):
+            continue
+        total += sys.getsizeof(item)
+        stack.extend(gc.get_referents(item))
+    return total
+
+
+@dataclass
+class SessionReport:
+    """What the debug page shows."""
+
+    sessions: int
+    active: int
+    spilled: int
+    total_bytes: int
+    active_bytes: List[int]
+    spilled_bytes: List[int]
+    spool_bytes: int
+
+    @property
+    def bytes_per_session(self) -> float:
+        return self.total_bytes / self.sessions if self.sessions else 0.0
+
+    @staticmethod
+    def mean(sizes: List[int]) -> float:
+        return sum(sizes) / len(sizes) if sizes else 0.0
+
+
+class Sessions:
+    """Every live ``PlayerState`` in the process, and the sweeper that spills idle ones."""
+
+    def __init__(
+        self,
+        spool: Optional[str] = None,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        sweep_seconds: Optional[float] = DEFAULT_SWEEP_SECONDS,
+    ) -> None:
+        self.spool = Path(spool or tempfile.mkdtemp(prefix="luck-arcade-sessions-"))
+        self.spool.mkdir(parents=True, exist_ok=True)
+        self.idle_seconds = idle_seconds
+        self._live: "weakref.WeakValueDictionary[int, PlayerState]" = weakref.WeakValueDictionary()
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        if sweep_seconds:
+            threading.Thread(target=self._loop, args=(sweep_seconds,), name="luck-arcade-sessions", daemon=True).start()
+
+    def add(self, state: PlayerState) -> PlayerState:
+        with self._lock:
+            self._count += 1
+            self._live[self._count] = state
+        return state
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def states(self) -> List[PlayerState]:
+        with self._lock:
+            return list(self._live.values())
+
+    def sweep(self, idle_seconds: Optional[float] = None) -> int:
+        """Spill every session idle for ``idle_seconds``; returns how many were spilled."""
+        idle_seconds = self.idle_seconds if idle_seconds is None else idle_seconds
+        spilled = 0
+        with self._lock:
+            items = list(self._live.items())
+        for number, state in items:
+            if state.spilled is None and state.idle_for() >= idle_seconds:
+                spilled += state.spill(str(self.spool / f"{state.player_key:016x}-{number}.pickle"), idle_seconds)
+        return spilled
+
+    def counts(self) -> Dict[str, int]:
+        """Sessions by state, without measuring them."""
+        states = self.states()
+        spilled = sum(state.spilled is not None for state in states)
+        return {"active": len(states) - spilled, "spilled": spilled}
+
+    def report(self) -> SessionReport:
+        active, spilled, spool_bytes = [], [], 0
+        for state in self.states():
+            if state.spilled is None:
+                active.append(state.nbytes())
+            else:
+                spilled.append(state.nbytes())
+                try:
+                    spool_bytes += os.path.getsize(state.spilled)
+                except (TypeError, FileNotFoundError):
+                    pass  # read back while we looked
+        return SessionReport(
+            sessions=len(active) + len(spilled),
+            active=len(active),
+            spilled=len(spilled),
+            total_bytes=sum(active) + sum(spilled),
+            active_bytes=active,
+            spilled_bytes=spilled,
+            spool_bytes=spool_bytes,
+        )
+
+    def _loop(self, every: float) -> None:
+        while not self._stopped.wait(every):
+            self.sweep()
+
+    def stop(self) -> None:
+        self._stopped.set()
@@ -0,0 +1,462 @@
+"""
+Batch Monte Carlo simulation of the Luck Arcade games.
+
+Every round is actually played, attempt by attempt, but in large NumPy
+chunks instead of one ``random`` call per attempt, which is what makes
+10^8-round runs practical:
+
+- coin / dice / any other ``until_win`` game in ``luck_arcade.games``: one
+  long stream of outcome indices is drawn and checked against the pick
+  through the game's compiled table; each round runs up to and including
+  the next winning draw.
+- guess: the secret is drawn from the level's compiled table and the
+  player guesses from the range the level announces, either halving on
+  the hints (all rounds step through the search together) or blindly.
+- blitz: ``rolls`` outcomes per run, each checked against the pick.
+
+Picks are drawn per chunk among the picks with the best chance, which
+``luck_arcade.odds`` assumes; in fair games that's every pick.
+
+Each chunk is reduced to a ``Summary`` (histogram plus streak state) and
+summaries are merged in order, so a run never holds more than one chunk of
+rounds in memory. NumPy is only needed for simulation, not for playing.
+
+Reports put the simulated mean next to the exact one from
+``luck_arcade.odds`` and say how many standard errors apart they are.
+Since the simulation plays the rules and ``odds`` derives from them, a
+large gap means one side has the rules wrong.
+
+Large runs are split into fixed-size blocks, each with its own child of the
+master ``SeedSequence``. Blocks are farmed out to a process pool and their
+summaries merged in block order, so a given seed produces identical results
+whatever the worker count.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from luck_arcade import engine, games, odds
+from luck_arcade.odds import STRATEGIES
+
+
+DEFAULT_CHUNK = 1 << 20
+BLOCK_SIZE = 1 << 22
+# Most outcomes drawn at once while playing a chunk.
+MAX_DRAWS = 1 << 23
+# Standard errors between the simulated and exact mean before the report calls
+# it a disagreement; a correct game passes this in all but ~1 in 15,000 runs.
+DRIFT_WARNING = 4.0
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Simulation needs NumPy. Install it with: pip install numpy")
+
+
+def _outcome_dtype(n: int):
+    return np.uint8 if n <= 1 << 8 else np.uint16 if n <= 1 << 16 else np.int64
+
+
+@lru_cache(maxsize=None)
+def _win_rows(game: str) -> Tuple["np.ndarray", int]:
+    """Win flags over every outcome, one row per best pick, and the outcome count."""
+    table = games.table(game)
+    if not table.p:
+        raise ValueError(f"{game!r} can't be won, so it can't be simulated")
+    n = len(table.outcomes)
+    best = [i for i, chance in enumerate(table.chances) if chance == table.p]
+    rows = np.array([[table.won(pick, outcome) for outcome in range(n)] for pick in best], dtype=bool)
+    rows.flags.writeable = False
+    return rows, n
+
+
+def _won(wins, outcomes):
+    """Whether each outcome index wins, for one pick's row of win flags."""
+    winners = np.flatnonzero(wins)
+    if len(winners) == 1:
+        return outcomes == winners[0]
+    return wins[outcomes]
+
+
+def play_until_win(rng, game: str, rounds: int):
+    """Attempts each of ``rounds`` rounds of an ``until_win`` game took."""
+    rows, n = _win_rows(game)
+    wins = rows[rng.integers(len(rows))]
+    p = float(wins.mean())
+    dtype = _outcome_dtype(n)
+    ends = []
+    found = drawn = 0
+    while found < rounds:
+        missing = rounds - found
+        size = min(int((missing + 6 * math.sqrt(missing)) / p) + 64, MAX_DRAWS)
+        hits = np.flatnonzero(_won(wins, rng.integers(0, n, size=size, dtype=dtype)))[:missing]
+        ends.append(hits + drawn)
+        found += len(hits)
+        drawn += size
+    # A round ends on its winning draw; the draws after the last win are unused.
+    return np.diff(np.concatenate(ends), prepend=-1)
+
+
+def play_blitz(rng, rolls: int, rounds: int):
+    """Hits in each of ``rounds`` Time Attack runs of ``rolls`` rolls."""
+    rows, n = _win_rows("blitz")
+    wins = rows[rng.integers(len(rows))]
+    dtype = _outcome_dtype(n)
+    counts = np.uint8 if rolls < 1 << 8 else np.int64
+    hits = np.empty(rounds, dtype=np.int64)
+    step = max(1, MAX_DRAWS // rolls)
+    for first in range(0, rounds, step):
+        size = min(step, rounds - first)
+        # Roll-major, so adding up each run's hits runs along contiguous rows.
+        won = _won(wins, rng.integers(0, n, size=(rolls, size), dtype=dtype))
+        hits[first : first + size] = np.add.reduce(won.view(np.uint8), axis=0, dtype=counts)
+    return hits
+
+
+def _secrets(rng, level: int, rounds: int):
+    outcomes = np.asarray(games.table("guess", level).outcomes, dtype=np.int64)
+    return outcomes[rng.integers(0, len(outcomes), size=rounds)]
+
+
+def play_bisect(rng, level: int, rounds: int):
+    """Guesses a halving player needs in each of ``rounds`` rounds at ``level``.
+
+    Every round guesses the middle of what the hints leave of ``1..max``,
+    so all rounds take their ``depth``-th guess together. Once a round hits,
+    the range left no longer holds its secret, so it never hits again.
+    """
+    max_number = engine.LEVELS[level][1]
+    secret = _secrets(rng, level, rounds).astype(np.int32)
+    attempts = np.zeros(rounds, dtype=np.int64)
+    lo = np.ones(rounds, dtype=np.int32)
+    hi = np.full(rounds, max_number, dtype=np.int32)
+    # Scratch arrays reused at every depth; fresh ones cost more than the arithmetic.
+    guess, low, bound = np.empty_like(lo), np.empty_like(lo), np.empty_like(lo)
+    found = np.empty(rounds, dtype=bool)
+    for depth in range(1, max_number.bit_length() + 1):
+        np.add(lo, hi, out=guess)
+        guess >>= 1
+        np.equal(guess, secret, out=found)
+        np.putmask(attempts, found, depth)
+        # -1 where the guess is too low, else 0. "Too low" moves lo past the
+        # guess, anything else moves hi below it. Branch-free int32 masks run
+        # several times faster than np.where or bool arithmetic here.
+        np.subtract(guess, secret, out=low)
+        low >>= 31
+        np.add(guess, 1, out=bound)
+        bound &= low
+        np.maximum(lo, bound, out=lo)
+        np.subtract(guess, 1, out=bound)
+        low &= np.int32(0x7FFFFFFF)
+        bound |= low
+        np.minimum(hi, bound, out=hi)
+    if not attempts.all():
+        raise RuntimeError(f"level {level}: a secret number is outside the range the player is given")
+    return attempts
+
+
+def play_blind(rng, level: int, rounds: int):
+    """Guesses a player guessing blindly in ``1..max`` needs in each round."""
+    max_number = engine.LEVELS[level][1]
+    secret = _secrets(rng, level, rounds)
+    attempts = np.zeros(rounds, dtype=np.int64)
+    live = np.arange(rounds)
+    taken = 0
+    while len(live):
+        # Several guesses per live round per pass, as many as fit in MAX_DRAWS.
+        width = max(1, min(max_number, MAX_DRAWS // len(live)))
+        guesses = rng.integers(1, max_number + 1, size=(len(live), width), dtype=_outcome_dtype(max_number + 1))
+        hit = guesses == secret[:, None]
+        done = hit.any(axis=1)
+        attempts[live[done]] = taken + hit[done].argmax(axis=1) + 1
+        taken += width
+        live, secret = live[~done], secret[~done]
+    return attempts
+
+
+def _add_counts(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    out = a.copy()
+    out[: len(b)] += b
+    return out
+
+
+@dataclass
+class Summary:
+    """Mergeable result of simulating a contiguous block of rounds.
+
+    ``histogram[k]`` counts rounds that took ``k`` attempts (``k`` hits for
+    blitz). Streaks follow the app: every win extends the streak and every
+    miss resets it. Runs that touch the block edges are kept open in
+    ``head``/``tail`` so neighbouring blocks can be stitched exactly.
+    """
+
+    game: str
+    rounds: int = 0
+    histogram: "np.ndarray" = None
+    streak_head: int = 0
+    streak_tail: int = 0
+    unbroken: bool = True
+    streak_histogram: "np.ndarray" = None
+
+    def __post_init__(self) -> None:
+        if self.histogram is None:
+            self.histogram = np.zeros(1, dtype=np.int64)
+        if self.streak_histogram is None:
+            self.streak_histogram = np.zeros(1, dtype=np.int64)
+
+    def merge(self, later: "Summary") -> "Summary":
+        """Combine with the block that directly follows this one."""
+        streaks = _add_counts(self.streak_histogram, later.streak_histogram)
+        if self.unbroken:
+            head = self.streak_head + later.streak_head
+            tail = later.streak_tail
+        elif later.unbroken:
+            head = self.streak_head
+            tail = self.streak_tail + later.streak_head
+        else:
+            head = self.streak_head
+            tail = later.streak_tail
+            joined = self.streak_tail + later.streak_head
+            if joined:
+                streaks = _add_counts(streaks, np.bincount([joined]))
+        return Summary(
+            game=self.game,
+            rounds=self.rounds + later.rounds,
+            histogram=_add_counts(self.histogram, later.histogram),
+            streak_head=head,
+            streak_tail=tail,
+            unbroken=self.unbroken and later.unbroken,
+            streak_histogram=streaks,
+        )
+
+    def streaks(self):
+        """Histogram of every streak length, including the open edge runs."""
+        edges = [self.streak_head] if self.unbroken else [self.streak_head, self.streak_tail]
+        edges = [n for n in edges if n]
+        if not edges:
+            return self.streak_histogram
+        return _add_counts(self.streak_histogram, np.bincount(edges))
+
+
+def _summarize(game: str, values, reset, hit=None) -> Summary:
+    """Reduce one chunk given per-round reset flags and wins.
+
+    Within a round the reset (a miss) happens before the win, so a round
+    that resets still starts the next streak with its own win. ``hit=None``
+    means every round ends in a win, as in the play-until-you-hit games.
+    """
+    n = len(values)
+    resets = np.flatnonzero(reset)
+    if hit is None:
+        wins, at_reset = n, resets
+    else:
+        cum = np.empty(n + 1, dtype=np.int64)
+        cum[0] = 0
+        np.cumsum(hit, out=cum[1:])
+        wins, at_reset = int(cum[-1]), cum[resets]
+    if len(resets) == 0:
+        head, tail, unbroken = wins, 0, True
+        streaks = np.zeros(1, dtype=np.int64)
+    else:
+        head = int(at_reset[0])
+        tail = int(wins - at_reset[-1])
+        unbroken = False
+        runs = np.diff(at_reset)
+        streaks = np.bincount(runs[runs > 0]) if len(runs) else np.zeros(1, dtype=np.int64)
+    return Summary(
+        game=game,
+        rounds=n,
+        histogram=np.bincount(values),
+        streak_head=head,
+        streak_tail=tail,
+        unbroken=unbroken,
+        streak_histogram=streaks if len(streaks) else np.zeros(1, dtype=np.int64),
+    )
+
+
+@dataclass(frozen=True)
+class Config:
+    """Which game to simulate and with what parameters."""
+
+    game: str
+    level: int = 3
+    strategy: str = "bisect"
+    rolls: int = 12
+
+    def __post_init__(self) -> None:
+        games.get(self.game)
+        if self.level not in engine.LEVELS:
+            raise ValueError(f"level must be one of {sorted(engine.LEVELS)}, got {self.level!r}")
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {self.strategy!r}")
+        if self.rolls < 1:
+            raise ValueError(f"rolls must be positive, got {self.rolls!r}")
+
+    @property
+    def kind(self) -> str:
+        return games.get(self.game).kind
+
+    @property
+    def max_number(self) -> int:
+        return engine.LEVELS[self.level][1]
+
+    def exact(self) -> "odds.Distribution":
+        """The exact distribution this config's histogram should converge to."""
+        return odds.distribution(self.game, self.level, self.strategy, self.rolls)
+
+
+def simulate_chunk(config: Config, rounds: int, rng) -> Summary:
+    """Play ``rounds`` rounds of ``config.game`` in one vectorized batch."""
+    kind = config.kind
+    if kind == "until_win":
+        values = play_until_win(rng, config.game, rounds)
+    elif kind == "guess" and config.strategy == "random":
+        values = play_blind(rng, config.level, rounds)
+    elif kind == "guess":
+        values = play_bisect(rng, config.level, rounds)
+    else:
+        values = play_blitz(rng, config.rolls, rounds)
+        return _summarize(config.game, values, values == 0, hit=values > 0)
+    return _summarize(config.game, values, values > 1)
+
+
+def simulate_block(config: Config, seed, rounds: int, chunk_size: int = DEFAULT_CHUNK) -> Summary:
+    """Play one block of rounds from its own seed stream."""
+    rng = np.random.default_rng(seed)
+    total: Optional[Summary] = None
+    remaining = rounds
+    while remaining:
+        size = min(chunk_size, remaining)
+        part = simulate_chunk(config, size, rng)
+        total = part if total is None else total.merge(part)
+        remaining -= size
+    return total
+
+
+def _run_block(job) -> Summary:
+    return simulate_block(*job)
+
+
+@dataclass
+class SimulationResult:
+    config: Config
+    summary: Summary
+    seconds: float
+    seed: int
+    workers: int = 1
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.summary.rounds / self.seconds if self.seconds else float("inf")
+
+
+def simulate(
+    config: Config,
+    rounds: int,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    block_size: int = BLOCK_SIZE,
+) -> SimulationResult:
+    """Simulate ``rounds`` rounds across ``workers`` processes.
+
+    Results depend only on ``seed`` and ``block_size``; pass the returned
+    ``result.seed`` back in to reproduce an unseeded run.
+    """
+    _require_numpy()
+    if rounds < 1:
+        raise ValueError(f"rounds must be positive, got {rounds!r}")
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers!r}")
+    master = np.random.SeedSequence(seed)
+    sizes = [block_size] * (rounds // block_size)
+    if rounds % block_size:
+        sizes.append(rounds % block_size)
+    jobs = [(config, child, size) for child, size in zip(master.spawn(len(sizes)), sizes)]
+    workers = min(workers, len(jobs))
+
+    started = time.perf_counter()
+    total: Optional[Summary] = None
+    if workers == 1:
+        parts = map(_run_block, jobs)
+        for part in parts:
+            total = part if total is None else total.merge(part)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, which the streak merge needs.
+            for part in pool.map(_run_block, jobs):
+                total = part if total is None else total.merge(part)
+    return SimulationResult(config, total, time.perf_counter() - started, master.entropy, workers)
+
+
+def _percentile(histogram, fraction: float) -> int:
+    cumulative = np.cumsum(histogram)
+    return int(np.searchsorted(cumulative, fraction * cumulative[-1]))
+
+
+def format_report(result: SimulationResult, top: int = 12) -> str:
+    """Render a plain-text report of a simulation run."""
+    config, summary = result.config, result.summary
+    hist = summary.histogram
+    values = np.arange(len(hist))
+    mean = float((values * hist).sum() / summary.rounds)
+    label = "Hits per blitz" if config.kind == "blitz" else "Attempts to win"
+
+    title = config.game
+    if config.kind == "guess":
+        level, max_number = engine.LEVELS[config.level]
+        title += f" · {level} (1-{max_number}) · {config.strategy}"
+    elif config.kind == "blitz":
+        title += f" · {config.rolls} rolls"
+
+    lines: List[str] = [
+        f"Simulated {summary.rounds:,} rounds of {title} in {result.seconds:.2f}s "
+        f"({result.rounds_per_second / 1e6:.1f}M rounds/s on {result.workers} worker(s))",
+        f"Seed: {result.seed}",
+        "",
+        f"{label}: mean {mean:.3f} · median {_percentile(hist, 0.5)} · "
+        f"p95 {_percentile(hist, 0.95)} · p99 {_percentile(hist, 0.99)} · max {len(hist) - 1}",
+    ]
+    exact = config.exact()
+    error = math.sqrt(exact.variance / summary.rounds)
+    drift = (mean - float(exact.mean)) / error if error else 0.0
+    shown_drift = f"{drift:+.2f}" if error else "—"
+    lines.append(f"Exact: mean {float(exact.mean):.3f} · std {exact.std:.3f} · simulated mean is {shown_drift} std errors off")
+    if abs(drift) > DRIFT_WARNING:
+        lines.append("Warning: the played rounds disagree with odds.py; the game rules or its odds are wrong")
+    shown = [k for k in np.flatnonzero(hist)][:top]
+    for k in shown:
+        share = hist[k] / summary.rounds
+        lines.append(f"  {k:>5}: {hist[k]:>14,}  {share:8.4%}")
+    if len(np.flatnonzero(hist)) > top:
+        lines.append("  ...")
+
+    streaks = summary.streaks()
+    runs = int(streaks.sum())
+    lengths = np.arange(len(streaks))
+    lines.append("")
+    if runs:
+        lines.append(
+            f"Win streaks: {runs:,} · mean length {float((lengths * streaks).sum() / runs):.3f} · "
+            f"longest {len(streaks) - 1}"
+        )
+        if config.kind != "blitz":
+            exact_streak = odds.streak_length(config.game, config.level, config.strategy)
+            lines.append(f"Exact mean streak length: {float(exact_streak.mean):.3f}")
+        for k in np.flatnonzero(streaks)[:top]:
+            lines.append(f"  {k:>5}: {streaks[k]:>14,}")
+    else:
+        lines.append("Win streaks: none")
+    return "\n".join(lines)
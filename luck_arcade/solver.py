@@ -0,0 +1,253 @@
+"""
+Optimal guessing strategy for the number game, and bots that play it.
+
+``solve(size)`` builds the decision tree for guessing a number among
+``size`` candidates from "too low / too high" hints: guess the middle of
+the range the hints leave. Every level of that tree is full except the
+last, which makes it optimal both for the worst case
+(``ceil(log2(size + 1))`` guesses) and for the expected number of guesses
+against a uniform secret. ``odds.guess_attempts`` gives the exact
+distribution of the same tree.
+
+The tree is stored as three flat integer arrays in breadth-first order
+(guess offset, next node after "too low", next node after "too high"), so
+a move is one array lookup. Trees depend only on the range size, are
+cached, and serve any ``lo..hi`` range by adding ``lo``.
+
+``Bot`` plays through ``engine.check_guess``. ``run_bots`` plays many rounds
+in-process and ``stress`` plays them against a ``luck_arcade.console`` TCP
+server from many concurrent connections. Both report throughput and the
+attempts histogram, so difficulty can be checked against ``odds``.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional
+
+from luck_arcade import engine
+from luck_arcade.console import DEFAULT_HOST, DEFAULT_PORT
+
+
+NO_NODE = -1
+
+
+class GuessTree:
+    """Decision tree for guessing among ``size`` candidates, as flat arrays."""
+
+    __slots__ = ("size", "offset", "after_low", "after_high")
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError(f"size must be positive, got {size!r}")
+        self.size = size
+        self.offset = array("i")
+        self.after_low = array("i")
+        self.after_high = array("i")
+        queue = deque([(0, size - 1)])
+        assigned = 1
+        while queue:
+            lo, hi = queue.popleft()
+            mid = (lo + hi) // 2
+            self.offset.append(mid)
+            # Children are numbered in the order they're queued, which is
+            # the order they'll be popped: breadth-first.
+            for child, lo_, hi_ in ((self.after_low, mid + 1, hi), (self.after_high, lo, mid - 1)):
+                if lo_ <= hi_:
+                    child.append(assigned)
+                    assigned += 1
+                    queue.append((lo_, hi_))
+                else:
+                    child.append(NO_NODE)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def next(self, node: int, hint: str) -> int:
+        """Node to play after ``hint`` (``"low"`` or ``"high"``) at ``node``."""
+        following = self.after_low[node] if hint == "low" else self.after_high[node]
+        if following == NO_NODE:
+            raise ValueError("the hints so far rule out every number")
+        return following
+
+    def depth(self) -> int:
+        """Most guesses the tree ever needs."""
+        return self.size.bit_length()
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.offset, self.after_low, self.after_high))
+
+
+@lru_cache(maxsize=None)
+def solve(size: int) -> GuessTree:
+    """The optimal tree for ``size`` candidates, built once per size."""
+    return GuessTree(size)
+
+
+def precompute() -> List[GuessTree]:
+    """Build the trees for every difficulty level up front."""
+    return [solve(max_number) for _, max_number in engine.LEVELS.values()]
+
+
+class Bot:
+    """Plays ``lo..hi`` by following ``solve(hi - lo + 1)``."""
+
+    __slots__ = ("tree", "lo", "node")
+
+    def __init__(self, hi: int, lo: int = 1) -> None:
+        self.tree = solve(hi - lo + 1)
+        self.lo = lo
+        self.node = 0
+
+    def start(self) -> int:
+        """First guess of a round."""
+        self.node = 0
+        return self.lo + self.tree.offset[0]
+
+    def move(self, hint: str) -> int:
+        """Next guess after the hint for the previous one."""
+        self.node = self.tree.next(self.node, hint)
+        return self.lo + self.tree.offset[self.node]
+
+    def play(self, target: int) -> int:
+        """Play one round through the engine; returns the attempts taken."""
+        result = engine.check_guess(self.start(), target)
+        attempts = 1
+        while not result.won:
+            result = engine.check_guess(self.move(result.hint), target)
+            attempts += 1
+        return attempts
+
+
+@dataclass
+class BotReport:
+    """Rounds played by bots and what they cost."""
+
+    level: int
+    rounds: int = 0
+    moves: int = 0
+    seconds: float = 0.0
+    histogram: List[int] = field(default_factory=list)
+    clients: int = 1
+
+    def add(self, attempts: int) -> None:
+        if attempts >= len(self.histogram):
+            self.histogram.extend([0] * (attempts + 1 - len(self.histogram)))
+        self.histogram[attempts] += 1
+        self.rounds += 1
+        self.moves += attempts
+
+    def merge(self, other: "BotReport") -> None:
+        for attempts, count in enumerate(other.histogram):
+            if count:
+                if attempts >= len(self.histogram):
+                    self.histogram.extend([0] * (attempts + 1 - len(self.histogram)))
+                self.histogram[attempts] += count
+        self.rounds += other.rounds
+        self.moves += other.moves
+
+
+def run_bots(level: int, rounds: int, rng=None) -> BotReport:
+    """Play ``rounds`` rounds at ``level`` in-process, as fast as possible."""
+    max_number = engine.LEVELS[level][1]
+    bot = Bot(max_number)
+    report = BotReport(level)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        report.add(bot.play(engine.pick_target(max_number, rng)))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+async def _until_prompt(reader) -> str:
+    """Read server output up to the next prompt (they all end in ``": "``)."""
+    text = ""
+    while not text.endswith(": "):
+        chunk = await reader.read(4096)
+        if not chunk:
+            raise ConnectionError("server closed the connection")
+        text += chunk.decode("utf-8", "replace")
+    return text
+
+
+async def tcp_bot(level: int, rounds: int, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> BotReport:
+    """One connection playing ``rounds`` guessing rounds through the console menu."""
+    import asyncio
+
+    max_number = engine.LEVELS[level][1]
+    bot = Bot(max_number)
+    report = BotReport(level)
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def send(move) -> str:
+        writer.write(f"{move}\n".encode())
+        return await _until_prompt(reader)
+
+    try:
+        await _until_prompt(reader)
+        for _ in range(rounds):
+            await send("guess")
+            text = await send(level)
+            text = await send(bot.start())
+            attempts = 1
+            while "NAILED" not in text:
+                guess = bot.move("low" if "Too low" in text else "high")
+                await send("yes")
+                text = await send(guess)
+                attempts += 1
+            report.add(attempts)
+        writer.write(b"q\n")
+        await writer.drain()
+    finally:
+        writer.close()
+    return report
+
+
+def stress(
+    level: int,
+    rounds: int,
+    clients: int,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> BotReport:
+    """Play ``rounds`` rounds split across ``clients`` concurrent connections."""
+    import asyncio
+
+    if clients < 1:
+        raise ValueError(f"clients must be positive, got {clients!r}")
+    clients = min(clients, rounds) or 1
+    shares = [rounds // clients + (i < rounds % clients) for i in range(clients)]
+
+    async def main() -> List[BotReport]:
+        return await asyncio.gather(*(tcp_bot(level, share, host, port) for share in shares))
+
+    report = BotReport(level, clients=clients)
+    started = time.perf_counter()
+    for part in asyncio.run(main()):
+        report.merge(part)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def format_report(report: BotReport, where: Optional[str] = None) -> str:
+    from luck_arcade import odds
+
+    label, max_number = engine.LEVELS[report.level]
+    exact = odds.guess_attempts(max_number)
+    rate = report.rounds / report.seconds if report.seconds else float("inf")
+    mean = report.moves / report.rounds if report.rounds else 0.0
+    lines = [
+        f"Bots played {report.rounds:,} rounds of {label} (1-{max_number}) {where or 'in-process'} "
+        f"in {report.seconds:.2f}s ({rate:,.0f} rounds/s, {report.moves / report.seconds if report.seconds else 0:,.0f} "
+        f"moves/s, {report.clients} client(s))",
+        f"Attempts: mean {mean:.3f} (exact {float(exact.mean):.3f}) · max {len(report.histogram) - 1} "
+        f"(tree depth {solve(max_number).depth()})",
+    ]
+    for attempts, count in enumerate(report.histogram):
+        if count:
+            lines.append(f"  {attempts:>3}: {count:>12,}  {count / report.rounds:8.4%}  exact {float(exact.pmf(attempts)):8.4%}")
+    return "\n".join(lines)
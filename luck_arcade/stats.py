@@ -0,0 +1,194 @@
+"""
+Incremental player stats.
+
+``PlayerStats`` keeps every counter the app shows (per-game attempts, wins
+and round attempts, running totals, streaks, blitz records) and updates
+them in O(1) through ``record``. The attempts history lives in a fixed-size
+ring buffer, so neither recording nor reading the totals depends on how
+much history is kept.
+
+``to_dict``/``from_dict`` use the same flat key names the app has always
+stored (``coin_wins``, ``dice_attempts_total``, ...), so saved stats load
+unchanged.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, List, NamedTuple, Optional
+
+
+GAMES = ("coin", "dice", "random")
+# Time Attack rolls count toward the dice counters.
+GAME_INDEX = {"coin": 0, "dice": 1, "random": 2, "blitz": 1}
+# Counter names that differ from the game's ``luck_arcade.games`` key.
+SPEC_KEYS = {"random": "guess"}
+HISTORY_WINDOW = 30
+STREAK_MILESTONE = 3
+
+
+class Event(NamedTuple):
+    """One scored action: a flip, roll, guess or a whole blitz."""
+
+    game: str
+    attempts: int = 1
+    wins: int = 0
+    # False for attempts that don't belong to the game's running round (daily guesses).
+    in_round: bool = True
+
+    @property
+    def spec_key(self) -> str:
+        """The game's registry key, which metrics and the event log use."""
+        return SPEC_KEYS.get(self.game, self.game)
+
+
+class History:
+    """Fixed-capacity ring buffer of integers."""
+
+    __slots__ = ("capacity", "_items", "_start", "_size")
+
+    def __init__(self, capacity: int = HISTORY_WINDOW) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity!r}")
+        self.capacity = capacity
+        self._items = array("q", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def append(self, value: int) -> None:
+        end = self._start + self._size
+        if self._size < self.capacity:
+            self._items[end % self.capacity] = value
+            self._size += 1
+        else:
+            self._items[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        for i in range(self._size):
+            yield self._items[(self._start + i) % self.capacity]
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+
+class PlayerStats:
+    """All counters for one player, updated incrementally."""
+
+    __slots__ = (
+        "attempts",
+        "wins",
+        "round_attempts",
+        "total_attempts",
+        "total_wins",
+        "streak_current",
+        "streak_best",
+        "blitz_runs",
+        "blitz_best_hits",
+        "history",
+    )
+
+    def __init__(self, history_window: int = HISTORY_WINDOW) -> None:
+        self.attempts = array("q", bytes(8 * len(GAMES)))
+        self.wins = array("q", bytes(8 * len(GAMES)))
+        self.round_attempts = array("q", bytes(8 * len(GAMES)))
+        self.total_attempts = 0
+        self.total_wins = 0
+        self.streak_current = 0
+        self.streak_best = 0
+        self.blitz_runs = 0
+        self.blitz_best_hits = 0
+        self.history = History(history_window)
+
+    def record(self, event: Event) -> None:
+        """Apply one event. Any win extends the streak, a miss resets it.
+
+        Games without their own counters (plugins) count toward the totals
+        and the streak only.
+        """
+        index = GAME_INDEX.get(event.game)
+        if index is not None:
+            self.attempts[index] += event.attempts
+            self.wins[index] += event.wins
+        self.total_attempts += event.attempts
+        self.total_wins += event.wins
+        if event.game == "blitz":
+            self.blitz_runs += 1
+            self.blitz_best_hits = max(self.blitz_best_hits, event.wins)
+            self.round_attempts[index] = 0
+        elif event.in_round and index is not None:
+            self.round_attempts[index] += event.attempts
+        if event.wins:
+            self.streak_current += 1
+            self.streak_best = max(self.streak_best, self.streak_current)
+        else:
+            self.streak_current = 0
+        self.history.append(self.total_attempts)
+
+    def new_round(self, game: str) -> None:
+        self.round_attempts[GAME_INDEX[game]] = 0
+
+    def round_of(self, game: str) -> int:
+        return self.round_attempts[GAME_INDEX[game]]
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        return self.total_wins / self.total_attempts if self.total_attempts else None
+
+    @property
+    def at_milestone(self) -> bool:
+        return bool(self.streak_current) and self.streak_current % STREAK_MILESTONE == 0
+
+    def reset(self) -> None:
+        for counters in (self.attempts, self.wins, self.round_attempts):
+            for i in range(len(GAMES)):
+                counters[i] = 0
+        self.total_attempts = 0
+        self.total_wins = 0
+        self.streak_current = 0
+        self.streak_best = 0
+        self.blitz_runs = 0
+        self.blitz_best_hits = 0
+        self.history.clear()
+
+    def to_dict(self) -> dict:
+        data = {}
+        for index, game in enumerate(GAMES):
+            data[f"{game}_attempts_total"] = self.attempts[index]
+            data[f"{game}_wins"] = self.wins[index]
+            data[f"{game}_round_attempts"] = self.round_attempts[index]
+        data.update(
+            total_attempts=self.total_attempts,
+            total_wins=self.total_wins,
+            streak_current=self.streak_current,
+            streak_best=self.streak_best,
+            blitz_runs=self.blitz_runs,
+            blitz_best_hits=self.blitz_best_hits,
+            history_attempts=self.history.to_list(),
+        )
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, history_window: int = HISTORY_WINDOW) -> "PlayerStats":
+        stats = cls(history_window)
+        for index, game in enumerate(GAMES):
+            stats.attempts[index] = data.get(f"{game}_attempts_total", 0)
+            stats.wins[index] = data.get(f"{game}_wins", 0)
+            stats.round_attempts[index] = data.get(f"{game}_round_attempts", 0)
+        # Older saves have no totals; they had no plugin games either.
+        stats.total_attempts = data.get("total_attempts", sum(stats.attempts))
+        stats.total_wins = data.get("total_wins", sum(stats.wins))
+        stats.streak_current = data.get("streak_current", 0)
+        stats.streak_best = data.get("streak_best", 0)
+        stats.blitz_runs = data.get("blitz_runs", 0)
+        stats.blitz_best_hits = data.get("blitz_best_hits", 0)
+        for value in data.get("history_attempts", ()):
+            stats.history.append(value)
+        return stats
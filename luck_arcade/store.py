@@ -0,0 +1,177 @@
+"""
+Persistent player stats for Luck Arcade.
+
+A backend maps a player id to a plain dict of stats. ``save`` only updates
+an in-memory buffer (newest snapshot per player wins), so the click path
+never touches the disk; buffered snapshots are written in one transaction
+by ``flush``, which runs on a timer and at exit. A batch that fails to
+commit (locked or full disk) goes back in the buffer, behind any newer
+snapshots, and the timer retries with backoff.
+
+``open_backend("memory://")`` keeps everything in the process, anything
+else is treated as a SQLite file opened in WAL mode.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+MAX_FLUSH_BACKOFF = 60.0
+
+log = logging.getLogger(__name__)
+
+
+class StatsBackend(ABC):
+    """Where player stats live between sessions."""
+
+    @abstractmethod
+    def load(self, player_id: str) -> Optional[dict]:
+        """Return the latest stats saved for ``player_id``, or ``None``."""
+
+    @abstractmethod
+    def save(self, player_id: str, stats: dict) -> None:
+        """Queue a snapshot of ``stats``; must not block on disk."""
+
+    def flush(self) -> None:
+        """Write queued snapshots to durable storage."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class MemoryBackend(StatsBackend):
+    """Process-local backend, handy for tests and single-replica demos."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self, player_id: str) -> Optional[dict]:
+        with self._lock:
+            stats = self._data.get(player_id)
+        return copy.deepcopy(stats)
+
+    def save(self, player_id: str, stats: dict) -> None:
+        snapshot = copy.deepcopy(stats)
+        with self._lock:
+            self._data[player_id] = snapshot
+
+
+class SQLiteBackend(StatsBackend):
+    """SQLite backend with write-behind buffering.
+
+    Saves land in a dict guarded by a lock that is only held for the
+    assignment. A daemon thread swaps the dict out every ``flush_interval``
+    seconds and upserts it with a single ``executemany``. WAL mode lets
+    readers on other threads or replicas proceed while a flush commits.
+    """
+
+    def __init__(self, path: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, str] = {}
+        self._inflight: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = threading.Event()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS player_stats ("
+            " player_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        conn.commit()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="luck-arcade-stats-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            # WAL + NORMAL only syncs at checkpoints, not on every commit.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, player_id: str) -> Optional[dict]:
+        with self._pending_lock:
+            data = self._pending.get(player_id) or self._inflight.get(player_id)
+        if data is not None:
+            return json.loads(data)
+        row = self._connect().execute(
+            "SELECT data FROM player_stats WHERE player_id = ?", (player_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, player_id: str, stats: dict) -> None:
+        # Serialize now so later mutation of the caller's lists can't leak in.
+        data = json.dumps(stats)
+        with self._pending_lock:
+            self._pending[player_id] = data
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._pending_lock:
+                if not self._pending:
+                    return
+                # Keep the batch readable by load() until it is committed.
+                self._inflight, self._pending = self._pending, {}
+            now = time.time()
+            rows = [(player_id, data, now) for player_id, data in self._inflight.items()]
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO player_stats (player_id, data, updated) VALUES (?, ?, ?) "
+                        "ON CONFLICT(player_id) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+                        rows,
+                    )
+            except BaseException:
+                with self._pending_lock:
+                    # Put the batch back for the next try; snapshots saved since are newer.
+                    for player_id, data in self._inflight.items():
+                        self._pending.setdefault(player_id, data)
+                    self._inflight = {}
+                raise
+            with self._pending_lock:
+                self._inflight = {}
+
+    def _flush_loop(self) -> None:
+        delay = self.flush_interval
+        while not self._closed.wait(delay):
+            try:
+                self.flush()
+            except Exception:
+                delay = min(max(delay, self.flush_interval) * 2, MAX_FLUSH_BACKOFF)
+                log.exception("flushing player stats to %s failed; retrying in %.1fs", self.path, delay)
+            else:
+                delay = self.flush_interval
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self.flush()
+
+
+def open_backend(url: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> StatsBackend:
+    """Open the backend named by ``url`` (``memory://`` or a SQLite path)."""
+    if url == "memory://":
+        return MemoryBackend()
+    return SQLiteBackend(url, flush_interval=flush_interval)
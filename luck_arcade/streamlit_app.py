@@ -1,256 +1,433 @@
 import datetime
-import random
-import time
-
+import functools
+import os
+import re
+import sys
+import uuid
+from pathlib import Path
+
+import pandas as pd
 import streamlit as st
 
+if __package__ in (None, ""):
+    # `streamlit run luck_arcade/streamlit_app.py` only puts this folder on sys.path.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from luck_arcade import daily, engine, eventlog, fair, games, metrics, odds, store, theme, tournament
+from luck_arcade.leaderboard import Leaderboard, daily_board, guess_board
+from luck_arcade.rooms import Rooms
+from luck_arcade.session import PlayerState, Sessions
+from luck_arcade.stats import Event
+
+
+ANIMATION_MODES = ("Client-side", "Off")
+DEFAULT_THEME = "Arcade Neon"
+TREND_POINTS = 120
+ROOM_POLL_SECONDS = 0.5
+# How long past the scheduled time a poll waits for its room's round to land.
+ROOM_WAIT_SLACK = 0.25
+STATS_URL = os.environ.get("LUCK_ARCADE_STATS", "luck_arcade_stats.db")
+EVENTS_DIR = os.environ.get("LUCK_ARCADE_EVENTS", "luck_arcade_events")
+FAIR_DIR = os.environ.get("LUCK_ARCADE_FAIR", "luck_arcade_fair")
+DAILY_DB = os.environ.get("LUCK_ARCADE_DAILY", "luck_arcade_daily.db")
+SESSIONS_DIR = os.environ.get("LUCK_ARCADE_SESSIONS", "luck_arcade_sessions")
+# Player ids share the stats backend with reserved keys such as the
+# leaderboards' "__leaderboard__", so only plain ids are taken from the URL.
+PLAYER_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+# ``?debug=sessions`` is only served when this is set (e.g. LUCK_ARCADE_DEBUG=1).
+DEBUG_PAGES = os.environ.get("LUCK_ARCADE_DEBUG", "") not in ("", "0", "off")
+TOURNAMENTS_DB = os.environ.get("LUCK_ARCADE_TOURNAMENTS", "luck_arcade_tournaments.db")
+
+
+@st.cache_resource
+def stats_backend() -> store.StatsBackend:
+    return store.open_backend(STATS_URL)
+
+
+@st.cache_resource
+def event_log() -> eventlog.EventLog:
+    return eventlog.EventLog(EVENTS_DIR)
+
+
+@st.cache_resource
+def sessions() -> Sessions:
+    pool = Sessions(SESSIONS_DIR)
+    for name in ("active", "spilled"):
+        metrics.SESSIONS.labels(name).set_function(lambda name=name: pool.counts()[name])
+    return pool
+
+
+@st.cache_resource
+def metrics_exporter():
+    """Start the ``/metrics`` server or file dump the environment asks for, once per process."""
+    return metrics.start_from_env()
+
+
+@st.cache_resource
+def daily_targets() -> daily.DailyTargets:
+    return daily.DailyTargets(DAILY_DB)
+
+
+@st.cache_resource
+def leaderboard() -> Leaderboard:
+    return Leaderboard.load(stats_backend())
+
+
+@st.cache_resource
+def rooms() -> Rooms:
+    return Rooms()
+
+
+@st.cache_resource
+def tournaments() -> tournament.Tournaments:
+    return tournament.Tournaments(tournament.Store(TOURNAMENTS_DB), hub=rooms().hub)
+
+
+def post_score(board: str, score: int):
+    leaderboard().submit(board, state().player_id, state().nickname, score)
+
+
+@st.cache_resource
+def fair_ledger() -> fair.Ledger:
+    return fair.Ledger(FAIR_DIR)
+
+
+def log_event(game: str, input_value: int, outcome: int, seed=None):
+    """Log one attempt; ``seed`` defaults to this session's RNG stream seed."""
+    if seed is None:
+        seed = state().rng.seed or 0
+    event_log().append(game, state().player_key, input_value, outcome, seed)
+
+
+def player_id() -> str:
+    """Stable id for this player, kept in the URL so reconnects find their stats."""
+    pid = st.query_params.get("player")
+    if not pid or not PLAYER_ID.fullmatch(pid):
+        pid = uuid.uuid4().hex
+        st.query_params["player"] = pid
+    return pid
+
 
 def init_state():
-    defaults = {
-        "coin_attempts_total": 0,
-        "coin_round_attempts": 0,
-        "coin_wins": 0,
-        "dice_attempts_total": 0,
-        "dice_round_attempts": 0,
-        "dice_wins": 0,
-        "random_attempts_total": 0,
-        "random_round_attempts": 0,
-        "random_wins": 0,
-        "random_target": None,
-        "random_level": None,
-        "streak_current": 0,
-        "streak_best": 0,
-        "history_attempts": [],
-        "daily_target": None,
-        "daily_attempts": 0,
-        "daily_completed": False,
-        "daily_key": None,
-        "blitz_runs": 0,
-        "blitz_best_hits": 0,
-        "theme_choice": "Arcade Neon",
-    }
-    for key, value in defaults.items():
-        st.session_state.setdefault(key, value)
+    if "player" not in st.session_state:
+        pid = player_id()
+        saved = stats_backend().load(pid) or {}
+        st.session_state.player = sessions().add(
+            PlayerState.load(pid, saved, theme_choice=DEFAULT_THEME, animations=ANIMATION_MODES[0])
+        )
+        metrics.SESSIONS_STARTED.inc()
+
+
+def state() -> PlayerState:
+    """This session's game state, read back from disk first if it was spilled while idle."""
+    return st.session_state.player.touch()
+
 
+def save_stats():
+    """Queue this player's stats for the next bulk flush (never waits on disk)."""
+    player = state()
+    stats_backend().save(player.player_id, player.snapshot())
+    leaderboard().save(stats_backend())
+    player.stats_dirty = False
 
 
 def reset_stats():
-    for key in list(st.session_state.keys()):
-        if key.endswith("_wins") or key.endswith("_attempts_total") or key.endswith("_round_attempts"):
-            st.session_state[key] = 0
-    st.session_state.streak_current = 0
-    st.session_state.streak_best = 0
-    st.session_state.history_attempts = []
-    st.session_state.daily_attempts = 0
-    st.session_state.daily_completed = False
-    st.session_state.blitz_runs = 0
-    st.session_state.blitz_best_hits = 0
-
-
-THEMES = {
-    "Arcade Neon": {
-        "font": "'Space Grotesk', 'Helvetica Neue', sans-serif",
-        "bg": """radial-gradient(circle at 20% 20%, rgba(0,169,173,0.18), transparent 25%),
-                 radial-gradient(circle at 80% 0%, rgba(255,140,0,0.18), transparent 25%),
-                 linear-gradient(135deg, #0b1b2b 0%, #0f2435 45%, #0f1f2d 100%)""",
-        "card": "rgba(255,255,255,0.06)",
-        "accent": "#00f0ff",
-        "text": "#e6f1ff",
-    },
-    "Retro Pixel": {
-        "font": "'Press Start 2P', 'Courier New', monospace",
-        "bg": """linear-gradient(135deg, #111 0%, #1a1a1a 45%, #111 100%),
-                 repeating-linear-gradient(90deg, rgba(255,255,255,0.04), rgba(255,255,255,0.04) 1px, transparent 1px, transparent 10px)""",
-        "card": "rgba(32,32,32,0.8)",
-        "accent": "#ffdf00",
-        "text": "#f4f4f4",
-    },
-}
-
-
-def render_style(theme: str):
-    data = THEMES[theme]
-    st.markdown(
-        f"""
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600&family=Press+Start+2P&display=swap');
-        html, body, [class*="css"] {{
-            font-family: {data['font']};
-        }}
-        .app-bg {{
-            background: {data['bg']};
-            padding: 2rem;
-            border-radius: 16px;
-            color: {data['text']};
-            animation: float-bg 14s ease-in-out infinite alternate;
-        }}
-        .card {{
-            background: {data['card']};
-            border: 1px solid rgba(255,255,255,0.08);
-            border-radius: 14px;
-            padding: 1.2rem 1.4rem;
-            box-shadow: 0 20px 45px rgba(0,0,0,0.25);
-            transition: transform 0.35s ease, box-shadow 0.35s ease;
-        }}
-        .card:hover {{
-            transform: translateY(-6px);
-            box-shadow: 0 25px 60px rgba(0,0,0,0.35);
-        }}
-        .hero-title {{
-            font-size: 2.2rem;
-            font-weight: 600;
-            margin-bottom: 0.4rem;
-            animation: glow 6s ease-in-out infinite;
-            color: {data['accent']};
-        }}
-        .hero-sub {{
-            color: #c7d7f2;
-            margin-bottom: 1rem;
-        }}
-        .metric-chip {{
-            background: rgba(255,255,255,0.08);
-            border-radius: 10px;
-            padding: 0.75rem 1rem;
-            text-align: center;
-        }}
-        .metric-chip h3 {{
-            margin: 0;
-            font-size: 1.4rem;
-        }}
-        .metric-chip small {{
-            color: #c7d7f2;
-        }}
-        @keyframes float-bg {{
-            0% {{ background-position: 0% 50%; }}
-            100% {{ background-position: 100% 50%; }}
-        }}
-        @keyframes glow {{
-            0% {{ text-shadow: 0 0 10px rgba(0,255,255,0.15); }}
-            50% {{ text-shadow: 0 0 24px rgba(0,255,255,0.35); }}
-            100% {{ text-shadow: 0 0 10px rgba(0,255,255,0.15); }}
-        }}
-        .pulse {{
-            position: relative;
-            overflow: hidden;
-        }}
-        .pulse::after {{
-            content: "";
-            position: absolute;
-            inset: 0;
-            background: radial-gradient(circle, rgba(255,255,255,0.08) 0%, transparent 55%);
-            animation: pulse 2.8s ease-in-out infinite;
-        }}
-        @keyframes pulse {{
-            0% {{ transform: scale(0.9); opacity: 0.8; }}
-            50% {{ transform: scale(1.05); opacity: 0.4; }}
-            100% {{ transform: scale(0.9); opacity: 0.8; }}
-        }}
-        .pill {{
-            display: inline-block;
-            padding: 0.45rem 0.8rem;
-            border-radius: 999px;
-            border: 1px solid rgba(255,255,255,0.12);
-            background: linear-gradient(135deg, rgba(255,255,255,0.08), rgba(255,255,255,0.02));
-            color: {data['text']};
-            font-size: 0.85rem;
-        }}
-        .glow-line {{
-            height: 1px;
-            background: linear-gradient(90deg, transparent, {data['accent']}, transparent);
-            margin: 1.2rem 0;
-        }}
-        .progress-shell {{
-            width: 100%;
-            background: rgba(255,255,255,0.08);
-            border-radius: 999px;
-            padding: 4px;
-            border: 1px solid rgba(255,255,255,0.12);
-        }}
-        .progress-fill {{
-            height: 12px;
-            border-radius: 999px;
-            background: linear-gradient(90deg, {data['accent']}, #ff6f61);
-            width: 0%;
-            transition: width 0.4s ease;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True,
+    state().stats.reset()
+    state().completions.clear()
+    state().trend.reset()
+    state().daily_attempts = 0
+    state().daily_completed = False
+    state().stats_dirty = True
+
+
+@st.cache_resource
+def theme_href(theme_name: str):
+    """URL of the published stylesheet, or None to inline it instead."""
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    try:
+        return theme.publish(theme_name)
+    except OSError:
+        return None
+
+
+def render_style(theme_name: str):
+    href = theme_href(theme_name)
+    if href:
+        st.markdown(f'<link rel="stylesheet" href="{href}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{theme.build_css(theme_name)}</style>", unsafe_allow_html=True)
+
+
+def fair_panel():
+    """Sidebar switch for provably-fair draws, showing the commitment and reveals."""
+    if not st.sidebar.toggle("Provably fair", key="fair_mode"):
+        state().fair = None
+        return
+    if "fair_rng" not in st.session_state:
+        st.session_state.fair_rng = fair.FairRandom(ledger=fair_ledger())
+    fair_rng = st.session_state.fair_rng
+    state().fair = fair_rng
+
+    st.sidebar.caption("Server seed commitment (SHA-256)")
+    st.sidebar.code(fair_rng.commitment, language=None)
+    # Shown before the client seed is read: a new client seed starts on this seed.
+    st.sidebar.caption("Next server seed commitment (used after a client seed change or rotation)")
+    st.sidebar.code(fair_rng.next_commitment, language=None)
+    client_seed = st.sidebar.text_input("Client seed", value=fair_rng.client_seed, key="fair_client_seed")
+    if client_seed != fair_rng.client_seed:
+        try:
+            fair_rotated(fair_rng.set_client_seed(client_seed))
+        except ValueError as error:
+            st.sidebar.error(str(error))
+        else:
+            st.rerun()
+    st.sidebar.caption(f"Draws under this seed: {fair_rng.nonce}")
+    if st.sidebar.button("Reveal seed and rotate", key="fair_rotate"):
+        fair_rotated(fair_rng.rotate())
+        st.rerun()
+
+    reveal = st.session_state.get("fair_reveal")
+    if reveal:
+        st.sidebar.caption(f"Revealed seed for {reveal.commitment[:12]}… ({reveal.draws} draw(s))")
+        st.sidebar.code(reveal.server_seed, language=None)
+        st.sidebar.caption(
+            f"Draw k in [0, n) is fair.derive(server_seed, \"{reveal.client_seed}\", k, n); "
+            "the seed's SHA-256 must equal the commitment."
+        )
+
+
+def fair_rotated(reveal: fair.Reveal):
+    """Publish ``reveal`` once nothing still in play was drawn from its seed.
+
+    The guessing game's secret number is the only draw that outlives a
+    click, so an open round is abandoned and a new number drawn under the
+    new commitment.
+    """
+    if state().random_target is not None:
+        new_guess_target(state().random_level)
+    st.session_state.fair_reveal = reveal
+
+
+def new_guess_target(level_label: str):
+    """Start a guessing round at ``level_label`` with a fresh secret number."""
+    levels = {engine.level_label(level): level for level in engine.LEVELS}
+    level = levels.get(level_label, min(engine.LEVELS))
+    state().random_level = engine.level_label(level)
+    state().random_target = engine.pick_target(engine.LEVELS[level][1], state().rng)
+    state().stats.new_round("random")
+
+
+def animations_on() -> bool:
+    return state().animations != "Off"
+
+
+def reveal(placeholder, frames, final: str, step_ms: int):
+    """Flicker through ``frames`` and land on ``final``.
+
+    The outcome is already decided; the reel is pure CSS keyframes, so the
+    browser plays it while the script run returns immediately.
+    """
+    if not animations_on():
+        placeholder.markdown(f"### {final}")
+        return
+    metrics.ANIMATION_SECONDS.inc((len(frames) + 1) * step_ms / 1000)
+    spans = "".join(
+        f'<span class="reel-frame" style="animation-delay:{i * step_ms}ms;animation-duration:{step_ms}ms">{frame}</span>'
+        for i, frame in enumerate(frames)
     )
+    landing = f'<span class="reel-land" style="animation-delay:{len(frames) * step_ms}ms">{final}</span>'
+    placeholder.markdown(f'<h3 class="reel">{spans}{landing}</h3>', unsafe_allow_html=True)
 
 
-def stats_bar():
-    total_attempts = (
-        st.session_state.coin_attempts_total
-        + st.session_state.dice_attempts_total
-        + st.session_state.random_attempts_total
-    )
-    total_wins = (
-        st.session_state.coin_wins
-        + st.session_state.dice_wins
-        + st.session_state.random_wins
-    )
-    win_rate = f"{(total_wins / total_attempts * 100):.0f}%" if total_attempts else "—"
-
-    c1, c2, c3, c4 = st.columns(4)
-    c1.markdown(f'<div class="metric-chip"><small>Total attempts</small><h3>{total_attempts}</h3></div>', unsafe_allow_html=True)
-    c2.markdown(f'<div class="metric-chip"><small>Total wins</small><h3>{total_wins}</h3></div>', unsafe_allow_html=True)
-    c3.markdown(f'<div class="metric-chip"><small>Win rate</small><h3>{win_rate}</h3></div>', unsafe_allow_html=True)
-    c4.markdown(
-        f'<div class="metric-chip"><small>Streak</small><h3>{st.session_state.streak_current} / {st.session_state.streak_best} best</h3></div>',
-        unsafe_allow_html=True,
+def trend_frame(points) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "time": pd.to_datetime([point.time for point in points], unit="s"),
+            "attempts": [point.attempts for point in points],
+            "wins": [point.wins for point in points],
+        }
     )
 
-    if st.session_state.history_attempts:
-        st.caption("Attempts trend (last 30):")
-        st.line_chart(st.session_state.history_attempts, height=150)
-
 
-def log_attempt():
-    total_attempts = (
-        st.session_state.coin_attempts_total
-        + st.session_state.dice_attempts_total
-        + st.session_state.random_attempts_total
+def draw_trend(slot, full: bool = True):
+    """Chart the whole history, downsampled to ``TREND_POINTS`` points.
+
+    The payload is the same size whether the player has made ten attempts or
+    a million. A fragment rerun (``full=False``) leaves the chart alone
+    unless something was recorded since it was last drawn.
+    """
+    trend = state().trend
+    if not full and state().trend_sent == trend.version:
+        return
+    state().trend_sent = trend.version
+    if not len(trend):
+        slot.empty()
+        return
+    with slot.container():
+        st.caption("Attempts and wins over time:")
+        st.line_chart(trend_frame(trend.series(TREND_POINTS)), x="time", height=150)
+
+
+def stats_bar(metrics_slot, trend_slot, full: bool = True):
+    stats = state().stats
+    total_attempts = stats.total_attempts
+    total_wins = stats.total_wins
+    win_rate = f"{stats.win_rate * 100:.0f}%" if stats.win_rate is not None else "—"
+
+    metrics_slot.markdown(
+        '<div class="metric-row">'
+        f'<div class="metric-chip"><small>Total attempts</small><h3>{total_attempts}</h3></div>'
+        f'<div class="metric-chip"><small>Total wins</small><h3>{total_wins}</h3></div>'
+        f'<div class="metric-chip"><small>Win rate</small><h3>{win_rate}</h3></div>'
+        f'<div class="metric-chip"><small>Streak</small><h3>{stats.streak_current} / {stats.streak_best} best</h3></div>'
+        "</div>",
+        unsafe_allow_html=True,
     )
-    st.session_state.history_attempts.append(total_attempts)
-    st.session_state.history_attempts = st.session_state.history_attempts[-30:]
 
-
-def record_win():
-    st.session_state.streak_current += 1
-    st.session_state.streak_best = max(st.session_state.streak_best, st.session_state.streak_current)
-    if st.session_state.streak_current and st.session_state.streak_current % 3 == 0:
+    draw_trend(trend_slot, full)
+
+
+def record(event: Event, metered: bool = True):
+    """Score one flip, roll, guess or blitz and celebrate streak milestones.
+
+    ``metered=False`` leaves the attempts out of the metrics, for results
+    (like tournament entries) that were already counted where they were played.
+    """
+    stats = state().stats
+    streak_best = stats.streak_best
+    stats.record(event)
+    if metered:
+        metrics.played(event.spec_key, "app", event.attempts, event.wins)
+    state().trend.record(event.attempts, event.wins)
+    if stats.streak_best > streak_best:
+        post_score("streak_best", stats.streak_best)
+    if event.game == "blitz" and event.wins:
+        post_score("blitz_best_hits", event.wins)
+    if event.wins and stats.at_milestone:
         st.snow()
+    state().stats_dirty = True
 
 
-def reset_streak():
-    st.session_state.streak_current = 0
+def next_milestone(streak: int) -> int:
+    return max(3, ((streak // 3) + 1) * 3)
 
 
-def streak_meter():
-    milestone = max(3, ((st.session_state.streak_current // 3) + 1) * 3)
-    progress = min(st.session_state.streak_current / milestone, 1.0) if milestone else 0
+def streak_meter(slot):
+    streak_current = state().stats.streak_current
+    milestone = next_milestone(streak_current)
+    progress = min(streak_current / milestone, 1.0) if milestone else 0
     percent = int(progress * 100)
-    st.markdown(
-        f"""
-        <div class="progress-shell">
-            <div class="progress-fill" style="width:{percent}%"></div>
-        </div>
-        """,
+    with slot.container():
+        st.markdown(
+            f"""
+            <div class="progress-shell">
+                <div class="progress-fill" style="width:{percent}%"></div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+        st.caption(f"Current streak: {streak_current} · Next milestone: {milestone}")
+
+
+def status_row(slot):
+    daily_status = "Completed" if state().daily_completed else "Open"
+    daily_streak = state().completions.streak(datetime.date.today())
+    if daily_streak > 1:
+        daily_status += f" · {daily_streak}-day streak"
+    streak_best = state().stats.streak_best
+    next_goal = max(1, streak_best + 1)
+    slot.markdown(
+        '<div class="pill-row">'
+        f'<span class="pill">Theme: {state().theme_choice}</span>'
+        f'<span class="pill">Daily: {daily_status}</span>'
+        f'<span class="pill">Best streak: {streak_best} · Next: {next_goal}</span>'
+        "</div>",
         unsafe_allow_html=True,
     )
-    st.caption(f"Current streak: {st.session_state.streak_current} · Next milestone: {milestone}")
 
 
-def status_row():
-    daily_status = "Completed" if st.session_state.daily_completed else "Open"
-    next_goal = max(1, st.session_state.streak_best + 1)
-    c1, c2, c3 = st.columns(3)
-    c1.markdown(f'<span class="pill">Theme: {st.session_state.theme_choice}</span>', unsafe_allow_html=True)
-    c2.markdown(f'<span class="pill">Daily: {daily_status}</span>', unsafe_allow_html=True)
-    c3.markdown(f'<span class="pill">Best streak: {st.session_state.streak_best} · Next: {next_goal}</span>', unsafe_allow_html=True)
+def chance(p) -> str:
+    p = float(p)
+    if p <= 0:
+        return "0%"
+    if p >= 0.5:
+        return f"{p:.1%}"
+    return f"{p:.1%} (1 in {1 / p:,.1f})"
+
+
+def odds_panel(lines):
+    """Exact odds for the current settings; ``odds`` memoizes them, so reruns are free."""
+    with st.expander("Your odds"):
+        st.markdown("\n".join(f"- {line}" for line in lines))
+
+
+def play_until_win_odds(game: str, unit: str):
+    dist = odds.attempts(game)
+    streak = state().stats.streak_current
+    milestone = next_milestone(streak)
+    odds_panel(
+        [
+            f"Each {unit} wins: {chance(dist.p)}",
+            f"{unit.capitalize()}s to win: {float(dist.mean):.1f} on average (std {dist.std:.2f}), "
+            f"{dist.quantile(0.9)} or fewer 9 times out of 10",
+            f"Win within your next 3 {unit}s: {chance(dist.cdf(3))}",
+            f"Reach a {milestone} streak from {streak} without a miss: {chance(odds.reach_streak(dist.p, streak, milestone))}",
+        ]
+    )
+
+
+HEADER_SLOTS = ("status", "meter", "metrics", "trend")
+
+
+def header_slots():
+    """Reserve the header placeholders that game fragments refresh in place."""
+    st.session_state.header_slots = {name: st.empty() for name in HEADER_SLOTS}
+
+
+def refresh_header(full: bool = True):
+    """Redraw the header; ``full=False`` skips the trend chart if nothing was recorded."""
+    slots = st.session_state.header_slots
+    status_row(slots["status"])
+    streak_meter(slots["meter"])
+    stats_bar(slots["metrics"], slots["trend"], full)
+
+
+def game_fragment(func):
+    """Run a game tab as its own fragment.
+
+    A click only reruns that tab; if it scored anything, the header
+    placeholders are redrawn and the stats queued for saving.
+    """
+
+    timer = metrics.RERUN_SECONDS.labels(func.__name__)
+
+    @st.fragment
+    @functools.wraps(func)
+    def wrapper(*args):
+        with timer.time():
+            func(*args)
+        if state().stats_dirty:
+            refresh_header(full=False)
+            save_stats()
+
+    return wrapper
+
 
+GAME_TABS = {}
 
+
+def game_tab(key: str):
+    """Register the tab for the game declared as ``key`` in ``luck_arcade.games``."""
+
+    def register(func):
+        GAME_TABS[key] = game_fragment(func)
+        return GAME_TABS[key]
+
+    return register
+
+
+@game_tab("coin")
 def coin_game():
     st.subheader("Flip a Coin · easy")
     st.write("Pick your side and try to match the flip.")
@@ -259,31 +436,27 @@ def coin_game():
     flip_placeholder = st.empty()
 
     if st.button("Flip the coin", use_container_width=True, key="coin_flip"):
+        flip = engine.flip_coin(side, state().rng)
+        result = flip.outcome
+        log_event("coin", engine.COIN_SIDES.index(side), engine.COIN_SIDES.index(result))
         # Quick flip animation before revealing the result
-        for _ in range(10):
-            flip_placeholder.markdown(f"### {random.choice(['Heads', 'Tails'])}")
-            time.sleep(0.08)
-
-        st.session_state.coin_attempts_total += 1
-        st.session_state.coin_round_attempts += 1
-        result = random.choice(["Heads", "Tails"])
-        flip_placeholder.markdown(f"### Result: {result}")
-        log_attempt()
-        if result == side:
-            st.session_state.coin_wins += 1
-            record_win()
+        frames = [state().stream.choice(engine.COIN_SIDES) for _ in range(10)]
+        reveal(flip_placeholder, frames, f"Result: {result}", step_ms=80)
+        record(Event("coin", wins=int(flip.won)))
+        if flip.won:
             st.success(
-                f"The coin shows {result}! You guessed it in {st.session_state.coin_round_attempts} attempt(s)."
+                f"The coin shows {result}! You guessed it in {state().stats.round_of('coin')} attempt(s)."
             )
             st.balloons()
-            st.session_state.coin_round_attempts = 0
+            state().stats.new_round("coin")
         else:
             st.info(f"The coin shows {result}. Try again!")
-            reset_streak()
 
-    st.caption(f"Attempts this round: {st.session_state.coin_round_attempts}")
+    st.caption(f"Attempts this round: {state().stats.round_of('coin')}")
+    play_until_win_odds("coin", "flip")
 
 
+@game_tab("dice")
 def dice_game():
     st.subheader("Roll a Dice · medium")
     st.write("Choose your lucky number and roll until you hit it.")
@@ -292,53 +465,42 @@ def dice_game():
     roll_placeholder = st.empty()
 
     if st.button("Roll the dice", use_container_width=True, key="dice_roll"):
+        result = engine.roll_dice(lucky_number, state().rng)
+        roll = result.roll
+        log_event("dice", lucky_number, roll)
         # Rolling animation
-        for _ in range(12):
-            roll_placeholder.markdown(f"### 🎲 {random.randint(1, 6)}")
-            time.sleep(0.06)
-
-        st.session_state.dice_attempts_total += 1
-        st.session_state.dice_round_attempts += 1
-        roll = random.randint(1, 6)
-        roll_placeholder.markdown(f"### Result: 🎲 {roll}")
-        log_attempt()
-        if roll == lucky_number:
-            st.session_state.dice_wins += 1
-            record_win()
+        frames = [f"🎲 {state().stream.choice(engine.DICE_FACES)}" for _ in range(12)]
+        reveal(roll_placeholder, frames, f"Result: 🎲 {roll}", step_ms=60)
+        record(Event("dice", wins=int(result.won)))
+        if result.won:
             st.success(
-                f"You rolled a {roll}! Jackpot in {st.session_state.dice_round_attempts} attempt(s)."
+                f"You rolled a {roll}! Jackpot in {state().stats.round_of('dice')} attempt(s)."
             )
             st.balloons()
-            st.session_state.dice_round_attempts = 0
+            state().stats.new_round("dice")
         else:
             st.warning(f"You rolled a {roll}. No match yet.")
-            reset_streak()
 
-    st.caption(f"Attempts this round: {st.session_state.dice_round_attempts}")
+    st.caption(f"Attempts this round: {state().stats.round_of('dice')}")
+    play_until_win_odds("dice", "roll")
 
 
+@game_tab("guess")
 def random_number_game():
     st.subheader("Pick a Random Number · hard")
     st.write("Select a difficulty, then guess the secret number.")
 
-    levels = {
-        "Easy (1-10)": 10,
-        "Medium (1-50)": 50,
-        "Hard (1-100)": 100,
-        "Nightmare (1-500)": 500,
-    }
+    levels = {engine.level_label(level): level for level in engine.LEVELS}
 
     level_label = st.selectbox("Choose difficulty", list(levels.keys()), key="level_select")
-    max_number = levels[level_label]
+    max_number = engine.LEVELS[levels[level_label]][1]
 
     def reset_target():
-        st.session_state.random_level = level_label
-        st.session_state.random_target = random.randint(1, max_number)
-        st.session_state.random_round_attempts = 0
+        new_guess_target(level_label)
 
-    if st.session_state.random_target is None:
+    if state().random_target is None:
         reset_target()
-    elif st.session_state.random_level != level_label:
+    elif state().random_level != level_label:
         reset_target()
 
     guess = st.number_input(
@@ -351,64 +513,74 @@ def random_number_game():
     )
 
     if st.button("Submit guess", use_container_width=True, key="submit_guess"):
-        st.session_state.random_attempts_total += 1
-        st.session_state.random_round_attempts += 1
-        target = st.session_state.random_target
-        log_attempt()
-
-        if guess == target:
-            st.session_state.random_wins += 1
-            record_win()
+        target = state().random_target
+        result = engine.check_guess(guess, target)
+        log_event("guess", guess, target)
+        record(Event("random", wins=int(result.won)))
+
+        if result.won:
             st.success(
                 f"YOU NAILED IT! The number was {target}. "
-                f"It took you {st.session_state.random_round_attempts} attempt(s)."
+                f"It took you {state().stats.round_of('random')} attempt(s)."
             )
             st.balloons()
+            post_score(guess_board(levels[level_label]), state().stats.round_of("random"))
             reset_target()
-        elif guess < target:
+        elif result.hint == "low":
             st.info("Too low! Aim higher.")
-            reset_streak()
         else:
             st.info("Too high! Aim lower.")
-            reset_streak()
 
     if st.button("Start a new number", key="new_number", use_container_width=True):
         reset_target()
         st.toast("New number picked! Start guessing.", icon="🎯")
 
-    st.caption(f"Attempts this round: {st.session_state.random_round_attempts}")
-
-    st.markdown("#### Daily Challenge (1-100)")
-    today = datetime.date.today().isoformat()
-    if st.session_state.daily_key != today or st.session_state.daily_target is None:
-        st.session_state.daily_key = today
-        seeded = random.Random(int(datetime.date.today().strftime("%Y%m%d")))
-        st.session_state.daily_target = seeded.randint(1, 100)
-        st.session_state.daily_attempts = 0
-        st.session_state.daily_completed = False
-
-    daily_guess = st.number_input("Daily guess", min_value=1, max_value=100, value=50, step=1, key="daily_guess")
-    if st.button("Submit daily guess", key="daily_submit", use_container_width=True, disabled=st.session_state.daily_completed):
-        st.session_state.daily_attempts += 1
-        st.session_state.random_attempts_total += 1
-        log_attempt()
-        if daily_guess == st.session_state.daily_target:
-            st.session_state.daily_completed = True
-            st.session_state.random_wins += 1
-            record_win()
-            st.success(f"Daily cracked! The number was {st.session_state.daily_target}. Attempts: {st.session_state.daily_attempts}.")
+    st.caption(f"Attempts this round: {state().stats.round_of('random')}")
+    halving = odds.attempts("guess", levels[level_label], "bisect")
+    blind = odds.attempts("guess", levels[level_label], "random")
+    used = state().stats.round_of("random")
+    odds_panel(
+        [
+            f"Halving the range finds it in at most {halving.max} guesses, {float(halving.mean):.2f} on average",
+            f"Halving finds it within {used + 1} guess(es): {chance(halving.cdf(used + 1))}",
+            f"Guessing blind instead takes {float(blind.mean):,.0f} guesses on average "
+            f"and {blind.quantile(0.9):,} to be 90% sure",
+        ]
+    )
+
+    st.markdown(f"#### Daily Challenge (1-{engine.DAILY_MAX})")
+    today = datetime.date.today()
+    if state().daily_key != today.isoformat() or state().daily_target is None:
+        # Once per day per session: the shared target and this player's bit.
+        state().daily_key = today.isoformat()
+        state().daily_target = daily_targets().target(today)
+        state().daily_attempts = 0
+        state().daily_completed = state().completions.done(today)
+
+    daily_guess = st.number_input(
+        "Daily guess", min_value=1, max_value=engine.DAILY_MAX, value=50, step=1, key="daily_guess"
+    )
+    if st.button("Submit daily guess", key="daily_submit", use_container_width=True, disabled=state().daily_completed):
+        state().daily_attempts += 1
+        result = engine.check_guess(daily_guess, state().daily_target)
+        log_event("daily", daily_guess, state().daily_target, seed=int(today.strftime("%Y%m%d")))
+        record(Event("random", wins=int(result.won), in_round=False))
+        if result.won:
+            state().daily_completed = True
+            state().completions.mark(today)
+            post_score(daily_board(today), state().daily_attempts)
+            st.success(f"Daily cracked! The number was {state().daily_target}. Attempts: {state().daily_attempts}.")
             st.balloons()
-        elif daily_guess < st.session_state.daily_target:
+        elif result.hint == "low":
             st.info("Too low for today’s number.")
-            reset_streak()
         else:
             st.info("Too high for today’s number.")
-            reset_streak()
 
-    if st.session_state.daily_completed:
+    if state().daily_completed:
         st.toast("Daily challenge done. Come back tomorrow!", icon="✅")
 
 
+@game_tab("blitz")
 def time_attack():
     st.subheader("Time Attack Blitz")
     st.write("Auto-rolls a burst of dice—maximize hits on your chosen number.")
@@ -419,73 +591,331 @@ def time_attack():
 
     placeholder = st.empty()
     if st.button("Start blitz", use_container_width=True, key="blitz_start"):
-        hits = 0
-        for i in range(rolls):
-            roll = random.randint(1, 6)
-            placeholder.markdown(f"### Roll {i + 1}/{rolls}: 🎲 {roll}")
-            if roll == target:
-                hits += 1
-            time.sleep(speed_ms / 1000)
-
-        st.session_state.blitz_runs += 1
-        st.session_state.blitz_best_hits = max(st.session_state.blitz_best_hits, hits)
-        st.info(f"Blitz over! You hit {hits} out of {rolls}. Best: {st.session_state.blitz_best_hits}")
-        st.session_state.dice_attempts_total += rolls
-        st.session_state.dice_wins += hits
-        st.session_state.dice_round_attempts = 0
-        log_attempt()
+        run = engine.blitz(target, rolls, state().rng)
+        hits = run.hits
+        chips = []
+        for i, roll in enumerate(run.rolls):
+            log_event("blitz", target, roll)
+            css = "roll-chip hit" if roll == target else "roll-chip"
+            if animations_on():
+                css += " reel-land"
+            chips.append(f'<span class="{css}" style="animation-delay:{i * speed_ms}ms">🎲 {roll}</span>')
+        placeholder.markdown(f'<div>{"".join(chips)}</div>', unsafe_allow_html=True)
+        if animations_on():
+            metrics.ANIMATION_SECONDS.inc(rolls * speed_ms / 1000)
+
+        record(Event("blitz", attempts=rolls, wins=hits))
+        st.info(f"Blitz over! You hit {hits} out of {rolls}. Best: {state().stats.blitz_best_hits}")
         if hits:
-            record_win()
             st.balloons()
         else:
             st.warning("No hits this time—go again!")
-            reset_streak()
+
+    hits = odds.blitz_hits(rolls, target)
+    best = state().stats.blitz_best_hits
+    odds_panel(
+        [
+            f"Expected hits in {rolls} rolls: {float(hits.mean):.1f} (std {hits.std:.2f})",
+            f"At least one hit: {chance(1 - hits.pmf(0))}",
+            f"Beat your best of {best}: {chance(1 - hits.cdf(best))}",
+            f"Two hits in a row somewhere: {chance(odds.streak_at_least(odds.win_chance('blitz'), 2, rolls))}",
+        ]
+    )
+    tournament_panel(target, rolls)
+
+
+def tournament_panel(target: int, rolls: int):
+    st.markdown("#### Tournament")
+    if not tournament.available():
+        st.caption("Tournaments need NumPy (`pip install numpy`).")
+        return
+    scheduler = tournaments()
+    seconds = max(0, int((scheduler.next_start or 0) - datetime.datetime.now().timestamp()))
+    st.caption(
+        f"Tournament {scheduler.upcoming} starts in {seconds}s with {len(scheduler):,} entries so far. "
+        "Every entry is one blitz with its own dice; most hits wins, fewer rolls breaks ties."
+    )
+    if st.button(f"Enter with {rolls} rolls on {target}", use_container_width=True, key="tournament_enter"):
+        player = state()
+        number = scheduler.enter(player.player_id, player.nickname, target, rolls)
+        if player.tournament != number:
+            player.tournament = number
+            player.tournament_feed = rooms().hub.subscribe(tournament.TOPIC)
+            player.tournament_last = None
+        st.toast(f"Entered tournament {number}.", icon="🏁")
+    if state().tournament is not None:
+        tournament_feed()
+
+
+@st.fragment(run_every=ROOM_POLL_SECONDS)
+def tournament_feed():
+    """Show the entered tournament's progress as it streams in, then where this player placed."""
+    player = state()
+    feed = player.tournament_feed
+    for message in feed.poll() if feed is not None else ():
+        if message.tournament != player.tournament:
+            continue
+        if isinstance(message, tournament.Result):
+            for entry in message.entries_of(player.player_id):
+                # Already counted in the metrics when the tournament ran.
+                event = Event("blitz", attempts=int(message.rolls[entry]), wins=int(message.hits[entry]), in_round=False)
+                record(event, metered=False)
+            player.tournament_feed = None
+        elif isinstance(message, tournament.Failed):
+            # The entries were carried over; follow the tournament they're in now.
+            player.tournament = message.moved_to
+        player.tournament_last = message
+
+    last = player.tournament_last
+    if last is None:
+        st.caption(f"Waiting for tournament {player.tournament} to start.")
+    elif isinstance(last, tournament.Failed):
+        st.warning(f"Tournament {last.tournament} couldn't finish. Your entries moved to tournament {last.moved_to}.")
+    elif isinstance(last, tournament.Progress):
+        text = f"Tournament {last.tournament}: {last.done:,} of {last.total:,} entries played, best {last.best_hits} hits"
+        st.progress(last.done / last.total, text=text)
+    else:
+        places = [(last.rank_of(entry), entry) for entry in last.entries_of(player.player_id)]
+        rank, entry = min(places)
+        st.markdown(f"**Tournament {last.tournament}:** you placed #{rank:,} of {last.entries:,} with {int(last.hits[entry])} hits.")
+        lines = ["| # | Player | Hits | Rolls |", "|---:|---|---:|---:|"]
+        lines += [f"| {s.rank} | {s.name.replace('|', '/')} | {s.hits} | {s.rolls} |" for s in last.bracket[:10]]
+        st.markdown("\n".join(lines))
+    if player.stats_dirty:
+        refresh_header(full=False)
+        save_stats()
+
+
+@game_fragment
+def until_win_game(key: str):
+    """Any ``until_win`` game without its own tab, played from its compiled table."""
+    spec = games.get(key)
+    table = games.table(key)
+    rounds = state().plugin_rounds
+    st.subheader(spec.label.replace(" (", " · ").rstrip(")"))
+    if spec.blurb:
+        st.write(spec.blurb)
+
+    pick = st.radio("Your pick", list(table.picks), horizontal=True, key=f"{key}_pick")
+    result_placeholder = st.empty()
+    if st.button("Play", use_container_width=True, key=f"{key}_play"):
+        outcome, won = table.play(table.index(pick), state().rng)
+        rounds[key] = rounds.get(key, 0) + 1
+        result_placeholder.markdown(f"### {outcome}")
+        record(Event(key, wins=int(won)))
+        if won:
+            st.success(f"{outcome}! You win in {rounds[key]} attempt(s).")
+            st.balloons()
+            rounds[key] = 0
+        else:
+            st.info(f"{outcome}. Try again!")
+
+    st.caption(f"Attempts this round: {rounds.get(key, 0)}")
+    play_until_win_odds(key, "try")
+
+
+def game_tabs():
+    """Registered games the app can show, each with the function that draws its tab."""
+    shown = []
+    for spec in games.registry().values():
+        tab = GAME_TABS.get(spec.key) or games.handler(spec, "streamlit")
+        if tab is None and spec.kind == "until_win":
+            tab = functools.partial(until_win_game, spec.key)
+        if tab is not None:
+            shown.append((spec, tab))
+    return shown
+
+
+@st.fragment(run_every=ROOM_POLL_SECONDS)
+def room_feed():
+    """Pick up rounds the room has played since the last poll and score this player's bets."""
+    room = rooms().get(state().room)
+    if room is None:
+        return
+    room.touch(state().player_id)
+    seat = room.seat_of(state().player_id)
+    feed = state().room_feed
+    due = rooms().next_round_in()
+    if room.bets() and due is not None and due < ROOM_POLL_SECONDS:
+        # The round lands before the next poll: wait for it so the result shows
+        # as soon as it's published instead of up to a poll later.
+        results = feed.wait(timeout=due + ROOM_WAIT_SLACK)
+    else:
+        results = feed.poll()
+    for result in results:
+        won = None if seat is None else result.for_seat(seat)
+        if won is not None:
+            record(Event(result.game, wins=int(won), in_round=False))
+        state().room_last = (result, won)
+
+    last = state().room_last
+    if last is None:
+        st.caption(f"Waiting for the first round. {room.bets()} bet(s) down.")
+    else:
+        result, won = last
+        st.markdown(f"### Round {result.number}: {result.outcome}")
+        verdict = "You won!" if won else "No luck this time." if won is not None else "You sat this one out."
+        st.write(f"{verdict} {result.winners} of {result.players} player(s) won.")
+    if state().stats_dirty:
+        refresh_header(full=False)
+        save_stats()
+
+
+def leave_room():
+    room = rooms().get(state().room)
+    if room is not None:
+        room.leave(state().player_id)
+    state().room = None
+    state().room_feed = None
+
+
+@game_fragment
+def rooms_tab():
+    st.subheader("Rooms")
+    st.write("Bet with everyone in the room on one shared flip or roll. A round is played every few seconds.")
+
+    hub = rooms()
+    name = st.text_input("Room name", value="lobby", max_chars=24, key="room_name").strip() or "lobby"
+    room = hub.get(name)
+    if room is None:
+        specs = games.of_kind("until_win")
+        game = st.selectbox("Game", [spec.key for spec in specs], format_func=lambda key: games.get(key).title, key="room_game")
+    else:
+        game = room.game
+        st.caption(f"{room.table.spec.title} · {len(room)} player(s)")
+
+    player = state().player_id
+    if state().room != name:
+        if not st.button("Join room", use_container_width=True, key="room_join"):
+            return
+        leave_room()
+        state().room = name
+    room = hub.open(name, game, owner=player)
+    # Idempotent, and puts back a player who was dropped for going quiet.
+    room.join(player)
+    feed = state().room_feed
+    if feed is None or feed.topic is not hub.hub.topic(room.topic):
+        # Just joined, or the room was closed while empty and opened again since.
+        state().room_feed = hub.hub.subscribe(room.topic)
+        state().room_last = None
+
+    pick = st.radio("Your pick", list(room.table.picks), horizontal=True, key=f"room_pick_{room.game}")
+    sit_out = st.checkbox("Sit out the next rounds", key="room_sit_out")
+    room.bet(player, None if sit_out else pick)
+
+    left, right = st.columns(2)
+    if room.owner == player:
+        # Only whoever opened the room can play rounds ahead of the schedule.
+        if left.button("Play the round now", use_container_width=True, key="room_resolve"):
+            room.resolve()
+    right.button("Leave room", use_container_width=True, key="room_leave", on_click=leave_room)
+    room_feed()
+
+
+@st.fragment
+def leaderboard_tab():
+    st.subheader("Leaderboards")
+    nickname = st.text_input("Your leaderboard name", value=state().nickname, max_chars=24, key="nickname_input")
+    if nickname.strip() and nickname.strip() != state().nickname:
+        state().nickname = nickname.strip()
+        state().stats_dirty = True
+
+    boards = ["streak_best", "blitz_best_hits", daily_board(datetime.date.today())]
+    boards += [guess_board(level) for level in engine.LEVELS]
+    board = leaderboard()
+    columns = st.columns(2)
+    for i, name in enumerate(boards):
+        snap = board.snapshot(name)
+        with columns[i % 2]:
+            st.markdown(f"#### {snap.title}")
+            if not snap.rows:
+                st.caption("No entries yet.")
+                continue
+            lines = ["| # | Player | Score |", "|---:|---|---:|"]
+            lines += [f"| {row.rank} | {row.name.replace('|', '/')} | {row.score} |" for row in snap.rows]
+            st.markdown("\n".join(lines))
+            rank = board.rank_of(name, state().player_id)
+            if rank:
+                st.caption(f"You're #{rank}.")
+    if state().stats_dirty:
+        save_stats()
+
+
+def sessions_page():
+    """``?debug=sessions``: how many sessions this process holds and what they cost (read-only)."""
+    st.title("Sessions")
+    pool = sessions()
+    report = pool.report()
+    columns = st.columns(4)
+    columns[0].metric("Sessions", report.sessions)
+    columns[1].metric("Bytes per session", f"{report.bytes_per_session:,.0f}")
+    columns[2].metric("In memory", f"{report.total_bytes / 1024:,.1f} KiB")
+    columns[3].metric("Spilled to disk", f"{report.spool_bytes / 1024:,.1f} KiB")
+    lines = ["| State | Sessions | Mean bytes | Max bytes |", "|---|---:|---:|---:|"]
+    for label, sizes in (("Active", report.active_bytes), ("Spilled", report.spilled_bytes)):
+        lines.append(f"| {label} | {len(sizes)} | {report.mean(sizes):,.0f} | {max(sizes, default=0):,} |")
+    st.markdown("\n".join(lines))
+    st.caption(
+        f"Sessions idle for {pool.idle_seconds:.0f}s are spilled to {pool.spool} and read back on their next run. "
+        "Widget values and Streamlit's own per-session bookkeeping aren't counted."
+    )
+
+    st.subheader("Metrics")
+    st.caption("Collecting." if metrics.enabled() else "Collection is off (LUCK_ARCADE_METRICS=off).")
+    where = metrics_exporter()
+    st.caption(f"Exported at {where}." if where else "Set LUCK_ARCADE_METRICS_PORT or LUCK_ARCADE_METRICS_FILE to export them.")
+    with st.expander("Current values"):
+        st.code(metrics.render(), language=None)
 
 
 def main():
     st.set_page_config(page_title="Luck Arcade", page_icon="🎲", layout="wide")
+    if DEBUG_PAGES and st.query_params.get("debug") == "sessions":
+        sessions_page()
+        return
+    metrics_exporter()
     init_state()
 
     with st.container():
         st.markdown('<div class="app-bg">', unsafe_allow_html=True)
-        st.session_state.theme_choice = st.sidebar.radio("Theme", ["Arcade Neon", "Retro Pixel"], index=0)
-        render_style(st.session_state.theme_choice)
+        state().theme_choice = st.sidebar.radio("Theme", list(theme.THEMES), index=0)
+        state().animations = st.sidebar.radio(
+            "Animations", ANIMATION_MODES, index=ANIMATION_MODES.index(state().animations)
+        )
+        fair_panel()
+        render_style(state().theme_choice)
         st.markdown('<div class="hero-title">Luck Arcade</div>', unsafe_allow_html=True)
         st.markdown('<div class="hero-sub">Play quick-fire chance games with sleek feedback, light animations, and live stats.</div>', unsafe_allow_html=True)
-        status_row()
-        streak_meter()
-        stats_bar()
+        header_slots()
         reset_col = st.columns(3)[2]
         with reset_col:
             if st.button("Reset stats", key="reset_stats"):
                 reset_stats()
                 st.toast("Stats cleared. Fresh start!", icon="♻️")
+        refresh_header()
         st.markdown('<div class="glow-line"></div>', unsafe_allow_html=True)
         st.markdown("---")
-        tabs = st.tabs(["Flip a Coin", "Roll a Dice", "Pick a Random Number", "Time Attack"])
+        shown = game_tabs()
+        tabs = st.tabs([spec.title for spec, _ in shown] + ["Rooms", "Leaderboard"])
 
-        with tabs[0]:
-            st.markdown('<div class="card pulse">', unsafe_allow_html=True)
-            coin_game()
-            st.markdown('</div>', unsafe_allow_html=True)
+        for tab, (_, draw) in zip(tabs, shown):
+            with tab:
+                st.markdown('<div class="card pulse">', unsafe_allow_html=True)
+                draw()
+                st.markdown('</div>', unsafe_allow_html=True)
 
-        with tabs[1]:
-            st.markdown('<div class="card pulse">', unsafe_allow_html=True)
-            dice_game()
-            st.markdown('</div>', unsafe_allow_html=True)
+        with tabs[-2]:
+            rooms_tab()
 
-        with tabs[2]:
-            st.markdown('<div class="card pulse">', unsafe_allow_html=True)
-            random_number_game()
-            st.markdown('</div>', unsafe_allow_html=True)
-
-        with tabs[3]:
-            st.markdown('<div class="card pulse">', unsafe_allow_html=True)
-            time_attack()
-            st.markdown('</div>', unsafe_allow_html=True)
+        with tabs[-1]:
+            leaderboard_tab()
 
         st.markdown('</div>', unsafe_allow_html=True)
 
+    if state().stats_dirty:
+        save_stats()
+
 
 if __name__ == "__main__":
-    main()
+    with metrics.RERUN_SECONDS.labels("app").time():
+        main()
@@ -0,0 +1,271 @@
+"""
+Theme stylesheets for the Streamlit app.
+
+The CSS for each theme is built once per process (``build_css`` is
+memoized) and, when Streamlit's static file serving is on, published as a
+file under ``static/`` so every rerun only sends a short ``<link>`` tag
+instead of the whole stylesheet. Fonts are self-hosted from
+``static/fonts/``, which ships both faces (SIL OFL, see ``OFL.txt``); a
+locally installed copy still wins. A deployment that strips a font file
+gets that font imported from Google Fonts instead, so it looks the same,
+just not self-hosted.
+
+Run ``python -m luck_arcade.theme`` to write the stylesheets ahead of time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+# Streamlit serves <app folder>/static/ at this path when server.enableStaticServing is on.
+STATIC_URL = "app/static"
+
+FONTS_DIR = STATIC_DIR / "fonts"
+GOOGLE_FONTS_URL = "https://fonts.googleapis.com/css2"
+
+# family, file under static/fonts/, weight range, Google Fonts family query
+FONT_FACES = (
+    ("Source Sans 3", "SourceSans3.woff2", "200 900", "Source+Sans+3:wght@400;500;600"),
+    ("Source Code Pro", "SourceCodePro.woff2", "200 900", "Source+Code+Pro:wght@400;600"),
+)
+
+THEMES = {
+    "Arcade Neon": {
+        "font": "'Source Sans 3', 'Helvetica Neue', sans-serif",
+        "bg": """radial-gradient(circle at 20% 20%, rgba(0,169,173,0.18), transparent 25%),
+                 radial-gradient(circle at 80% 0%, rgba(255,140,0,0.18), transparent 25%),
+                 linear-gradient(135deg, #0b1b2b 0%, #0f2435 45%, #0f1f2d 100%)""",
+        "card": "rgba(255,255,255,0.06)",
+        "accent": "#00f0ff",
+        "text": "#e6f1ff",
+    },
+    "Retro Pixel": {
+        "font": "'Source Code Pro', 'Courier New', monospace",
+        "bg": """linear-gradient(135deg, #111 0%, #1a1a1a 45%, #111 100%),
+                 repeating-linear-gradient(90deg, rgba(255,255,255,0.04), rgba(255,255,255,0.04) 1px, transparent 1px, transparent 10px)""",
+        "card": "rgba(32,32,32,0.8)",
+        "accent": "#ffdf00",
+        "text": "#f4f4f4",
+    },
+}
+
+
+def slug(theme: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", theme.lower()).strip("-")
+
+
+def font_faces_css(font_root: str, fonts_dir: Path = FONTS_DIR) -> str:
+    """``@font-face`` rules for the fonts in ``fonts_dir``, an ``@import`` for the rest."""
+    rules, remote = [], []
+    for family, filename, weight, query in FONT_FACES:
+        if not (Path(fonts_dir) / filename).is_file():
+            remote.append(f"family={query}")
+            continue
+        rules.append(
+            f"""@font-face {{
+    font-family: '{family}';
+    src: local('{family}'), url('{font_root}/{filename}') format('woff2');
+    font-weight: {weight};
+    font-display: swap;
+}}"""
+        )
+    if remote:
+        # @import has to come before every other rule.
+        rules.insert(0, f"@import url('{GOOGLE_FONTS_URL}?{'&'.join(remote)}&display=swap');")
+    return "\n".join(rules)
+
+
+@lru_cache(maxsize=None)
+def build_css(theme: str, font_root: str = f"{STATIC_URL}/fonts") -> str:
+    """Return the full stylesheet for ``theme`` (built once per process).
+
+    ``font_root`` is resolved against the page for inline ``<style>`` use
+    and against the stylesheet itself for published files.
+    """
+    data = THEMES[theme]
+    return font_faces_css(font_root) + f"""
+html, body, [class*="css"] {{
+    font-family: {data['font']};
+}}
+.app-bg {{
+    background: {data['bg']};
+    padding: 2rem;
+    border-radius: 16px;
+    color: {data['text']};
+    animation: float-bg 14s ease-in-out infinite alternate;
+}}
+.card {{
+    background: {data['card']};
+    border: 1px solid rgba(255,255,255,0.08);
+    border-radius: 14px;
+    padding: 1.2rem 1.4rem;
+    box-shadow: 0 20px 45px rgba(0,0,0,0.25);
+    transition: transform 0.35s ease, box-shadow 0.35s ease;
+}}
+.card:hover {{
+    transform: translateY(-6px);
+    box-shadow: 0 25px 60px rgba(0,0,0,0.35);
+}}
+.hero-title {{
+    font-size: 2.2rem;
+    font-weight: 600;
+    margin-bottom: 0.4rem;
+    animation: glow 6s ease-in-out infinite;
+    color: {data['accent']};
+}}
+.hero-sub {{
+    color: #c7d7f2;
+    margin-bottom: 1rem;
+}}
+.pill-row {{
+    display: flex;
+    flex-wrap: wrap;
+    justify-content: space-between;
+    gap: 0.6rem;
+}}
+.metric-row {{
+    display: grid;
+    grid-template-columns: repeat(4, minmax(0, 1fr));
+    gap: 1rem;
+}}
+.metric-chip {{
+    background: rgba(255,255,255,0.08);
+    border-radius: 10px;
+    padding: 0.75rem 1rem;
+    text-align: center;
+}}
+.metric-chip h3 {{
+    margin: 0;
+    font-size: 1.4rem;
+}}
+.metric-chip small {{
+    color: #c7d7f2;
+}}
+@keyframes float-bg {{
+    0% {{ background-position: 0% 50%; }}
+    100% {{ background-position: 100% 50%; }}
+}}
+@keyframes glow {{
+    0% {{ text-shadow: 0 0 10px rgba(0,255,255,0.15); }}
+    50% {{ text-shadow: 0 0 24px rgba(0,255,255,0.35); }}
+    100% {{ text-shadow: 0 0 10px rgba(0,255,255,0.15); }}
+}}
+.pulse {{
+    position: relative;
+    overflow: hidden;
+}}
+.pulse::after {{
+    content: "";
+    position: absolute;
+    inset: 0;
+    background: radial-gradient(circle, rgba(255,255,255,0.08) 0%, transparent 55%);
+    animation: pulse 2.8s ease-in-out infinite;
+}}
+@keyframes pulse {{
+    0% {{ transform: scale(0.9); opacity: 0.8; }}
+    50% {{ transform: scale(1.05); opacity: 0.4; }}
+    100% {{ transform: scale(0.9); opacity: 0.8; }}
+}}
+.pill {{
+    display: inline-block;
+    padding: 0.45rem 0.8rem;
+    border-radius: 999px;
+    border: 1px solid rgba(255,255,255,0.12);
+    background: linear-gradient(135deg, rgba(255,255,255,0.08), rgba(255,255,255,0.02));
+    color: {data['text']};
+    font-size: 0.85rem;
+}}
+.glow-line {{
+    height: 1px;
+    background: linear-gradient(90deg, transparent, {data['accent']}, transparent);
+    margin: 1.2rem 0;
+}}
+.progress-shell {{
+    width: 100%;
+    background: rgba(255,255,255,0.08);
+    border-radius: 999px;
+    padding: 4px;
+    border: 1px solid rgba(255,255,255,0.12);
+}}
+.progress-fill {{
+    height: 12px;
+    border-radius: 999px;
+    background: linear-gradient(90deg, {data['accent']}, #ff6f61);
+    width: 0%;
+    transition: width 0.4s ease;
+}}
+.reel {{
+    display: grid;
+}}
+.reel > span {{
+    grid-area: 1 / 1;
+}}
+.reel-frame {{
+    opacity: 0;
+    animation-name: reel-flash;
+    animation-timing-function: steps(1, end);
+    animation-fill-mode: forwards;
+}}
+.reel-land {{
+    opacity: 0;
+    animation: reel-land 0.25s ease-out forwards;
+}}
+@keyframes reel-flash {{
+    0% {{ opacity: 1; }}
+    100% {{ opacity: 0; }}
+}}
+@keyframes reel-land {{
+    from {{ opacity: 0; transform: scale(0.8); }}
+    to {{ opacity: 1; transform: none; }}
+}}
+.roll-chip {{
+    display: inline-block;
+    min-width: 2.2rem;
+    margin: 0.15rem;
+    padding: 0.3rem 0.5rem;
+    border-radius: 8px;
+    text-align: center;
+    background: rgba(255,255,255,0.08);
+}}
+.roll-chip.hit {{
+    background: {data['accent']};
+    color: #111;
+}}
+"""
+
+
+def stylesheet_name(theme: str) -> str:
+    return f"theme-{slug(theme)}.css"
+
+
+def publish(theme: str, directory: Path = STATIC_DIR) -> str:
+    """Write ``theme``'s stylesheet under ``directory`` and return its URL.
+
+    The file is only rewritten when its content changed; the URL carries a
+    content hash so browsers pick up edits without a hard refresh.
+    """
+    css = build_css(theme, font_root="fonts")
+    path = Path(directory) / stylesheet_name(theme)
+    if not path.exists() or path.read_text(encoding="utf-8") != css:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(css, encoding="utf-8")
+    digest = hashlib.sha1(css.encode("utf-8")).hexdigest()[:10]
+    return f"{STATIC_URL}/{path.name}?v={digest}"
+
+
+def write_static(directory: Path = STATIC_DIR) -> List[Path]:
+    """Build step: write every theme's stylesheet under ``directory``."""
+    for theme in THEMES:
+        publish(theme, directory)
+    return [Path(directory) / stylesheet_name(theme) for theme in THEMES]
+
+
+if __name__ == "__main__":
+    for written in write_static():
+        print(written)
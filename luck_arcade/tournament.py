@@ -0,0 +1,441 @@
+"""
+Time Attack tournaments: thousands of scheduled blitz entries resolved at once.
+
+Players enter the next tournament with a target and a roll count, as in
+the Time Attack tab. When it runs, every entry is played in one vectorized
+pass and the bracket is ranked with a partial sort. The results are then
+stored with one bulk write.
+
+Draws: entry ``i`` rolls from its own seed (derived from the tournament
+seed and ``i`` unless the entry brings one). Its stream is SplitMix64 over
+a counter: the ``c``-th word is ``mix(seed + c * GOLDEN)``, and its top 32
+bits become a face by the same unbiased multiply-and-reject reduction
+``luck_arcade.rng`` uses. With no sequential state, NumPy computes a whole
+chunk of entries times ``MAX_ROLLS`` counters at once. ``entry_rolls``
+replays a single entry in pure Python. Rows that hit a rejected word (4
+words in 2**32) are replayed that way too, so batched and replayed results
+always agree.
+
+Ranking: most hits first, then fewer rolls, then earlier entry. Only the
+top ``bracket`` entries are ordered (``argpartition``); anyone else's rank
+is a count over the scores when asked for.
+
+Tournament ids come from SQLite (``AUTOINCREMENT``) when a tournament
+opens for entries, so processes sharing the database never reuse one. If
+a run fails, its entries go back into the next tournament and a ``Failed``
+message says where they went; the scheduler keeps running.
+
+Progress goes out through a ``rooms.Hub`` after every chunk, and the result
+when it's done, all on the one ``tournaments`` topic (so the hub's bounded
+backlog is the only history kept). Viewers follow a long run as it happens. No one waits on per-roll sleeps.
+
+    python -m luck_arcade.cli tournament -n 1e5 --seed 7
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from luck_arcade import engine, metrics
+from luck_arcade.rng import derive_seed, numpy_or_none
+
+
+GOLDEN = 0x9E3779B97F4A7C15
+MASK64 = (1 << 64) - 1
+WORD_BITS = 32
+WORD_MASK = (1 << WORD_BITS) - 1
+FACES = len(engine.DICE_FACES)
+# Words whose low product bits fall below this are rejected (unbiased faces).
+THRESHOLD = (1 << WORD_BITS) % FACES
+MIN_ROLLS, MAX_ROLLS = 6, 24
+DEFAULT_BRACKET = 100
+DEFAULT_CHUNK = 1 << 15
+DEFAULT_INTERVAL = 60.0
+TOPIC = "tournaments"
+
+log = logging.getLogger(__name__)
+
+
+def available() -> bool:
+    """Whether NumPy is installed, so tournaments can run."""
+    return numpy_or_none() is not None
+
+
+def _np():
+    np = numpy_or_none()
+    if np is None:
+        raise RuntimeError("Tournaments need NumPy. Install it with: pip install numpy")
+    return np
+
+
+def splitmix64(x: int) -> int:
+    z = x & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def _mix(np, x):
+    """``splitmix64`` over a ``uint64`` array (wrapping arithmetic)."""
+    z = x ^ (x >> np.uint64(30))
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return z
+
+
+def entry_rolls(seed: int, rolls: int) -> List[int]:
+    """The faces entry ``seed`` rolls, one at a time (the reference for the batch)."""
+    faces: List[int] = []
+    counter = 0
+    while len(faces) < rolls:
+        counter += 1
+        product = (splitmix64(seed + counter * GOLDEN) >> WORD_BITS) * FACES
+        if product & WORD_MASK >= THRESHOLD:
+            faces.append((product >> WORD_BITS) + 1)
+    return faces
+
+
+def entry_seeds(master: int, first: int, count: int):
+    """Seeds of entries ``first .. first + count - 1`` of a tournament seeded ``master``."""
+    np = _np()
+    index = np.arange(first + 1, first + count + 1, dtype=np.uint64)
+    return _mix(np, np.uint64(master & MASK64) + index * np.uint64(GOLDEN))
+
+
+def resolve_hits(seeds, targets, rolls):
+    """Hits on ``targets`` for each entry, all entries at once."""
+    np = _np()
+    counters = np.arange(1, MAX_ROLLS + 1, dtype=np.uint64) * np.uint64(GOLDEN)
+    words = _mix(np, seeds[:, None] + counters[None, :]) >> np.uint64(WORD_BITS)
+    product = words * np.uint64(FACES)
+    faces = (product >> np.uint64(WORD_BITS)).astype(np.uint8) + np.uint8(1)
+    played = np.arange(MAX_ROLLS, dtype=np.uint8)[None, :] < rolls[:, None]
+    hits = ((faces == targets[:, None]) & played).sum(axis=1, dtype=np.uint8)
+    rejected = ((product & np.uint64(WORD_MASK)) < np.uint64(THRESHOLD)) & played
+    for row in np.flatnonzero(rejected.any(axis=1)):
+        faces_row = entry_rolls(int(seeds[row]), int(rolls[row]))
+        hits[row] = sum(face == targets[row] for face in faces_row)
+    return hits
+
+
+def scores(hits, rolls):
+    """One sortable number per entry: more hits, then fewer rolls, is better."""
+    np = _np()
+    return hits.astype(np.int32) * (MAX_ROLLS + 1) + (MAX_ROLLS - rolls.astype(np.int32))
+
+
+def bracket_order(score, size: int):
+    """Indices of the best ``size`` entries, best first, ties to the earlier entry."""
+    np = _np()
+    size = min(size, len(score))
+    if size <= 0:
+        return np.zeros(0, dtype=np.int64)
+    # Unique keys, so the partition boundary breaks ties the same way as the order.
+    key = score.astype(np.int64) * len(score) - np.arange(len(score), dtype=np.int64)
+    top = np.argpartition(-key, size - 1)[:size] if size < len(score) else np.arange(len(score))
+    return top[np.argsort(-key[top])]
+
+
+@dataclass(frozen=True)
+class Progress:
+    """Published after each resolved chunk."""
+
+    tournament: int
+    done: int
+    total: int
+    best_hits: int
+
+
+@dataclass(frozen=True)
+class Failed:
+    """Published when a run fails; its entries are in tournament ``moved_to`` now."""
+
+    tournament: int
+    error: str
+    moved_to: int
+
+
+@dataclass(frozen=True)
+class Standing:
+    rank: int
+    entry: int
+    player: str
+    name: str
+    target: int
+    rolls: int
+    hits: int
+
+
+@dataclass
+class Result:
+    """A finished tournament: the bracket plus what's needed to rank anyone else."""
+
+    tournament: int
+    seed: int
+    entries: int
+    bracket: List[Standing]
+    timings: Dict[str, float]
+    players: List[str] = field(repr=False)
+    rolls: object = field(repr=False)
+    hits: object = field(repr=False)
+    score: object = field(repr=False)
+
+    def entries_of(self, player: str) -> List[int]:
+        return [i for i, who in enumerate(self.players) if who == player]
+
+    def rank_of(self, entry: int) -> int:
+        """1-based rank of ``entry`` (same ordering as the bracket)."""
+        mine = self.score[entry]
+        return int((self.score > mine).sum() + (self.score[:entry] == mine).sum()) + 1
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+def _signed(value: int) -> int:
+    """A 64-bit unsigned value as the signed integer SQLite can hold."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+class Store:
+    """Tournament results in SQLite, one transaction per tournament.
+
+    A tournament's row is inserted when it opens for entries (``open``),
+    which assigns its id, and filled in when it finishes or fails.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tournaments ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, status TEXT NOT NULL DEFAULT 'open', opened REAL NOT NULL, "
+            "seed INTEGER, entries INTEGER, finished REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tournament_entries ("
+            "tournament INTEGER NOT NULL, entry INTEGER NOT NULL, player TEXT NOT NULL, target INTEGER NOT NULL, "
+            "rolls INTEGER NOT NULL, seed INTEGER NOT NULL, hits INTEGER NOT NULL, rank INTEGER, "
+            "PRIMARY KEY (tournament, entry)) WITHOUT ROWID"
+        )
+
+    def open(self) -> int:
+        """Start a tournament taking entries; returns its id."""
+        with self._lock, self._conn:
+            return self._conn.execute("INSERT INTO tournaments (opened) VALUES (?)", (time.time(),)).lastrowid
+
+    def fail(self, tournament: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE tournaments SET status = 'failed', finished = ? WHERE id = ?", (time.time(), tournament))
+
+    def status(self, tournament: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM tournaments WHERE id = ?", (tournament,)).fetchone()
+        return row[0] if row else None
+
+    def write(self, result: Result, targets, rolls, seeds) -> None:
+        """Every entry of ``result`` in one ``executemany``; ranks only for the bracket."""
+        np = _np()
+        ranks: List[Optional[int]] = [None] * result.entries
+        for standing in result.bracket:
+            ranks[standing.entry] = standing.rank
+        rows = zip(
+            [result.tournament] * result.entries,
+            range(result.entries),
+            result.players,
+            targets.tolist(),
+            rolls.tolist(),
+            seeds.view(np.int64).tolist(),  # SQLite integers are signed
+            result.hits.tolist(),
+            ranks,
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE tournaments SET status = 'finished', seed = ?, entries = ?, finished = ? WHERE id = ?",
+                (_signed(result.seed), result.entries, time.time(), result.tournament),
+            )
+            self._conn.executemany("INSERT INTO tournament_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def count(self, tournament: int) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM tournament_entries WHERE tournament = ?", (tournament,)
+            ).fetchone()
+        return count
+
+
+class Tournaments:
+    """Collects entries for the next tournament and runs it on a schedule."""
+
+    def __init__(
+        self,
+        store: Store,
+        hub=None,
+        interval: Optional[float] = DEFAULT_INTERVAL,
+        bracket: int = DEFAULT_BRACKET,
+        chunk: int = DEFAULT_CHUNK,
+    ) -> None:
+        self.store = store
+        self.hub = hub
+        self.interval = interval
+        self.bracket = bracket
+        self.chunk = chunk
+        self.upcoming = store.open()
+        self.last: Optional[Result] = None
+        self.next_start = time.time() + interval if interval else None
+        self._pending = self._empty()
+        self._lock = threading.Lock()
+        self._running = threading.Lock()
+        self._stopped = threading.Event()
+        if interval:
+            threading.Thread(target=self._loop, name="luck-arcade-tournaments", daemon=True).start()
+
+    @staticmethod
+    def _empty() -> Dict[str, list]:
+        return {"players": [], "names": [], "targets": [], "rolls": [], "seeds": []}
+
+    def __len__(self) -> int:
+        return len(self._pending["players"])
+
+    def enter(self, player: str, name: str, target: int, rolls: int, seed: Optional[int] = None) -> int:
+        """Add an entry to the next tournament; returns that tournament's id."""
+        if target not in engine.DICE_FACES:
+            raise ValueError(f"target must be one of {engine.DICE_FACES}, got {target!r}")
+        if not MIN_ROLLS <= rolls <= MAX_ROLLS:
+            raise ValueError(f"rolls must be in {MIN_ROLLS}..{MAX_ROLLS}, got {rolls!r}")
+        with self._lock:
+            pending = self._pending
+            pending["players"].append(player)
+            pending["names"].append(name)
+            pending["targets"].append(target)
+            pending["rolls"].append(rolls)
+            pending["seeds"].append(seed)
+            return self.upcoming
+
+    def run(self, seed: Optional[int] = None) -> Optional[Result]:
+        """Play the pending entries now; None if there weren't any.
+
+        If playing fails, the entries go back into the next tournament, a
+        ``Failed`` message is published and the error is raised.
+        """
+        with self._running:
+            if not len(self):
+                return None
+            upcoming = self.store.open()
+            with self._lock:
+                pending, self._pending = self._pending, self._empty()
+                tournament, self.upcoming = self.upcoming, upcoming
+            try:
+                result = self.play(tournament, pending, seed)
+            except Exception as error:
+                with self._lock:
+                    for column, values in pending.items():
+                        self._pending[column][:0] = values
+                try:
+                    self.store.fail(tournament)
+                except Exception:
+                    log.exception("couldn't mark tournament %d failed", tournament)
+                self._publish(Failed(tournament, f"{type(error).__name__}: {error}", upcoming))
+                raise
+            self.last = result
+            return result
+
+    def play(self, tournament: int, entries: Dict[str, Sequence], seed: Optional[int] = None) -> Result:
+        """Resolve, rank and store ``entries`` (columns as in ``enter``) as ``tournament``."""
+        np = _np()
+        if seed is None:
+            master = os.environ.get("LUCK_ARCADE_SEED")
+            seed = derive_seed(master, "tournament", tournament) if master is not None else int.from_bytes(os.urandom(8), "little")
+        count = len(entries["players"])
+        timings = {}
+
+        started = time.perf_counter()
+        targets = np.asarray(entries["targets"], dtype=np.uint8)
+        rolls = np.asarray(entries["rolls"], dtype=np.uint8)
+        seeds = entry_seeds(seed, 0, count)
+        chosen = [(i, given) for i, given in enumerate(entries["seeds"]) if given is not None]
+        for i, given in chosen:
+            seeds[i] = given & MASK64
+        hits = np.empty(count, dtype=np.uint8)
+        best = 0
+        for first in range(0, count, self.chunk):
+            last = min(first + self.chunk, count)
+            hits[first:last] = resolve_hits(seeds[first:last], targets[first:last], rolls[first:last])
+            best = max(best, int(hits[first:last].max()))
+            self._publish(Progress(tournament, last, count, best))
+        timings["resolve"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        score = scores(hits, rolls)
+        order = bracket_order(score, self.bracket)
+        names = entries["names"]
+        bracket = [
+            Standing(rank, int(i), entries["players"][i], names[i], int(targets[i]), int(rolls[i]), int(hits[i]))
+            for rank, i in enumerate(order.tolist(), start=1)
+        ]
+        timings["rank"] = time.perf_counter() - started
+
+        result = Result(tournament, seed, count, bracket, timings, list(entries["players"]), rolls, hits, score)
+        started = time.perf_counter()
+        self.store.write(result, targets, rolls, seeds)
+        timings["write"] = time.perf_counter() - started
+        metrics.played("blitz", "tournament", int(rolls.sum()), int(hits.sum()))
+        self._publish(result)
+        return result
+
+    def _publish(self, message) -> None:
+        if self.hub is not None:
+            self.hub.publish(TOPIC, message)
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(max(0.0, self.next_start - time.time())):
+            self.next_start = time.time() + self.interval
+            try:
+                self.run()
+            except Exception:
+                log.exception("tournament run failed; pending entries stay for the next one")
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def random_entries(count: int, seed: Optional[int] = None) -> Dict[str, list]:
+    """``count`` bot entries with random targets and even roll counts, for load runs."""
+    np = _np()
+    generator = np.random.default_rng(seed)
+    players = [f"bot-{i}" for i in range(count)]
+    return {
+        "players": players,
+        "names": players,
+        "targets": generator.integers(1, FACES + 1, count).tolist(),
+        "rolls": (generator.integers(MIN_ROLLS // 2, MAX_ROLLS // 2 + 1, count) * 2).tolist(),
+        "seeds": [None] * count,
+    }
+
+
+def format_report(result: Result, top: int = 10) -> str:
+    rate = result.entries / result.seconds if result.seconds else float("inf")
+    steps = " · ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in result.timings.items())
+    lines = [
+        f"Tournament {result.tournament}: {result.entries:,} entries in {result.seconds:.3f}s "
+        f"({rate:,.0f} entries/s; {steps})",
+        f"Hits: mean {float(result.hits.mean()):.2f}, best {int(result.hits.max())}",
+    ]
+    for standing in result.bracket[:top]:
+        lines.append(
+            f"  #{standing.rank:<4} {standing.name:<16} {standing.hits:>2} hits on {standing.target} "
+            f"in {standing.rolls} rolls (entry {standing.entry})"
+        )
+    return "\n".join(lines)
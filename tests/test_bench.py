@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from luck_arcade import bench
+
+
+def test_compare_flags_only_real_regressions(capsys):
+    current = {"fast": 100.0, "slow": 200.0, "new": 50.0}
+    before = {"fast": 95.0, "slow": 100.0}
+    assert bench.compare(current, before, threshold=0.25) == ["slow"]
+    assert "SLOWER" in capsys.readouterr().out
+
+
+def test_history_keeps_the_latest_value_per_benchmark(tmp_path):
+    history = tmp_path / "history.jsonl"
+    assert bench.load_previous(str(history)) == {}
+    lines = [{"results": {"a": 1.0, "b": 2.0}}, {"results": {"b": 3.0}}]
+    history.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n", encoding="utf-8")
+    assert bench.load_previous(str(history)) == {"a": 1.0, "b": 3.0}
+
+
+def test_measure_reports_seconds_per_call():
+    calls = []
+    seconds = bench.measure(lambda: calls.append(None), repeat=2)
+    assert 0 < seconds < 1e-3
+    assert len(calls) > 1
+
+
+def test_every_benchmark_sets_up_and_runs():
+    if "tournament.resolve_10k_entries" in bench.BENCHMARKS:
+        pytest.importorskip("numpy")
+    for name, factory in bench.BENCHMARKS.items():
+        factory()()
+
+
+def test_main_appends_history_and_fails_on_regressions(tmp_path, capsys):
+    history = tmp_path / "history.jsonl"
+    args = ["-k", "engine.flip_coin", "--repeat", "1", "--history", str(history)]
+    bench.main(args)
+    (entry,) = [json.loads(line) for line in history.read_text(encoding="utf-8").splitlines()]
+    assert list(entry["results"]) == ["engine.flip_coin"]
+
+    history.write_text(json.dumps({"results": {"engine.flip_coin": 1e-6}}) + "\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        bench.main(args)
+    assert len(history.read_text(encoding="utf-8").splitlines()) == 1
+    with pytest.raises(SystemExit):
+        bench.main(["-k", "no-such-benchmark", "--history", str(history)])
@@ -0,0 +1,48 @@
+import io
+
+from luck_arcade import console
+from luck_arcade.rng import BufferedRandom
+
+
+def play(script: str, seed: int = 1) -> str:
+    sink = io.StringIO()
+    console.play_batch(io.StringIO(script), sink, rng=BufferedRandom(seed))
+    return sink.getvalue()
+
+
+def test_menu_lists_games_then_exit():
+    text, choices, exit_number = console.menu()
+    assert "Flip a Coin" in text
+    assert choices["1"] == choices["coin"] == "coin"
+    assert exit_number not in choices
+
+
+def test_leftover_moves_are_dropped_when_a_game_ends():
+    # Enough "yes" answers to reach a win; whatever is left must not reach the menu.
+    output = play("coin 1" + " yes" * 200 + "\n4\n")
+    assert "Congratulations!" in output
+    assert "Please choose a game" not in output
+    assert output.rstrip().endswith("Thanks for playing. Goodbye!")
+
+
+def test_quit_inside_a_game_returns_to_the_menu():
+    output = play("guess 1 q junk junk\nexit\n")
+    assert "Exiting round. The number was" in output
+    assert "Exiting to main menu." in output
+    assert "Please choose a game" not in output
+
+
+def test_bad_answers_are_asked_again():
+    output = play("dice seven 9 3 no\n4\n")
+    assert "Please enter a whole number." in output
+    assert "Please choose one of: 1, 2, 3, 4, 5, 6" in output
+
+
+def test_end_of_input_quits():
+    output = play("")
+    assert output.rstrip().endswith("Thanks for playing. Goodbye!")
+
+
+def test_same_seed_same_session():
+    script = "coin 2" + " yes" * 50 + "\ndice 4" + " yes" * 100 + "\n"
+    assert play(script, seed=7) == play(script, seed=7)
@@ -0,0 +1,70 @@
+import datetime
+import random
+
+import pytest
+
+from luck_arcade import daily, engine
+from luck_arcade.daily import Completions, DailyTargets
+
+
+TODAY = datetime.date(2024, 6, 1)
+
+
+def days(start, count):
+    return [start + datetime.timedelta(days=offset) for offset in range(count)]
+
+
+def test_targets_match_the_engine_and_cover_the_window():
+    targets = DailyTargets(window=10, today=TODAY)
+    assert len(targets) == daily.PAST_DAYS + 11
+    for day in days(TODAY - datetime.timedelta(days=daily.PAST_DAYS), 18):
+        assert targets.target(day) == engine.daily_target(day)
+    targets.close()
+
+
+def test_a_day_past_the_window_extends_it():
+    targets = DailyTargets(window=2, today=TODAY)
+    later = TODAY + datetime.timedelta(days=30)
+    assert targets.target(later) == engine.daily_target(later)
+    assert len(targets) > daily.PAST_DAYS + 3
+    targets.close()
+
+
+def test_targets_survive_a_restart(tmp_path):
+    path = str(tmp_path / "daily.db")
+    DailyTargets(path, window=5, today=TODAY).close()
+    reopened = DailyTargets(path, window=5, today=TODAY)
+    assert reopened.precompute(TODAY) == 0
+    reopened.close()
+
+
+def test_streak_counts_back_through_whole_weeks():
+    # Compare the byte-at-a-time walk with a plain day-by-day count.
+    rng = random.Random(5)
+    done = Completions()
+    marked = set()
+    for day in days(daily.EPOCH, 200):
+        if rng.random() < 0.93:
+            done.mark(day)
+            marked.add(day)
+    for day in days(daily.EPOCH, 200):
+        expected = 0
+        cursor = day if day in marked else day - datetime.timedelta(days=1)
+        while cursor in marked:
+            expected += 1
+            cursor -= datetime.timedelta(days=1)
+        assert done.streak(day) == expected, day
+    assert done.total() == len(marked)
+
+
+def test_bitmap_round_trip_and_bounds():
+    done = Completions()
+    done.mark(TODAY)
+    assert done.done(TODAY)
+    assert not done.done(TODAY + datetime.timedelta(days=400))
+    assert Completions.from_str(done.to_str()).done(TODAY)
+    assert Completions.from_str("").total() == 0
+    with pytest.raises(ValueError):
+        done.mark(daily.EPOCH - datetime.timedelta(days=1))
+    done.clear()
+    assert done.total() == 0
@@ -0,0 +1,58 @@
+import datetime
+import random
+
+import pytest
+
+from luck_arcade import engine
+
+
+def test_flip_coin_outcome_and_win():
+    flip = engine.flip_coin("Heads", random.Random(1))
+    assert flip.outcome in engine.COIN_SIDES
+    assert flip.won == (flip.outcome == "Heads")
+
+
+def test_flip_coin_rejects_unknown_side():
+    with pytest.raises(ValueError):
+        engine.flip_coin("Edge")
+
+
+def test_roll_dice_stays_on_the_faces():
+    rng = random.Random(2)
+    rolls = {engine.roll_dice(3, rng).roll for _ in range(500)}
+    assert rolls == set(engine.DICE_FACES)
+
+
+@pytest.mark.parametrize("lucky_number", [0, 7])
+def test_roll_dice_rejects_bad_numbers(lucky_number):
+    with pytest.raises(ValueError):
+        engine.roll_dice(lucky_number)
+
+
+def test_guess_hints():
+    assert engine.check_guess(3, 5).hint == "low"
+    assert engine.check_guess(7, 5).hint == "high"
+    hit = engine.check_guess(5, 5)
+    assert hit.won and hit.hint is None
+
+
+def test_pick_target_covers_the_level():
+    rng = random.Random(3)
+    targets = {engine.pick_target(10, rng) for _ in range(500)}
+    assert targets == set(range(1, 11))
+
+
+def test_daily_target_is_stable_per_day():
+    day = datetime.date(2024, 2, 29)
+    assert engine.daily_target(day) == engine.daily_target(day)
+    assert 1 <= engine.daily_target(day) <= engine.DAILY_MAX
+
+
+def test_blitz_counts_hits():
+    run = engine.blitz(4, 24, random.Random(4))
+    assert len(run.rolls) == 24
+    assert run.hits == run.rolls.count(4)
+
+
+def test_level_label():
+    assert engine.level_label(1) == "Easy (1-10)"
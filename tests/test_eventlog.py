@@ -0,0 +1,106 @@
+import struct
+
+import pytest
+
+from luck_arcade import eventlog
+
+
+def write_events(directory, **options):
+    log = eventlog.EventLog(directory, flush_interval=None, **options)
+    player = eventlog.player_key("alice")
+    log.append("coin", player, 1, 1, seed=7, timestamp=100.0)
+    log.append("coin", player, 1, 2, seed=7, timestamp=101.0)
+    log.append("dice", player, 6, 6, seed=7, timestamp=102.0)
+    log.append("blitz", eventlog.player_key("bob"), 3, 5, timestamp=103.0)
+    log.close()
+    return player
+
+
+def test_record_layout_is_fixed_width_little_endian(tmp_path):
+    player = write_events(tmp_path)
+    (segment,) = eventlog.segment_paths(tmp_path)
+    data = segment.read_bytes()
+    assert eventlog.RECORD.size == 36
+    assert len(data) == 4 * eventlog.RECORD.size
+    stamp, key, seed, game, input_value, outcome = eventlog.RECORD.unpack_from(data, 0)
+    assert (stamp, key, seed, game, input_value, outcome) == (100.0, player, 7, eventlog.GAME_IDS["coin"], 1, 1)
+    # The layout other tools read: f64, u64, u64, u16, 2 pad bytes, i32, i32.
+    assert struct.unpack_from("<d", data, 0)[0] == 100.0
+    assert struct.unpack_from("<H", data, 24)[0] == eventlog.GAME_IDS["coin"]
+    assert struct.unpack_from("<ii", data, 28) == (1, 1)
+
+
+def test_segments_roll_over_on_record_boundaries(tmp_path):
+    write_events(tmp_path, segment_bytes=eventlog.RECORD.size * 3 + 5)
+    sizes = [path.stat().st_size for path in eventlog.segment_paths(tmp_path)]
+    assert sizes == [eventlog.RECORD.size * 3, eventlog.RECORD.size]
+
+
+def test_reopening_drops_a_torn_record_and_appends(tmp_path):
+    write_events(tmp_path)
+    (segment,) = eventlog.segment_paths(tmp_path)
+    with open(segment, "ab") as handle:
+        handle.write(b"\x00" * 11)
+    log = eventlog.EventLog(tmp_path, flush_interval=None)
+    log.append("guess", 1, 5, 5, timestamp=104.0)
+    log.close()
+    assert segment.stat().st_size == 5 * eventlog.RECORD.size
+
+
+def test_aggregate_totals_per_game(tmp_path):
+    write_events(tmp_path, segment_bytes=eventlog.RECORD.size * 2)
+    result = eventlog.aggregate(tmp_path)
+    assert result.events == 4
+    assert (result.first, result.last) == (100.0, 103.0)
+    assert len(result.players) == 2
+    totals = {name: (game.events, game.hits) for name, game in result.games.items()}
+    assert totals == {"coin": (2, 1), "dice": (1, 1), "blitz": (1, 0)}
+
+
+def test_struct_fallback_agrees_with_numpy(tmp_path):
+    pytest.importorskip("numpy")
+    write_events(tmp_path)
+    fast = eventlog.aggregate(tmp_path)
+    slow = eventlog._aggregate_struct(tmp_path, eventlog.Aggregate())
+    assert fast == slow
+
+
+def test_unknown_game_is_rejected(tmp_path):
+    log = eventlog.EventLog(tmp_path, flush_interval=None)
+    with pytest.raises(KeyError):
+        log.append("poker", 1, 0, 0)
+    log.close()
+
+
+class FailingDisk:
+    """Stands in for a segment file: takes one record, then the disk is full."""
+
+    def __init__(self, real):
+        self.real, self.room = real, eventlog.RECORD.size
+
+    def write(self, data):
+        if not self.room:
+            raise OSError(28, "No space left on device")
+        written = self.real.write(data[: self.room])
+        self.room -= written
+        return written
+
+    def close(self):
+        self.real.close()
+
+
+def test_failed_writes_are_kept_and_retried_in_order(tmp_path):
+    log = eventlog.EventLog(tmp_path, buffer_bytes=2 * eventlog.RECORD.size, flush_interval=None)
+    real = log._file
+    log._file = FailingDisk(real)
+    log.append("coin", 1, 1, 1, timestamp=100.0)
+    log.append("coin", 1, 1, 2, timestamp=101.0)  # fills the buffer; the flush fails but append doesn't raise
+    log.append("coin", 1, 1, 3, timestamp=102.0)
+    with pytest.raises(OSError):
+        log.flush()
+    log._file = real
+    log.close()
+    (segment,) = eventlog.segment_paths(tmp_path)
+    data = segment.read_bytes()
+    stamps = [row[0] for row in eventlog.RECORD.iter_unpack(data)]
+    assert stamps == [100.0, 101.0, 102.0]
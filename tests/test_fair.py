@@ -0,0 +1,88 @@
+import hashlib
+import hmac
+
+import pytest
+
+from luck_arcade import fair
+
+
+def test_derive_matches_the_published_recipe():
+    server_seed, client_seed = "s" * 64, "player"
+    digest = hmac.new(server_seed.encode(), b"player:0:0", hashlib.sha256).digest()
+    word = int.from_bytes(digest[:4], "little")
+    assert fair.derive(server_seed, client_seed, 0, 6) == (word * 6) >> 32
+
+
+def test_draws_replay_from_the_revealed_seed():
+    source = fair.FairRandom(client_seed="mine")
+    committed = source.commitment
+    draws = [source.randint(1, 500) for _ in range(50)]
+    reveal = source.rotate()
+    assert reveal.valid and reveal.commitment == committed and reveal.draws == 50
+    assert [fair.derive(reveal.server_seed, "mine", k, 500) + 1 for k in range(50)] == draws
+    assert source.commitment != committed and source.nonce == 0
+
+
+def test_changing_the_client_seed_promotes_the_precommitted_seed():
+    source = fair.FairRandom(client_seed="first")
+    source.randbelow(10)
+    old, pending = source.commitment, source.next_commitment
+    reveal = source.set_client_seed("second")
+    assert (reveal.commitment, reveal.client_seed, reveal.draws) == (old, "first", 1)
+    # The new client seed draws from the seed committed before it was chosen.
+    assert source.commitment == pending and source.nonce == 0 and source.client_seed == "second"
+    assert fair.commitment(source.server_seed) == pending
+    assert source.next_commitment not in (old, pending)
+
+
+def test_rotate_promotes_the_pending_seed():
+    source = fair.FairRandom(client_seed="c")
+    pending = source.next_commitment
+    source.rotate()
+    assert source.commitment == pending
+
+
+def test_bad_client_seeds_are_rejected_before_rotating():
+    source = fair.FairRandom(client_seed="ok")
+    seeds = (source.commitment, source.next_commitment)
+    with pytest.raises(ValueError):
+        source.set_client_seed("no spaces")
+    assert (source.commitment, source.next_commitment) == seeds and source.client_seed == "ok"
+
+
+def write_ledger(directory, draws=200):
+    ledger = fair.Ledger(directory, flush_interval=None)
+    source = fair.FairRandom(client_seed="c", ledger=ledger)
+    for i in range(draws):
+        source.randbelow(6 if i % 2 else 500)
+        if i == draws // 2:
+            source.set_client_seed("d")
+    ledger.close()
+    return directory
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_accepts_an_honest_ledger(tmp_path, workers):
+    audit = fair.verify(write_ledger(tmp_path), workers=workers, chunk_bytes=1024)
+    assert audit.ok and audit.draws == audit.verified == 200
+
+
+def test_verify_catches_tampering(tmp_path):
+    write_ledger(tmp_path)
+    draws = tmp_path / fair.DRAWS_FILE
+    lines = draws.read_text(encoding="ascii").splitlines()
+    hashed, client_seed, nonce, n, value = lines[3].split(",")
+    lines[3] = ",".join((hashed, client_seed, nonce, n, str((int(value) + 1) % int(n))))
+    draws.write_text("\n".join(lines) + "\n", encoding="ascii")
+    audit = fair.verify(tmp_path)
+    assert not audit.ok and audit.failed == 1 and audit.mismatches == [lines[3]]
+
+
+def test_verify_flags_seeds_that_dont_match_their_commitment(tmp_path):
+    write_ledger(tmp_path)
+    seeds = tmp_path / fair.SEEDS_FILE
+    _, _, seed = seeds.read_text(encoding="ascii").splitlines()[0].partition(",")
+    with open(seeds, "a", encoding="ascii") as handle:
+        handle.write(f"{'0' * 64},{seed}\n")
+    audit = fair.verify(tmp_path)
+    assert audit.bad_commitments == ["0" * 64] and not audit.ok
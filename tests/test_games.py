@@ -0,0 +1,82 @@
+import io
+from fractions import Fraction
+
+import pytest
+
+from luck_arcade import console, games, odds
+from luck_arcade.games import GameSpec
+from luck_arcade.rng import BufferedRandom
+
+
+HIGH_LOW = GameSpec(
+    key="highlow",
+    title="High or Low",
+    outcomes=tuple(range(1, 7)),
+    picks=("low", "high"),
+    wins=lambda pick, roll: (roll > 3) == (pick == "high"),
+    aliases=("hl",),
+)
+
+
+@pytest.fixture
+def plugin(monkeypatch):
+    monkeypatch.setattr(games, "_discover", lambda: [HIGH_LOW, games.COIN, "not a spec"])
+    for cached in (games.registry, games.table, odds.win_chance, odds.attempts):
+        cached.cache_clear()
+    with pytest.warns(UserWarning):
+        games.registry()
+    yield HIGH_LOW
+    monkeypatch.undo()
+    for cached in (games.registry, games.table, odds.win_chance, odds.attempts):
+        cached.cache_clear()
+
+
+def test_builtin_registry():
+    assert list(games.registry())[:4] == ["coin", "dice", "guess", "blitz"]
+    assert [spec.key for spec in games.of_kind("until_win")] == ["coin", "dice"]
+    assert games.DICE.label == "Roll a Dice (medium)"
+    with pytest.raises(ValueError):
+        games.get("roulette")
+    with pytest.raises(ValueError):
+        GameSpec(key="empty", title="Empty")
+
+
+def test_identity_tables_need_no_matrix():
+    dice = games.table("dice")
+    assert dice.p == Fraction(1, 6)
+    assert dice.won(2, 2) and not dice.won(2, 3)
+    guess = games.table("guess")
+    assert guess.level == games.GUESS.default_level
+    assert len(games.table("guess", 1)) == games.GUESS.levels[1][1]
+    with pytest.raises(ValueError):
+        games.table("guess", 99)
+    with pytest.raises(ValueError):
+        dice.index(7)
+
+
+def test_custom_predicates_are_compiled():
+    table = games.Table(HIGH_LOW)
+    assert table.chances == (Fraction(1, 2), Fraction(1, 2))
+    high = table.index("high")
+    assert [table.won(high, i) for i in range(6)] == [False] * 3 + [True] * 3
+    rng = BufferedRandom(2)
+    draws = [table.play(high, rng) for _ in range(3000)]
+    assert all(won == (roll > 3) for roll, won in draws)
+    assert 1300 < sum(won for _, won in draws) < 1700
+
+
+def test_handlers_load_lazily():
+    assert games.handler(games.COIN, "console") is console.Console.flip_coin
+    assert games.handler(games.BLITZ, "console") is None
+    assert games.GUESS in games.playable("console")
+    assert games.BLITZ not in games.playable("console")
+
+
+def test_plugins_join_the_menu_and_odds(plugin):
+    assert list(games.registry()) == ["coin", "dice", "guess", "blitz", "highlow"]
+    assert games.menu_keys(games.playable("console"))["hl"] == "highlow"
+    assert odds.attempts("highlow").mean == 2
+    sink = io.StringIO()
+    console.play_batch(io.StringIO("hl 2" + " yes" * 60 + "\nq\n"), sink, rng=BufferedRandom(4))
+    assert "Welcome to High or Low!" in sink.getvalue()
+    assert "You win!" in sink.getvalue()
@@ -0,0 +1,71 @@
+import math
+
+import pytest
+
+from luck_arcade import history
+from luck_arcade.history import Trend, lttb
+
+
+def test_lttb_keeps_the_ends_and_the_peaks():
+    xs = list(range(1000))
+    ys = [0.0] * 1000
+    ys[250], ys[750] = 100.0, -100.0
+    chosen = lttb(xs, ys, 20)
+    assert len(chosen) == 20
+    assert chosen[0] == 0 and chosen[-1] == 999
+    assert chosen == sorted(set(chosen))
+    assert 250 in chosen and 750 in chosen
+
+
+def test_lttb_follows_a_curve():
+    xs = [i / 100 for i in range(2000)]
+    ys = [math.sin(x) for x in xs]
+    chosen = lttb(xs, ys, 100)
+    # Linear interpolation through the kept points stays close to the curve.
+    for left, right in zip(chosen, chosen[1:]):
+        for i in range(left, right + 1):
+            t = (xs[i] - xs[left]) / (xs[right] - xs[left])
+            assert abs(ys[left] + t * (ys[right] - ys[left]) - ys[i]) < 0.05
+
+
+def test_lttb_short_input_and_bad_budget():
+    assert lttb([1, 2, 3], [1, 2, 3], 10) == [0, 1, 2]
+    with pytest.raises(ValueError):
+        lttb(list(range(10)), list(range(10)), 2)
+
+
+def test_tiers_roll_up_by_minute_and_day():
+    trend = Trend()
+    start = 1_700_000_000.0 - 1_700_000_000.0 % history.DAY_SECONDS
+    for second in range(0, 600, 5):
+        trend.record(1, second % 2, when=start + second)
+    assert len(trend) == 120
+    assert len(trend.raw) == 120
+    assert len(trend.minutes) == 10
+    assert len(trend.days) == 1
+    assert trend.minutes.points()[-1].attempts == trend.attempts == 120
+
+
+def test_raw_tier_is_bounded_and_series_spans_everything():
+    trend = Trend()
+    start = 1_700_000_000.0
+    for step in range(5 * history.RAW_CAPACITY):
+        trend.record(1, 0, when=start + step * 30)
+    assert len(trend.raw) <= 2 * history.RAW_CAPACITY
+    assert len(trend.latest(10)) == 10
+    series = trend.series(50)
+    assert len(series) == 50
+    assert series[-1].attempts == trend.attempts
+    assert series[0].time < trend.raw.times[0]
+    assert [p.attempts for p in series] == sorted(p.attempts for p in series)
+    assert trend.series(50) is series
+
+
+def test_round_trip():
+    trend = Trend()
+    for step in range(300):
+        trend.record(2, 1, when=1_700_000_000.0 + step * 45)
+    restored = Trend.from_dict(trend.to_dict())
+    assert restored.series() == trend.series()
+    assert (restored.attempts, restored.wins, len(restored)) == (600, 300, 300)
+    assert len(Trend.from_dict(None)) == 0
@@ -0,0 +1,100 @@
+import datetime
+import random
+
+import pytest
+
+from luck_arcade import leaderboard, store
+from luck_arcade.leaderboard import Leaderboard, TopK
+from luck_arcade.stats import PlayerStats
+
+
+def test_topk_matches_a_full_sort():
+    rng = random.Random(3)
+    top = TopK(k=10, higher=True)
+    best = {}
+    for _ in range(2000):
+        player = f"p{rng.randrange(100)}"
+        score = rng.randrange(1000)
+        top.submit(player, player.upper(), score)
+        best[player] = max(score, best.get(player, score))
+    expected = sorted(best.values(), reverse=True)[:10]
+    assert [row.score for row in top.rows()] == expected
+    assert [row.rank for row in top.rows()] == list(range(1, 11))
+    assert len({row.name for row in top.rows()}) == 10
+
+
+def test_lower_is_better_and_ties_keep_arrival_order():
+    top = TopK(k=3, higher=False)
+    assert top.submit("a", "A", 5)
+    assert top.submit("b", "B", 5)
+    assert top.submit("c", "C", 2)
+    assert not top.submit("d", "D", 9)
+    assert not top.submit("a", "A", 7)
+    assert [(row.name, row.score) for row in top.rows()] == [("C", 2), ("A", 5), ("B", 5)]
+    assert top.rank_of("b") == 3
+    assert top.rank_of("d") is None
+
+
+def test_improving_moves_a_player_and_renaming_counts_as_a_change():
+    top = TopK(k=2)
+    top.submit("a", "A", 1)
+    top.submit("b", "B", 3)
+    assert top.submit("a", "A", 4)
+    assert top.rank_of("a") == 1
+    assert len(top) == 2
+    assert not top.submit("b", "B", 2)
+    assert top.submit("b", "Bee", 2)
+    assert top.rows()[1].name == "Bee"
+
+
+def test_topk_needs_room():
+    with pytest.raises(ValueError):
+        TopK(k=0)
+
+
+def test_snapshot_is_cached_until_the_ttl_passes():
+    board = Leaderboard(k=5, ttl=10)
+    board.submit("streak_best", "p", "P", 3)
+    first = board.snapshot("streak_best", now=100)
+    board.submit("streak_best", "q", "Q", 4)
+    assert board.snapshot("streak_best", now=105) is first
+    fresh = board.snapshot("streak_best", now=111)
+    assert [row.name for row in fresh.rows] == ["Q", "P"]
+    assert board.snapshot("guess:1", now=0).rows == ()
+
+
+def test_only_the_latest_daily_boards_are_kept():
+    board = Leaderboard()
+    start = datetime.date(2024, 1, 1)
+    for offset in range(leaderboard.DAILY_DAYS_KEPT + 3):
+        day = start + datetime.timedelta(days=offset)
+        board.submit(leaderboard.daily_board(day), "p", "P", offset + 1)
+    days = sorted(name for name in board.boards() if leaderboard.board_kind(name) == "daily")
+    assert len(days) == leaderboard.DAILY_DAYS_KEPT
+    assert days[0] == leaderboard.daily_board(start + datetime.timedelta(days=3))
+
+
+def test_round_trip_through_a_backend():
+    backend = store.open_backend("memory://")
+    board = Leaderboard()
+    board.submit("streak_best", "p", "P", 3)
+    board.submit(leaderboard.guess_board(2), "q", "Q", 4)
+    board.save(backend)
+    assert not board.changed
+    restored = Leaderboard.load(backend)
+    assert restored.to_dict() == board.to_dict()
+
+
+def test_unknown_or_clobbered_boards_are_skipped():
+    backend = store.open_backend("memory://")
+    backend.save(leaderboard.STORE_KEY, PlayerStats().to_dict())
+    assert Leaderboard.load(backend).boards() == []
+    saved = {
+        "streak_best": [["p", "P", 3], ["bad"], ["q", "Q", "not a score"]],
+        "guess:hard": [["p", "P", 1]],
+        "retired_board": [["p", "P", 1]],
+        "daily:2024-01-01": "not rows",
+    }
+    restored = Leaderboard.from_dict(saved)
+    assert restored.boards() == ["streak_best"]
+    assert restored.to_dict() == {"streak_best": [["p", "P", 3]]}
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from luck_arcade import loadtest
+
+
+SCRATCH = (
+    "LUCK_ARCADE_STATS",
+    "LUCK_ARCADE_DAILY",
+    "LUCK_ARCADE_TOURNAMENTS",
+    "LUCK_ARCADE_EVENTS",
+    "LUCK_ARCADE_FAIR",
+    "LUCK_ARCADE_SESSIONS",
+)
+
+
+@pytest.fixture
+def unset(monkeypatch):
+    # Set first so monkeypatch removes whatever scratch_environment adds.
+    for name in SCRATCH:
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+
+
+@pytest.fixture
+def scratch(unset):
+    loadtest.scratch_environment()
+
+
+def test_percentile_is_nearest_rank():
+    samples = list(range(1, 101))
+    assert loadtest.percentile(samples, 0.50) == 50
+    assert loadtest.percentile(samples, 0.99) == 99
+    assert loadtest.percentile(samples, 1.0) == 100
+    assert loadtest.percentile([7], 0.0) == 7
+    assert loadtest.percentile([], 0.5) == 0.0
+
+
+def test_scratch_environment_keeps_the_real_stores_untouched(scratch):
+    assert os.environ["LUCK_ARCADE_STATS"] == "memory://"
+    assert os.environ["LUCK_ARCADE_DAILY"] == os.environ["LUCK_ARCADE_TOURNAMENTS"] == ":memory:"
+    spool = os.path.dirname(os.environ["LUCK_ARCADE_EVENTS"])
+    assert os.path.basename(spool).startswith("luck-arcade-loadtest-")
+    for name in ("LUCK_ARCADE_FAIR", "LUCK_ARCADE_SESSIONS"):
+        assert os.path.dirname(os.environ[name]) == spool
+
+
+def test_scratch_environment_respects_what_is_set(unset, monkeypatch, tmp_path):
+    monkeypatch.setenv("LUCK_ARCADE_EVENTS", str(tmp_path))
+    loadtest.scratch_environment()
+    assert os.environ["LUCK_ARCADE_EVENTS"] == str(tmp_path)
+
+
+def test_a_session_plays_every_action(scratch):
+    pytest.importorskip("streamlit")
+    latencies, errors, _, seconds = loadtest.play_share([0], len(loadtest.ACTIONS), timeout=60)
+    assert errors == 0
+    assert len(latencies) == len(loadtest.ACTIONS) + 1
+    assert seconds >= sum(latencies) * 0.99
@@ -0,0 +1,114 @@
+import io
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from luck_arcade import console, metrics, stats
+from luck_arcade.rng import BufferedRandom
+
+
+def sample(name: str, text: str = None) -> float:
+    """Value of the sample line starting with ``name`` (0 if it isn't there)."""
+    for line in (text or metrics.render()).splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def attempts(game: str, front: str) -> float:
+    return sample(f'luck_arcade_attempts_total{{game="{game}",front="{front}"}}')
+
+
+@pytest.fixture(autouse=True)
+def collecting():
+    metrics.enable(True)
+    yield
+    metrics.enable(True)
+
+
+def test_thread_shards_add_up_after_the_threads_exit():
+    before = attempts("dice", "test")
+
+    def work():
+        for _ in range(1000):
+            metrics.played("dice", "test")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert attempts("dice", "test") - before == 8000
+
+
+def test_disabled_collection_records_nothing():
+    before = attempts("coin", "off")
+    metrics.enable(False)
+    metrics.played("coin", "off", attempts=5, wins=1)
+    metrics.enable(True)
+    assert attempts("coin", "off") == before
+
+
+def test_histogram_buckets_are_cumulative():
+    child = metrics.RERUN_SECONDS.labels("test_tab")
+    for seconds in (0.0005, 0.003, 0.003, 7.0, 60.0):
+        child.observe(seconds)
+    text = metrics.render()
+    prefix = 'luck_arcade_rerun_seconds_bucket{tab="test_tab",le='
+    assert sample(prefix + '"0.001"}', text) == 1
+    assert sample(prefix + '"0.005"}', text) == 3
+    assert sample(prefix + '"10"}', text) == 4
+    assert sample(prefix + '"+Inf"}', text) == 5
+    assert sample('luck_arcade_rerun_seconds_count{tab="test_tab"}', text) == 5
+    assert sample('luck_arcade_rerun_seconds_sum{tab="test_tab"}', text) == pytest.approx(67.0065)
+
+
+def test_labels_must_match():
+    with pytest.raises(ValueError):
+        metrics.ATTEMPTS.labels("coin")
+
+
+def test_metrics_use_registry_keys():
+    assert stats.Event("random").spec_key == "guess"
+    assert stats.Event("coin").spec_key == "coin"
+    before = attempts("guess", "console")
+    sink = io.StringIO()
+    console.play_batch(io.StringIO("guess 1 1 no\nq\n"), sink, rng=BufferedRandom(3))
+    assert attempts("guess", "console") == before + 1
+    assert attempts("random", "console") == 0
+
+
+def test_exporter_serves_the_text(tmp_path):
+    server = metrics.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+            assert "# TYPE luck_arcade_attempts_total counter" in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    path = tmp_path / "metrics.prom"
+    metrics.dump(str(path))
+    assert path.read_text(encoding="utf-8").startswith("# HELP")
+
+
+def test_periodic_dump_survives_a_failed_write(tmp_path, caplog):
+    target = tmp_path / "later" / "metrics.prom"
+    stop = metrics.dump_every(str(target), seconds=0.02)
+    try:
+        for _ in range(200):
+            if "writing metrics" in caplog.text:
+                break
+            time.sleep(0.01)
+        assert "writing metrics" in caplog.text
+        target.parent.mkdir()
+        for _ in range(200):
+            if target.exists():
+                break
+            time.sleep(0.01)
+        assert target.read_text(encoding="utf-8").startswith("# HELP")
+    finally:
+        stop.set()
@@ -0,0 +1,65 @@
+import itertools
+from fractions import Fraction
+
+import pytest
+
+from luck_arcade import games, odds
+
+
+def test_win_chances():
+    assert odds.win_chance("coin") == Fraction(1, 2)
+    assert odds.win_chance("dice") == Fraction(1, 6)
+    assert odds.win_chance("guess", 20) == Fraction(1, 20)
+    with pytest.raises(ValueError):
+        odds.win_chance("guess")
+
+
+def test_bisect_guessing_counts_tree_depths():
+    # 7 numbers: the middle on the 1st try, 2 more on the 2nd, the last 4 on the 3rd.
+    dist = odds.guess_attempts(7)
+    assert dist.probs == (0, Fraction(1, 7), Fraction(2, 7), Fraction(4, 7))
+    assert dist.mean == Fraction(17, 7)
+    for size in (1, 2, 10, 100, 1000):
+        assert sum(odds.guess_attempts(size).probs) == 1
+
+
+def test_random_guessing_is_geometric():
+    dist = odds.guess_attempts(10, "random")
+    assert dist.mean == 10
+    assert dist.cdf(1) == Fraction(1, 10)
+    with pytest.raises(ValueError):
+        odds.guess_attempts(10, "psychic")
+
+
+def test_geometric_quantile_is_the_first_k_reaching_q():
+    dist = odds.attempts("dice")
+    for q in (Fraction(1, 10), Fraction(1, 2), Fraction(9, 10), Fraction(99, 100)):
+        k = dist.quantile(q)
+        assert dist.cdf(k) >= q
+        assert k == 1 or dist.cdf(k - 1) < q
+    with pytest.raises(ValueError):
+        dist.quantile(1)
+
+
+def test_blitz_hits_are_binomial():
+    dist = odds.blitz_hits(12)
+    assert sum(dist.probs) == 1
+    assert dist.mean == 12 * games.table("blitz").p
+
+
+def test_streaks_match_brute_force():
+    p, attempts = Fraction(1, 3), 8
+    expected = [Fraction(0)] * (attempts + 1)
+    for outcome in itertools.product((0, 1), repeat=attempts):
+        longest = max(len(run) for run in "".join(map(str, outcome)).split("0"))
+        wins = sum(outcome)
+        expected[longest] += p**wins * (1 - p) ** (attempts - wins)
+    assert odds.longest_streak(p, attempts).probs == tuple(expected)
+    assert odds.streak_at_least(p, 3, attempts) == sum(expected[3:])
+    assert odds.reach_streak(p, 1, 3) == p**2
+
+
+def test_streak_length_over_rounds():
+    assert odds.streak_length("coin").mean == 2
+    with pytest.raises(ValueError):
+        odds.longest_streak(Fraction(1, 2), odds.MAX_STREAK_ATTEMPTS + 1)
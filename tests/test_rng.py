@@ -0,0 +1,95 @@
+import struct
+
+import pytest
+
+from luck_arcade import rng
+
+
+def words(*values):
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def test_reduce_drops_exactly_the_biased_words():
+    n = 3 << 30  # 2**32 % n == 2**30: a word in four is rejected
+    assert rng._reduce(words(0, 1, 2, 3, 4, 5, 6, 7), n) == [0, 1, 2, 3, 4, 5]
+
+
+def test_reduce_without_rejection_for_powers_of_two():
+    assert rng._reduce(words(0, 1 << 31, 0xFFFFFFFF), 2) == [0, 1, 1]
+
+
+def test_numpy_and_pure_python_reductions_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    data = rng.BufferedRandom(seed=1)._bytes(4 * 4096)
+    fast = rng._reduce(data, 500)
+    monkeypatch.setattr(rng, "numpy_or_none", lambda: None)
+    assert rng._reduce(data, 500) == fast
+
+
+def test_no_modulo_bias_on_a_worst_case_range():
+    # Taking w % n (or skipping the rejection) makes multiples of 3 show up
+    # half the time here; unbiased draws hit them a third of the time.
+    stream = rng.BufferedRandom(seed=2)
+    draws = [stream.randbelow(3 << 30) for _ in range(30_000)]
+    share = sum(value % 3 == 0 for value in draws) / len(draws)
+    assert abs(share - 1 / 3) < 0.015
+
+
+def test_small_ranges_are_uniform():
+    stream = rng.BufferedRandom(seed=3)
+    counts = [0] * 6
+    for _ in range(60_000):
+        counts[stream.randint(1, 6) - 1] += 1
+    assert all(abs(count - 10_000) < 400 for count in counts)
+
+
+def test_seeded_streams_replay():
+    first, second = rng.BufferedRandom(seed=42), rng.BufferedRandom(seed=42)
+    assert [first.randint(1, 500) for _ in range(1000)] == [second.randint(1, 500) for _ in range(1000)]
+
+
+def test_players_get_independent_replayable_streams():
+    alice = rng.for_player("alice", master_seed="m")
+    assert alice.seed == rng.for_player("alice", master_seed="m").seed
+    assert alice.seed != rng.for_player("bob", master_seed="m").seed
+    assert rng.for_player("alice", secure=True).seed is None
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("LUCK_ARCADE_SEED", "7")
+    assert rng.from_env("p").seed == rng.derive_seed("7", "p")
+    monkeypatch.setenv("LUCK_ARCADE_RNG", "secure")
+    assert rng.from_env("p").secure
+
+
+def test_random_api_subset():
+    stream = rng.BufferedRandom(seed=4)
+    assert stream.choice("ab") in "ab"
+    assert 0 <= stream.random() < 1
+    assert 0 <= stream.getrandbits(40) < 1 << 40
+    assert 5 <= stream.randrange(5, 9) < 9
+    with pytest.raises(ValueError):
+        stream.randrange(3, 3)
+    with pytest.raises(IndexError):
+        stream.choice([])
+    with pytest.raises(ValueError):
+        stream.randbelow(0)
+
+
+def test_random_methods_need_a_randbelow():
+    with pytest.raises(TypeError):
+        rng.RandomMethods()
+
+    class Counting(rng.RandomMethods):
+        __slots__ = ("count",)
+
+        def __init__(self):
+            self.count = 0
+
+        def randbelow(self, n):
+            self.count += 1
+            return n - 1
+
+    source = Counting()
+    assert source.randint(1, 6) == 6 and source.choice("abc") == "c"
+    assert source.count == 2
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from luck_arcade import games, rooms
+from luck_arcade.rng import BufferedRandom
+
+
+@pytest.fixture
+def hall():
+    # No background thread: the tests call tick() themselves.
+    return rooms.Rooms(round_seconds=None, empty_grace=0)
+
+
+def test_resolve_settles_every_seat_like_the_table(hall):
+    room = rooms.Room("big", "dice", hall.hub, rng=BufferedRandom(9))
+    table = games.table("dice")
+    for n in range(1000):
+        room.join(f"p{n}")
+        room.bet(f"p{n}", table.picks[n % 6] if n % 7 else None)
+    for _ in range(20):
+        result = room.resolve()
+        outcome = table.outcomes.index(result.outcome)
+        for n in range(1000):
+            seat = room.seat_of(f"p{n}")
+            expected = None if n % 7 == 0 else table.won(n % 6, outcome)
+            assert result.for_seat(seat) is expected
+        assert result.players == room.bets()
+        assert result.winners == sum(result.for_seat(seat) is True for seat in range(1000))
+
+
+def test_seats_are_reused_and_bets_need_a_seat(hall):
+    room = hall.open("lobby", "coin", owner="host")
+    assert room.owner == "host"
+    assert hall.open("lobby", "dice") is room
+    first = room.join("a")
+    room.join("b")
+    room.leave("a")
+    assert room.join("c") == first
+    assert room.pick_of("c") is None
+    with pytest.raises(KeyError):
+        room.bet("a", "Heads")
+    with pytest.raises(ValueError):
+        room.bet("c", "Edge")
+    with pytest.raises(ValueError):
+        rooms.Room("nums", "guess", hall.hub)
+
+
+def test_subscribers_read_the_shared_backlog(hall):
+    room = hall.open("feed")
+    room.join("a")
+    room.bet("a", "Heads")
+    early = hall.hub.subscribe(room.topic)
+    for _ in range(3):
+        hall.tick()
+    assert [result.number for result in early.poll()] == [1, 2, 3]
+    assert early.poll() == []
+    assert len(hall.hub.subscribe(room.topic, from_start=True).poll()) == 3
+
+
+def test_wait_wakes_on_publish(hall):
+    room = hall.open("wake")
+    room.join("a")
+    room.bet("a", "Tails")
+    sub = hall.hub.subscribe(room.topic)
+    timer = threading.Timer(0.05, room.resolve)
+    timer.start()
+    assert len(sub.wait(timeout=5)) == 1
+    timer.join()
+
+
+def test_empty_rooms_close_with_their_topic(hall):
+    room = hall.open("gone", owner="a")
+    room.join("a")
+    hall.hub.subscribe(room.topic)
+    assert not hall.close("gone")
+    hall.tick()
+    assert hall.names() == ["gone"]
+    room.leave("a")
+    hall.tick()
+    assert hall.names() == []
+    assert len(hall.hub) == 0
+
+
+def test_idle_members_are_evicted():
+    room = rooms.Room("idle", "coin", rooms.Hub())
+    room.join("a")
+    room.bet("a", "Heads")
+    assert room.evict_idle(timeout=-1) == 1
+    assert len(room) == 0 and room.bets() == 0
+    assert room.empty_since is not None
+
+
+def test_a_failing_room_does_not_stop_the_others(hall, caplog):
+    broken, fine = hall.open("broken"), hall.open("fine")
+    for room in (broken, fine):
+        room.join("a")
+        room.bet("a", "Heads")
+
+    def fail():
+        raise RuntimeError("draw failed")
+
+    broken.resolve = fail
+    assert hall.tick() == 1
+    assert fine.rounds == 1
+    assert "broken" in caplog.text
+
+
+def test_next_round_follows_the_schedule():
+    assert rooms.Rooms(round_seconds=None).next_round_in() is None
+    scheduled = rooms.Rooms(round_seconds=30)
+    assert 29 < scheduled.next_round_in() <= 30
+    scheduled.stop()
+    assert scheduled.next_round_in() is None
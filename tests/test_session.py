@@ -0,0 +1,86 @@
+import gc
+import os
+import sys
+
+import pytest
+
+from luck_arcade import session, stats
+from luck_arcade.session import PlayerState, Sessions
+
+
+@pytest.fixture
+def seeded(monkeypatch):
+    monkeypatch.setenv("LUCK_ARCADE_SEED", "42")
+    monkeypatch.delenv("LUCK_ARCADE_RNG", raising=False)
+
+
+def played_state(player_id="abcdef123456"):
+    state = PlayerState(player_id, "Neon", "on")
+    for won in (0, 1, 1):
+        state.stats.record(stats.Event("coin", wins=won))
+        state.trend.record(1, won, when=1_700_000_000.0)
+    state.random_target = 17
+    state.rng.randbelow(6)
+    return state
+
+
+def test_spill_and_restore_round_trip(tmp_path, seeded):
+    state = played_state()
+    twin = played_state()
+    path = str(tmp_path / "state.pickle")
+    assert state.spill(path)
+    assert os.path.exists(path)
+    assert state.stats is None and state.stream is None
+    assert state.nbytes() < twin.nbytes()
+    assert not state.spill(path)
+
+    state.touch()
+    assert state.spilled is None
+    assert not os.path.exists(path)
+    assert state.snapshot() == twin.snapshot()
+    assert state.theme_choice == "Neon"
+    # The stream picks up exactly where it stopped.
+    assert [state.rng.randbelow(1000) for _ in range(50)] == [twin.rng.randbelow(1000) for _ in range(50)]
+
+
+def test_recent_sessions_are_not_spilled(tmp_path):
+    state = played_state()
+    assert not state.spill(str(tmp_path / "x"), idle_seconds=3600)
+    assert state.spilled is None
+
+
+def test_load_picks_up_saved_rounds():
+    state = played_state()
+    state.nickname = "Ace"
+    loaded = PlayerState.load(state.player_id, state.snapshot(), "Neon", "off")
+    assert loaded.snapshot() == state.snapshot()
+    assert loaded.nickname == "Ace" and loaded.random_target == 17
+
+
+def test_deep_size_skips_shared_objects():
+    blob = bytearray(100_000)
+    holder = {"blob": blob, "small": [1, 2, 3]}
+    assert session.deep_size(holder) >= sys.getsizeof(blob)
+    assert session.deep_size(holder, shared=(blob,)) < 10_000
+    assert session.deep_size(session.deep_size) == 0
+
+
+def test_sweep_spills_idle_sessions_and_forgets_closed_ones(tmp_path):
+    sessions = Sessions(str(tmp_path), idle_seconds=0, sweep_seconds=None)
+    kept = sessions.add(played_state("keep"))
+    dropped = sessions.add(played_state("drop"))
+    assert sessions.sweep() == 2
+    assert sessions.counts() == {"active": 0, "spilled": 2}
+    assert len(os.listdir(tmp_path)) == 2
+    report = sessions.report()
+    assert report.spilled == 2 and report.spool_bytes > 0
+
+    spilled_file = dropped.spilled
+    del dropped
+    gc.collect()
+    assert len(sessions) == 1
+    assert not os.path.exists(spilled_file)
+
+    kept.touch()
+    assert sessions.counts() == {"active": 1, "spilled": 0}
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,109 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from luck_arcade import engine, odds, simulate, solver
+
+
+def streaks_by_hand(resets, hits):
+    """Streak lengths the slow way: a miss ends the run, then a win extends it."""
+    runs, current = [], 0
+    for reset, hit in zip(resets, hits):
+        if reset:
+            if current:
+                runs.append(current)
+            current = 0
+        current += int(hit)
+    if current:
+        runs.append(current)
+    return np.bincount(runs, minlength=1) if runs else np.zeros(1, dtype=np.int64)
+
+
+def trimmed(counts):
+    counts = np.trim_zeros(np.asarray(counts), "b")
+    return counts.tolist()
+
+
+def test_merged_summaries_match_one_pass():
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 4, size=5_000)
+    reset, hit = values == 0, values > 0
+    whole = simulate._summarize("blitz", values, reset, hit)
+    merged = None
+    for part in np.array_split(np.arange(len(values)), 7):
+        summary = simulate._summarize("blitz", values[part], reset[part], hit[part])
+        merged = summary if merged is None else merged.merge(summary)
+    assert merged.rounds == whole.rounds
+    assert trimmed(merged.histogram) == trimmed(whole.histogram)
+    assert trimmed(merged.streaks()) == trimmed(whole.streaks()) == trimmed(streaks_by_hand(reset, hit))
+
+
+def test_bisect_plays_like_the_solver_bot(monkeypatch):
+    max_number = engine.LEVELS[3][1]
+    monkeypatch.setattr(simulate, "_secrets", lambda rng, level, rounds: np.arange(1, max_number + 1))
+    attempts = simulate.play_bisect(np.random.default_rng(2), 3, max_number)
+    bot = solver.Bot(max_number)
+    assert attempts.tolist() == [bot.play(target) for target in range(1, max_number + 1)]
+
+
+def test_a_secret_outside_the_range_is_reported(monkeypatch):
+    max_number = engine.LEVELS[1][1]
+    monkeypatch.setattr(simulate, "_secrets", lambda rng, level, rounds: np.full(rounds, max_number + 1))
+    with pytest.raises(RuntimeError):
+        simulate.play_bisect(np.random.default_rng(2), 1, 100)
+
+
+def test_blitz_rolls_follow_the_exact_distribution():
+    exact = odds.blitz_hits(12)
+    hits = simulate.play_blitz(np.random.default_rng(2), 12, 200_000)
+    freq = np.bincount(hits, minlength=len(exact.probs)) / len(hits)
+    assert np.allclose(freq, [float(p) for p in exact.probs], atol=0.005)
+
+
+def test_until_win_stops_at_the_first_win():
+    attempts = simulate.play_until_win(np.random.default_rng(5), "coin", 50_000)
+    assert attempts.min() == 1
+    assert abs(attempts.mean() - 2) < 0.05
+
+
+@pytest.mark.parametrize("game", ["coin", "dice", "guess", "blitz"])
+def test_simulated_mean_is_close_to_exact(game):
+    config = simulate.Config(game)
+    result = simulate.simulate(config, 200_000, seed=3)
+    exact = config.exact()
+    histogram = result.summary.histogram
+    mean = float((np.arange(len(histogram)) * histogram).sum() / histogram.sum())
+    assert abs(mean - float(exact.mean)) < 5 * exact.std / np.sqrt(200_000)
+
+
+def test_config_rejects_unknown_settings():
+    with pytest.raises(ValueError):
+        simulate.Config("guess", level=9)
+    with pytest.raises(ValueError):
+        simulate.Config("nope")
+
+
+def test_seed_gives_the_same_result_at_any_worker_count():
+    config = simulate.Config("dice")
+    one = simulate.simulate(config, 50_000, seed=4, workers=1, block_size=8_192)
+    two = simulate.simulate(config, 50_000, seed=4, workers=2, block_size=8_192)
+    assert one.summary.rounds == two.summary.rounds == 50_000
+    assert trimmed(one.summary.histogram) == trimmed(two.summary.histogram)
+    assert trimmed(one.summary.streaks()) == trimmed(two.summary.streaks())
+
+
+def test_unseeded_runs_report_a_seed_that_replays_them():
+    config = simulate.Config("coin")
+    first = simulate.simulate(config, 10_000, block_size=4_096)
+    again = simulate.simulate(config, 10_000, seed=first.seed, block_size=4_096)
+    assert trimmed(first.summary.histogram) == trimmed(again.summary.histogram)
+
+
+def test_report_flags_rules_that_disagree_with_the_odds(monkeypatch):
+    config = simulate.Config("coin")
+    fair = simulate.format_report(simulate.simulate(config, 50_000, seed=6, workers=1))
+    assert "Warning" not in fair
+    # A coin that always lands on the pick plays differently from what odds.py expects.
+    monkeypatch.setattr(simulate, "play_until_win", lambda rng, game, rounds: np.ones(rounds, dtype=np.int64))
+    broken = simulate.format_report(simulate.simulate(config, 50_000, seed=6, workers=1))
+    assert "Warning: the played rounds disagree with odds.py" in broken
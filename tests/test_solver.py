@@ -0,0 +1,55 @@
+import asyncio
+from fractions import Fraction
+
+import pytest
+
+from luck_arcade import console, engine, odds, solver
+from luck_arcade.rng import BufferedRandom
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 10, 100, 1000])
+def test_bot_finds_every_number_within_the_tree_depth(size):
+    bot = solver.Bot(size)
+    counts = {}
+    for target in range(1, size + 1):
+        attempts = bot.play(target)
+        assert attempts <= solver.solve(size).depth()
+        counts[attempts] = counts.get(attempts, 0) + 1
+    exact = odds.guess_attempts(size)
+    assert {k: Fraction(n, size) for k, n in counts.items()} == {
+        k: p for k, p in enumerate(exact.probs) if p
+    }
+
+
+def test_bot_plays_an_offset_range():
+    bot = solver.Bot(hi=60, lo=41)
+    assert all(bot.play(target) <= 5 for target in range(41, 61))
+
+
+def test_impossible_hints_are_rejected():
+    tree = solver.solve(1)
+    with pytest.raises(ValueError):
+        tree.next(0, "low")
+    with pytest.raises(ValueError):
+        solver.GuessTree(0)
+
+
+def test_run_bots_reports_every_round():
+    report = solver.run_bots(3, 500, BufferedRandom(11))
+    assert report.rounds == 500 == sum(report.histogram)
+    assert report.moves == sum(k * n for k, n in enumerate(report.histogram))
+    assert len(report.histogram) - 1 <= solver.solve(engine.LEVELS[3][1]).depth()
+    assert "rounds" in solver.format_report(report)
+
+
+def test_tcp_bot_plays_through_the_console_server():
+    async def main():
+        server = await console.start_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(*(solver.tcp_bot(1, 5, "127.0.0.1", port) for _ in range(3)))
+
+    total = solver.BotReport(1)
+    for part in asyncio.run(main()):
+        total.merge(part)
+    assert total.rounds == 15 == sum(total.histogram)
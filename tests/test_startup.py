@@ -0,0 +1,17 @@
+import pytest
+
+from luck_arcade import bench
+
+
+@pytest.mark.parametrize("module", sorted(bench.STARTUP_CHECKS))
+def test_entry_points_skip_heavy_imports(module):
+    loaded = bench.import_times(module)
+    assert module in loaded
+    heavy = [name for name in bench.STARTUP_CHECKS[module] if name in loaded]
+    assert heavy == []
+
+
+def test_package_import_is_lazy():
+    loaded = bench.import_times("luck_arcade")
+    assert "luck_arcade.cli" not in loaded
+    assert "luck_arcade.streamlit_app" not in loaded
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from luck_arcade.stats import Event, History, PlayerStats
+
+
+def test_history_keeps_the_newest_values():
+    history = History(3)
+    for value in range(5):
+        history.append(value)
+    assert history.to_list() == [2, 3, 4]
+    assert len(history) == 3
+    history.clear()
+    assert history.to_list() == []
+
+
+def test_history_needs_room():
+    with pytest.raises(ValueError):
+        History(0)
+
+
+def test_streaks_and_rounds():
+    stats = PlayerStats()
+    for won in (0, 1, 1, 1, 0, 1):
+        stats.record(Event("coin", wins=won))
+    assert (stats.total_attempts, stats.total_wins) == (6, 4)
+    assert (stats.streak_current, stats.streak_best) == (1, 3)
+    assert stats.round_of("coin") == 6
+    stats.new_round("coin")
+    assert stats.round_of("coin") == 0
+    assert stats.win_rate == pytest.approx(4 / 6)
+
+
+def test_milestone_every_third_win_in_a_row():
+    stats = PlayerStats()
+    marks = []
+    for _ in range(6):
+        stats.record(Event("dice", wins=1))
+        marks.append(stats.at_milestone)
+    assert marks == [False, False, True, False, False, True]
+
+
+def test_blitz_and_out_of_round_events():
+    stats = PlayerStats()
+    stats.record(Event("blitz", attempts=12, wins=3))
+    stats.record(Event("blitz", attempts=6, wins=1))
+    stats.record(Event("random", wins=0, in_round=False))
+    assert (stats.blitz_runs, stats.blitz_best_hits) == (2, 3)
+    assert stats.total_attempts == 19
+    assert stats.round_of("random") == 0
+
+
+def test_plugin_games_count_toward_totals_only():
+    stats = PlayerStats()
+    stats.record(Event("suit", wins=1))
+    assert (stats.total_attempts, stats.total_wins, stats.streak_current) == (1, 1, 1)
+    assert list(stats.attempts) == [0, 0, 0]
+
+
+def test_dict_round_trip_survives_json():
+    stats = PlayerStats()
+    for won in (1, 0, 1, 1):
+        stats.record(Event("random", wins=won))
+    stats.record(Event("blitz", attempts=8, wins=2))
+    restored = PlayerStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+    assert restored.to_dict() == stats.to_dict()
+
+
+def test_old_saves_without_totals_load():
+    restored = PlayerStats.from_dict({"coin_attempts_total": 4, "coin_wins": 1, "dice_attempts_total": 2})
+    assert (restored.total_attempts, restored.total_wins) == (6, 1)
+
+
+def test_reset_clears_everything():
+    stats = PlayerStats()
+    stats.record(Event("coin", wins=1))
+    stats.reset()
+    assert stats.to_dict() == PlayerStats().to_dict()
@@ -0,0 +1,92 @@
+import sqlite3
+import time
+
+import pytest
+
+from luck_arcade import store
+
+
+@pytest.fixture
+def backend(tmp_path):
+    # No timer flushes: the tests flush by hand.
+    sqlite = store.SQLiteBackend(str(tmp_path / "stats.db"), flush_interval=3600)
+    yield sqlite
+    sqlite.close()
+
+
+def rows(path):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT player_id, data FROM player_stats"))
+
+
+def test_memory_backend_copies_snapshots():
+    memory = store.open_backend("memory://")
+    stats = {"wins": [1]}
+    memory.save("p", stats)
+    stats["wins"].append(2)
+    assert memory.load("p") == {"wins": [1]}
+    assert memory.load("nobody") is None
+
+
+def test_saves_are_buffered_until_flush(backend):
+    backend.save("p", {"wins": 1})
+    backend.save("p", {"wins": 2})
+    assert rows(backend.path) == {}
+    assert backend.load("p") == {"wins": 2}
+    backend.flush()
+    assert rows(backend.path) == {"p": '{"wins": 2}'}
+    assert backend.load("p") == {"wins": 2}
+
+
+def test_failed_flush_requeues_without_overwriting_newer_saves(backend, monkeypatch):
+    backend.save("old", {"n": 1})
+    backend.save("both", {"n": 1})
+    connect = backend._connect
+
+    def locked():
+        # A save lands while the batch is being written, then the write fails.
+        backend.save("both", {"n": 2})
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(backend, "_connect", locked)
+    with pytest.raises(sqlite3.OperationalError):
+        backend.flush()
+    assert backend.load("old") == {"n": 1}
+    assert backend.load("both") == {"n": 2}
+
+    monkeypatch.setattr(backend, "_connect", connect)
+    backend.flush()
+    assert rows(backend.path) == {"old": '{"n": 1}', "both": '{"n": 2}'}
+
+
+def test_flusher_thread_survives_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "MAX_FLUSH_BACKOFF", 0.05)
+    backend = store.SQLiteBackend(str(tmp_path / "stats.db"), flush_interval=0.01)
+    connect, failures = backend._connect, []
+
+    def flaky():
+        if len(failures) < 2:
+            failures.append(1)
+            raise sqlite3.OperationalError("disk I/O error")
+        return connect()
+
+    monkeypatch.setattr(backend, "_connect", flaky)
+    backend.save("p", {"wins": 3})
+    deadline = time.monotonic() + 5
+    while not rows(backend.path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    backend.close()
+    assert len(failures) == 2
+    assert rows(backend.path) == {"p": '{"wins": 3}'}
+
+
+def test_reopened_backend_reads_flushed_stats(tmp_path):
+    path = str(tmp_path / "stats.db")
+    first = store.open_backend(path)
+    first.save("p", {"streak_best": 4})
+    first.close()
+    second = store.open_backend(path)
+    try:
+        assert second.load("p") == {"streak_best": 4}
+    finally:
+        second.close()
@@ -0,0 +1,48 @@
+from luck_arcade import theme
+
+
+def test_every_theme_builds_and_is_memoized():
+    for name in theme.THEMES:
+        css = theme.build_css(name)
+        assert theme.THEMES[name]["accent"] in css
+        assert theme.build_css(name) is css
+
+
+def test_missing_font_files_fall_back_to_google_fonts(tmp_path):
+    css = theme.font_faces_css("fonts", tmp_path)
+    assert css.startswith(f"@import url('{theme.GOOGLE_FONTS_URL}?")
+    assert "Source+Sans+3" in css and "Source+Code+Pro" in css
+    assert "@font-face" not in css
+
+
+def test_vendored_font_files_are_self_hosted(tmp_path):
+    for _, filename, _, _ in theme.FONT_FACES:
+        (tmp_path / filename).write_bytes(b"wOF2")
+    css = theme.font_faces_css("fonts", tmp_path)
+    assert "@import" not in css
+    assert css.count("@font-face") == len(theme.FONT_FACES)
+    assert "url('fonts/SourceSans3.woff2')" in css
+
+
+def test_shipped_fonts_are_self_hosted_by_default():
+    for _, filename, _, _ in theme.FONT_FACES:
+        assert (theme.FONTS_DIR / filename).read_bytes()[:4] == b"wOF2"
+    assert (theme.FONTS_DIR / "OFL.txt").is_file()
+    assert "@import" not in theme.font_faces_css("fonts")
+
+
+def test_only_missing_fonts_are_imported(tmp_path):
+    (tmp_path / "SourceSans3.woff2").write_bytes(b"wOF2")
+    css = theme.font_faces_css("fonts", tmp_path)
+    assert css.splitlines()[0] == f"@import url('{theme.GOOGLE_FONTS_URL}?family=Source+Code+Pro:wght@400;600&display=swap');"
+    assert "font-family: 'Source Sans 3'" in css
+
+
+def test_publish_writes_once_and_versions_the_url(tmp_path):
+    url = theme.publish("Arcade Neon", tmp_path)
+    path = tmp_path / theme.stylesheet_name("Arcade Neon")
+    assert path.read_text(encoding="utf-8") == theme.build_css("Arcade Neon", font_root="fonts")
+    stamp = path.stat().st_mtime_ns
+    assert theme.publish("Arcade Neon", tmp_path) == url
+    assert path.stat().st_mtime_ns == stamp
+    assert url.startswith(f"{theme.STATIC_URL}/theme-arcade-neon.css?v=")
@@ -0,0 +1,123 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from luck_arcade import rooms, tournament
+from luck_arcade.tournament import Failed, Progress, Result, Store, Tournaments
+
+
+@pytest.fixture
+def runner():
+    # No scheduler thread: the tests call run() themselves.
+    return Tournaments(Store(), hub=rooms.Hub(), interval=None, bracket=25, chunk=4096)
+
+
+def replayed_hits(entries, seeds):
+    return [
+        sum(face == target for face in tournament.entry_rolls(int(seed), rolls))
+        for seed, target, rolls in zip(seeds, entries["targets"], entries["rolls"])
+    ]
+
+
+def test_batch_matches_the_one_at_a_time_replay():
+    entries = tournament.random_entries(20_000, seed=1)
+    seeds = tournament.entry_seeds(99, 0, 20_000)
+    hits = tournament.resolve_hits(seeds, np.asarray(entries["targets"], np.uint8), np.asarray(entries["rolls"], np.uint8))
+    assert hits.tolist() == replayed_hits(entries, seeds)
+
+
+def test_rejected_words_are_replayed(monkeypatch):
+    # Reject about half of all words so every row takes the replay path.
+    monkeypatch.setattr(tournament, "THRESHOLD", 1 << 31)
+    entries = tournament.random_entries(500, seed=2)
+    seeds = tournament.entry_seeds(5, 0, 500)
+    hits = tournament.resolve_hits(seeds, np.asarray(entries["targets"], np.uint8), np.asarray(entries["rolls"], np.uint8))
+    assert hits.tolist() == replayed_hits(entries, seeds)
+
+
+def test_bracket_matches_a_full_sort_with_ties():
+    generator = np.random.default_rng(3)
+    score = generator.integers(0, 20, 5000).astype(np.int32)
+    full = sorted(range(len(score)), key=lambda i: (-score[i], i))
+    for size in (1, 10, 100, 5000, 6000):
+        assert tournament.bracket_order(score, size).tolist() == full[:size]
+    assert tournament.bracket_order(score[:0], 10).tolist() == []
+
+
+def test_run_ranks_stores_and_publishes(runner):
+    feed = runner.hub.subscribe(tournament.TOPIC)
+    entries = tournament.random_entries(10_000, seed=4)
+    for row in zip(entries["players"], entries["names"], entries["targets"], entries["rolls"]):
+        runner.enter(*row)
+    first = runner.upcoming
+    result = runner.run(seed=11)
+    assert result.tournament == first and runner.upcoming > first
+    assert len(runner) == 0 and runner.last is result
+
+    seeds = tournament.entry_seeds(11, 0, 10_000)
+    assert result.hits.tolist() == replayed_hits(entries, seeds)
+    assert [s.rank for s in result.bracket] == list(range(1, 26))
+    for standing in result.bracket:
+        assert result.rank_of(standing.entry) == standing.rank
+    assert result.rank_of(9_999) > 25
+    assert result.entries_of("bot-7") == [7]
+
+    assert runner.store.count(first) == 10_000
+    assert runner.store.status(first) == "finished"
+    messages = feed.poll()
+    assert [m.done for m in messages if isinstance(m, Progress)] == [4096, 8192, 10_000]
+    assert messages[-1] is result
+    assert runner.run() is None
+
+
+def test_same_seed_same_tournament(runner):
+    entries = tournament.random_entries(1000, seed=5)
+    one = runner.play(runner.store.open(), entries, seed=8)
+    two = runner.play(runner.store.open(), entries, seed=8)
+    assert one.tournament != two.tournament
+    assert one.hits.tolist() == two.hits.tolist()
+    assert one.bracket == two.bracket
+
+
+def test_entries_can_bring_their_own_seed(runner):
+    runner.enter("p", "P", 3, 12, seed=1234)
+    result = runner.run(seed=1)
+    assert result.hits.tolist() == [tournament.entry_rolls(1234, 12).count(3)]
+
+
+def test_a_failed_run_moves_its_entries_to_the_next_tournament(runner, monkeypatch):
+    feed = runner.hub.subscribe(tournament.TOPIC)
+    runner.enter("a", "A", 1, 6)
+    runner.enter("b", "B", 2, 8)
+    failed_id = runner.upcoming
+
+    def broken(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(runner.store, "write", broken)
+    with pytest.raises(OSError):
+        runner.run()
+    (message,) = [m for m in feed.poll() if isinstance(m, Failed)]
+    assert message == Failed(failed_id, "OSError: disk full", runner.upcoming)
+    assert runner.store.status(failed_id) == "failed"
+    assert len(runner) == 2
+    runner.enter("c", "C", 3, 10)
+
+    monkeypatch.undo()
+    result = runner.run()
+    assert isinstance(result, Result)
+    assert result.tournament == message.moved_to
+    assert result.players == ["a", "b", "c"]
+
+
+def test_entries_are_checked(runner):
+    with pytest.raises(ValueError):
+        runner.enter("p", "P", 7, 12)
+    with pytest.raises(ValueError):
+        runner.enter("p", "P", 3, tournament.MAX_ROLLS + 1)
+
+
+def test_ids_are_never_reused(tmp_path):
+    path = str(tmp_path / "tournaments.db")
+    first = Store(path).open()
+    assert Store(path).open() > first